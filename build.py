@@ -7,7 +7,7 @@ import PyInstaller.__main__
 
 
 ROOT = Path(__file__).parent
-ENTRY = ROOT / "src" / "mzrds" / "cli.py"
+ENTRY = ROOT / "src" / "mzrds" / "fastpath.py"
 
 
 def clean_build_dirs():
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from .config import CONFIG_DIR, ConnectionOptions
+from .resp import RespError, encode_value, read_value
+
+CONNECT_TIMEOUT = 0.2
+# 等待代理回复的上限：配置了 socket_timeout 时在其基础上留出余量，
+# 否则使用固定上限，避免卡住的代理让 CLI 永远挂起
+REQUEST_TIMEOUT = 30.0
+REQUEST_TIMEOUT_MARGIN = 1.0
+
+
+def default_socket_path() -> Path:
+    override = os.environ.get("MZRDS_AGENT_SOCKET")
+    if override:
+        return Path(override)
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime) / "mzrds" if runtime else CONFIG_DIR
+    return base / "agent.sock"
+
+
+# 会改变连接状态或把连接切换为推送模式的命令。代理上的连接由所有请求共享，
+# 执行这些命令后归还的连接会影响之后借到它的请求，因此只能直连执行。
+_STATEFUL_COMMANDS = frozenset({
+    "AUTH", "HELLO", "SELECT", "RESET", "QUIT",
+    "MULTI", "EXEC", "DISCARD", "WATCH", "UNWATCH",
+    "READONLY", "READWRITE",
+    "MONITOR", "SYNC", "PSYNC",
+    "SUBSCRIBE", "PSUBSCRIBE", "SSUBSCRIBE",
+    "UNSUBSCRIBE", "PUNSUBSCRIBE", "SUNSUBSCRIBE",
+})
+_STATEFUL_CLIENT_SUBCOMMANDS = frozenset({
+    "SETNAME", "SETINFO", "TRACKING", "REPLY", "NO-EVICT", "NO-TOUCH",
+})
+# 阻塞命令可能超过请求超时：CLI 放弃等待后代理上的命令仍在执行，
+# 之后弹出的元素会丢失，因此也直连执行
+_BLOCKING_COMMANDS = frozenset({
+    "BLPOP", "BRPOP", "BRPOPLPUSH", "BLMOVE", "BLMPOP",
+    "BZPOPMIN", "BZPOPMAX", "BZMPOP", "WAIT", "WAITAOF",
+})
+
+
+def _upper(part) -> str:
+    if isinstance(part, (bytes, bytearray)):
+        part = part.decode("utf-8", "replace")
+    return str(part).upper()
+
+
+def needs_direct_connection(command: Sequence) -> bool:
+    """
+    该命令是否不能经代理执行：会改变连接状态（SELECT、MULTI、CLIENT SETNAME、
+    SUBSCRIBE 等），或者会阻塞（BLPOP、XREAD BLOCK 等）。
+    """
+    if not command:
+        return False
+    name = _upper(command[0])
+    if name == "CLIENT" and len(command) > 1:
+        return _upper(command[1]) in _STATEFUL_CLIENT_SUBCOMMANDS
+    if name in ("XREAD", "XREADGROUP"):
+        return any(_upper(part) == "BLOCK" for part in command[1:])
+    return name in _STATEFUL_COMMANDS or name in _BLOCKING_COMMANDS
+
+
+def options_key(options: ConnectionOptions) -> str:
+    return json.dumps(options.to_dict(), sort_keys=True)
+
+
+def _raise_remote(error: RespError):
+    from redis import exceptions
+
+    exc_type = getattr(exceptions, error.kind, None)
+    if not (isinstance(exc_type, type) and issubclass(exc_type, Exception)):
+        exc_type = exceptions.ResponseError
+    raise exc_type(str(error))
+
+
+def request_timeout(options: Optional[ConnectionOptions]) -> float:
+    if options is not None and options.socket_timeout:
+        return options.socket_timeout + REQUEST_TIMEOUT_MARGIN
+    return REQUEST_TIMEOUT
+
+
+class AgentClient:
+    """
+    CLI 端的代理连接，接口与 redis-py 客户端的 ``execute_command`` 一致。
+
+    给出 ``fallback`` 时，代理超时或断开后改用它创建的直连客户端执行命令
+    （代理可能已经执行过该命令，非幂等的写命令可能重复执行）。
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        options: Optional[ConnectionOptions] = None,
+        fallback: Optional[Callable[[], Any]] = None,
+    ):
+        self._sock = sock
+        self._rfile = sock.makefile("rb")
+        self._key = options_key(options) if options else None
+        self._fallback = fallback
+        self._direct: Any = None
+
+    def request(self, *parts) -> Any:
+        self._sock.sendall(encode_value(list(parts)))
+        reply = read_value(self._rfile)
+        if isinstance(reply, RespError):
+            _raise_remote(reply)
+        return reply
+
+    def execute_command(self, *args, **options) -> Any:
+        if self._direct is None:
+            try:
+                return self.request("EXEC", self._key, *args)
+            except (OSError, EOFError):
+                if self._fallback is None:
+                    raise
+                self._rfile.close()
+                self._sock.close()
+                self._direct = self._fallback()
+        return self._direct.execute_command(*args)
+
+    def close(self) -> None:
+        self._rfile.close()
+        self._sock.close()
+        if self._direct is not None:
+            self._direct.close()
+
+
+def connect_agent(
+    options: Optional[ConnectionOptions] = None,
+    path: Optional[Path] = None,
+    fallback: Optional[Callable[[], Any]] = None,
+) -> Optional[AgentClient]:
+    """
+    连接本地代理；代理未运行或不可达时返回 None，调用方应回退为直连。
+
+    ``fallback`` 用于创建直连客户端，请求超时或代理断开时改用它。
+    """
+    path = path or default_socket_path()
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    agent = AgentClient(sock, options, fallback)
+    try:
+        # 握手确认代理仍在服务（而不是正在退出、只剩残留 socket）
+        agent.request("PING")
+    except (OSError, EOFError):
+        agent.close()
+        return None
+    sock.settimeout(request_timeout(options))
+    return agent
+
+
+__all__ = [
+    "AgentClient",
+    "connect_agent",
+    "default_socket_path",
+    "needs_direct_connection",
+    "options_key",
+    "request_timeout",
+]
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import os
+import socketserver
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .agent import default_socket_path, needs_direct_connection, options_key
+from .config import ConnectionOptions
+from .resp import RespError, encode_value, read_value
+
+DEFAULT_POOL_IDLE = 300.0
+DEFAULT_IDLE_TIMEOUT = 3600.0
+
+
+def _describe(key: str) -> str:
+    data = json.loads(key)
+    if data.get("uri"):
+        return data["uri"].split("@")[-1]
+    return f"{data.get('host')}:{data.get('port')}/{data.get('db', 0)}"
+
+
+class _Entry:
+    __slots__ = ("client", "used", "active")
+
+    def __init__(self, client):
+        self.client = client
+        self.used = time.monotonic()
+        self.active = 0
+
+
+class _Pools:
+    """
+    按连接参数缓存客户端（各自带连接池），空闲过久的自动关闭。
+
+    空闲时间从最近一次请求结束算起；仍有请求在执行（长时间的 KEYS、
+    阻塞命令等）的客户端不会被关闭。
+    """
+
+    def __init__(self, pool_idle: float):
+        self.pool_idle = pool_idle
+        self._lock = threading.Lock()
+        self._clients: Dict[str, _Entry] = {}
+
+    def _acquire(self, key: str) -> _Entry:
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry.active += 1
+                return entry
+        # 在锁外创建：Cluster 客户端创建时就要连接节点，不能阻塞其他实例的请求
+        from .client import get_client
+
+        client = get_client(ConnectionOptions.from_dict(json.loads(key)))
+        duplicate = None
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is None:
+                entry = self._clients[key] = _Entry(client)
+            else:
+                # 并发的请求已经先创建好了，使用已有的
+                duplicate = client
+            entry.active += 1
+        if duplicate is not None:
+            duplicate.close()
+        return entry
+
+    @contextmanager
+    def borrow(self, key: str) -> Iterator[Any]:
+        """借出客户端；借出期间不会被当作空闲关闭，归还时刷新最近使用时间。"""
+        entry = self._acquire(key)
+        try:
+            yield entry.client
+        finally:
+            with self._lock:
+                entry.active -= 1
+                entry.used = time.monotonic()
+
+    def evict_idle(self) -> None:
+        deadline = time.monotonic() - self.pool_idle
+        with self._lock:
+            expired = [
+                key
+                for key, entry in self._clients.items()
+                if not entry.active and entry.used < deadline
+            ]
+            clients = [self._clients.pop(key).client for key in expired]
+        for client in clients:
+            client.close()
+
+    def describe(self) -> List[str]:
+        now = time.monotonic()
+        with self._lock:
+            return [
+                f"{_describe(key)} idle={now - entry.used:.0f}s"
+                + (f" active={entry.active}" if entry.active else "")
+                for key, entry in self._clients.items()
+            ]
+
+    def close_all(self) -> None:
+        with self._lock:
+            clients = [entry.client for entry in self._clients.values()]
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "AgentServer"
+
+    def handle(self) -> None:
+        while True:
+            try:
+                request = read_value(self.rfile)
+            except (EOFError, OSError, ValueError):
+                return
+            self.server.touch()
+            try:
+                self.wfile.write(encode_value(self.server.dispatch(request)))
+                self.wfile.flush()
+            except OSError:
+                return
+
+
+class AgentServer(socketserver.ThreadingUnixStreamServer):
+    """
+    本地连接代理：在 Unix socket 上接收命令，复用常驻的 Redis 连接池执行。
+
+    请求与回复都是 RESP3 帧；请求为 ``["EXEC", 连接参数 JSON, *命令]``，
+    另有 ``PING`` / ``STATUS`` / ``SHUTDOWN`` 管理命令。
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        pool_idle: float = DEFAULT_POOL_IDLE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if path.exists():
+            path.unlink()
+        # bind 时就以 0600 创建 socket，不留下其他用户可以连接的窗口
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(path), _Handler)
+        finally:
+            os.umask(umask)
+        self.path = path
+        self.pools = _Pools(pool_idle)
+        self.idle_timeout = idle_timeout
+        self.last_request = time.monotonic()
+
+    def touch(self) -> None:
+        self.last_request = time.monotonic()
+
+    def warm(self, options: ConnectionOptions) -> None:
+        with self.pools.borrow(options_key(options)) as client:
+            client.ping()
+
+    def dispatch(self, request) -> Any:
+        if not isinstance(request, list) or not request:
+            return RespError("ERR", "invalid request")
+        op = request[0]
+        try:
+            if op == "EXEC":
+                if needs_direct_connection(request[2:]):
+                    return RespError("ERR", "会改变连接状态的命令不能经代理执行")
+                with self.pools.borrow(request[1]) as client:
+                    return client.execute_command(*request[2:])
+            if op == "PING":
+                return True
+            if op == "STATUS":
+                return [f"pid={os.getpid()}", *self.pools.describe()]
+            if op == "SHUTDOWN":
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return True
+        except Exception as exc:  # 原样转发给 CLI
+            return exc
+        return RespError("ERR", f"unknown agent command {op!r}")
+
+    def _janitor(self) -> None:
+        interval = max(1.0, min(self.pools.pool_idle, 30.0))
+        while True:
+            time.sleep(interval)
+            self.pools.evict_idle()
+            idle = time.monotonic() - self.last_request
+            if self.idle_timeout and idle > self.idle_timeout:
+                self.shutdown()
+                return
+
+    def serve(self) -> None:
+        threading.Thread(target=self._janitor, daemon=True).start()
+        try:
+            self.serve_forever()
+        finally:
+            self.pools.close_all()
+            self.server_close()
+            if self.path.exists():
+                self.path.unlink()
+
+
+def serve(
+    path: Optional[Path] = None,
+    pool_idle: float = DEFAULT_POOL_IDLE,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    warm: Iterable[ConnectionOptions] = (),
+) -> None:
+    server = AgentServer(path or default_socket_path(), pool_idle, idle_timeout)
+    for options in warm:
+        server.warm(options)
+    server.serve()
+
+
+__all__ = [
+    "AgentServer",
+    "DEFAULT_IDLE_TIMEOUT",
+    "DEFAULT_POOL_IDLE",
+    "serve",
+]
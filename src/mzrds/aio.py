@@ -0,0 +1,187 @@
+"""
+基于 redis.asyncio 的异步引擎。
+
+与 ``client.get_client`` 对应，``get_async_client`` 按相同的连接参数创建
+``redis.asyncio`` 的单机或 Cluster 客户端。需要大量并发请求的命令
+（Cluster 扫描、批量操作、压测等）可以在单个线程上同时保持成千上万个
+in-flight 请求；简单的一次性命令仍然使用同步客户端。
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+)
+
+from .client import _cluster_kwargs, _common_kwargs
+from .config import ConnectionOptions
+from .scanner import ScanPage, TunerFactory, node_name
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+    from redis.asyncio.cluster import RedisCluster
+
+AsyncPageProcessor = Callable[[Any, List[bytes]], Awaitable[Any]]
+
+
+def create_async_redis_client(options: ConnectionOptions) -> Redis:
+    from redis.asyncio import Redis, from_url
+
+    kwargs = _common_kwargs(options, asyncio=True)
+    if options.uri:
+        return from_url(options.uri, **kwargs)
+    return Redis(host=options.host, port=options.port, **kwargs)
+
+
+def create_async_cluster_client(options: ConnectionOptions) -> RedisCluster:
+    from redis.asyncio.cluster import RedisCluster
+
+    kwargs = _cluster_kwargs(options, asyncio=True)
+    if options.uri:
+        return RedisCluster.from_url(options.uri, **kwargs)
+    return RedisCluster(host=options.host, port=options.port, **kwargs)
+
+
+def get_async_client(options: ConnectionOptions):
+    if options.cluster:
+        return create_async_cluster_client(options)
+    return create_async_redis_client(options)
+
+
+async def gather_bounded(aws: Iterable[Awaitable], limit: int) -> List[Any]:
+    """并发执行并按输入顺序返回结果，同时最多 ``limit`` 个 in-flight。"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(aw: Awaitable) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
+
+async def _scan_node(
+    client,
+    node,
+    match: str,
+    count: int,
+    cursor: int,
+    process: Optional[AsyncPageProcessor],
+    type_: Optional[str] = None,
+    tuner: Optional[TunerFactory] = None,
+) -> AsyncIterator[ScanPage]:
+    adaptive = tuner() if tuner else None
+    while True:
+        if adaptive:
+            count = adaptive.count
+            started = time.perf_counter()
+        if node is None:
+            cursor, keys = await client.scan(
+                cursor=cursor, match=match, count=count, _type=type_
+            )
+            name = node_name(client)
+        else:
+            cursors, keys = await client.scan(
+                cursor=cursor, match=match, count=count, _type=type_, target_nodes=node
+            )
+            cursor, name = cursors[node.name], node.name
+        if adaptive:
+            adaptive.observe(time.perf_counter() - started, len(keys))
+        result = await process(client, keys) if process and keys else None
+        yield ScanPage(node=name, cursor=cursor, keys=keys, result=result)
+        if cursor == 0:
+            return
+
+
+async def primary_names(client) -> List[str]:
+    """与 ``scanner.primary_clients`` 的节点名一致，用于登记检查点。"""
+    if not hasattr(client, "get_primaries"):
+        return [node_name(client)]
+    await client.initialize()
+    return [node.name for node in client.get_primaries()]
+
+
+async def iter_async_scan_pages(
+    client,
+    match: str = "*",
+    count: int = 100,
+    process: Optional[AsyncPageProcessor] = None,
+    max_pending: int = 64,
+    resume: Optional[Mapping[str, Optional[int]]] = None,
+    type_: Optional[str] = None,
+    tuner: Optional[TunerFactory] = None,
+    parallelism: Optional[int] = None,
+) -> AsyncIterator[ScanPage]:
+    """
+    ``scanner.iter_scan_pages`` 的异步版本：Cluster 模式下每个主节点一个协程，
+    页一到就产出。``max_pending`` 限制尚未被消费的页数，保证内存有界。
+    ``resume``、``type_``、``tuner`` 与 ``parallelism``（同时扫描的主节点数，
+    默认全部）的含义与同步版本相同。
+    """
+    resume = resume or {}
+    if not hasattr(client, "get_primaries"):
+        name = node_name(client)
+        if name in resume and resume[name] is None:
+            return
+        async for page in _scan_node(
+            client, None, match, count, resume.get(name, 0), process, type_, tuner
+        ):
+            yield page
+        return
+
+    await client.initialize()
+    nodes = [
+        node
+        for node in client.get_primaries()
+        if not (node.name in resume and resume[node.name] is None)
+    ]
+    pages: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+    done = object()
+    slots = asyncio.Semaphore(parallelism or max(len(nodes), 1))
+
+    async def worker(node) -> None:
+        try:
+            async with slots:
+                start = resume.get(node.name, 0)
+                async for page in _scan_node(
+                    client, node, match, count, start, process, type_, tuner
+                ):
+                    await pages.put(page)
+        except Exception as exc:  # 交给消费者重新抛出
+            await pages.put(exc)
+            return
+        await pages.put(done)
+
+    tasks = [asyncio.create_task(worker(node)) for node in nodes]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await pages.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+__all__ = [
+    "create_async_cluster_client",
+    "create_async_redis_client",
+    "gather_bounded",
+    "get_async_client",
+    "iter_async_scan_pages",
+    "primary_names",
+]
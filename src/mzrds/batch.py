@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import shlex
+from typing import BinaryIO, Iterable, Iterator, List, Sequence, Union
+
+CommandParts = List[Union[str, bytes]]
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def parse_command_line(line: str) -> List[str]:
+    """按 redis-cli 的规则拆分一行命令，支持单双引号。"""
+    try:
+        return shlex.split(line)
+    except ValueError as exc:
+        raise ValueError(f"无法解析命令: {line!r} ({exc})") from exc
+
+
+def _read_resp_line(stream: BinaryIO) -> bytes:
+    line = stream.readline()
+    if not line.endswith(b"\r\n"):
+        raise ValueError("RESP 输入不完整：缺少 CRLF")
+    return line[:-2]
+
+
+def _read_resp_command(stream: BinaryIO, header: bytes) -> CommandParts:
+    try:
+        argc = int(header[1:])
+    except ValueError as exc:
+        raise ValueError(f"非法的 RESP 数组头: {header!r}") from exc
+    parts: CommandParts = []
+    for _ in range(argc):
+        bulk = _read_resp_line(stream)
+        if not bulk.startswith(b"$"):
+            raise ValueError(f"RESP 命令参数必须是 bulk string: {bulk!r}")
+        size = int(bulk[1:])
+        data = stream.read(size + 2)
+        if len(data) != size + 2 or not data.endswith(b"\r\n"):
+            raise ValueError("RESP 输入不完整：bulk string 被截断")
+        parts.append(data[:-2])
+    return parts
+
+
+def _parse_inline(line: bytes) -> CommandParts:
+    try:
+        return parse_command_line(line.decode("utf-8"))
+    except UnicodeDecodeError:
+        pass
+    # 与服务端一样按字节处理：无法解码的字节经 surrogateescape 原样还原
+    parts = parse_command_line(line.decode("utf-8", "surrogateescape"))
+    return [part.encode("utf-8", "surrogateescape") for part in parts]
+
+
+def iter_commands(stream: BinaryIO) -> Iterator[CommandParts]:
+    """
+    从二进制流中逐条读取命令。
+
+    与 Redis 服务端的解析方式一致：以 ``*`` 开头的是 RESP 数组（redis-cli
+    ``--pipe`` 格式，二进制安全），其余按行解析为 inline 命令，空行忽略。
+    解析错误以 ``ValueError`` 抛出，消息中带有命令开始的行号。
+    """
+    number = 0
+    while True:
+        line = stream.readline()
+        if not line:
+            return
+        start = number = number + 1
+        try:
+            if line.startswith(b"*"):
+                if not line.endswith(b"\r\n"):
+                    raise ValueError("RESP 输入不完整：缺少 CRLF")
+                parts = _read_resp_command(stream, line[:-2])
+                # 每个参数占 "$长度" 与数据两行，数据中可能还有换行
+                number += sum(2 + part.count(b"\n") for part in parts)
+            else:
+                parts = _parse_inline(line)
+        except ValueError as exc:
+            raise ValueError(f"第 {start} 行: {exc}") from exc
+        if parts:
+            yield parts
+
+
+def _chunks(commands: Iterable[CommandParts], size: int) -> Iterator[List[CommandParts]]:
+    """按 ``size`` 分块；输入中途出错时先产出已经读到的命令，再抛出该错误。"""
+    chunk: List[CommandParts] = []
+    try:
+        for parts in commands:
+            chunk.append(parts)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+    except ValueError:
+        if chunk:
+            yield chunk
+        raise
+    if chunk:
+        yield chunk
+
+
+def execute_batch(
+    client,
+    commands: Iterable[Sequence],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator:
+    """
+    通过非事务 pipeline 分批执行命令，按输入顺序逐条产出回复。
+
+    单条命令的错误不会中断整批执行，而是以异常对象的形式出现在回复中。
+    ``commands`` 中途抛出 ``ValueError`` 时，之前读到的命令会全部执行并产出
+    回复，然后再抛出该错误。
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size 必须大于 0")
+    for chunk in _chunks(commands, chunk_size):
+        pipe = client.pipeline(transaction=False)
+        for parts in chunk:
+            pipe.execute_command(*parts)
+        yield from pipe.execute(raise_on_error=False)
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "execute_batch",
+    "iter_commands",
+    "parse_command_line",
+]
@@ -0,0 +1,224 @@
+"""
+内置压测（类似 redis-benchmark）。
+
+每个客户端循环地从共享的请求预算中领取一批命令，按 pipeline 深度发送，
+把整批的往返耗时按命令数记入该客户端自己的 ``LatencyHistogram``，
+结束后合并。客户端可以是线程（同步客户端）或 asyncio 协程（异步客户端）。
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import LatencyHistogram
+
+RAND_PLACEHOLDER = "__rand_int__"
+DEFAULT_PREFIX = "mzrds:bench:"
+
+CommandFactory = Callable[[random.Random], Sequence]
+
+# 测试名 -> (key 类别, 由 key、value、随机数生成命令)
+BENCH_TESTS: Dict[str, Tuple[str, Callable[[str, bytes, str], Tuple]]] = {
+    "ping": ("", lambda key, value, rand: ("PING",)),
+    "set": ("key", lambda key, value, rand: ("SET", key, value)),
+    "get": ("key", lambda key, value, rand: ("GET", key)),
+    "incr": ("counter", lambda key, value, rand: ("INCR", key)),
+    "lpush": ("list", lambda key, value, rand: ("LPUSH", key, value)),
+    "zadd": ("zset", lambda key, value, rand: ("ZADD", key, rand, f"element:{rand}")),
+}
+
+
+def _rand(rng: random.Random, keyspace: int) -> str:
+    return f"{rng.randrange(keyspace):012d}"
+
+
+def builtin_workload(
+    test: str, keyspace: int, data_size: int, prefix: str = DEFAULT_PREFIX
+) -> CommandFactory:
+    """返回内置测试的命令生成函数；不同类型的 key 使用不同前缀，互不冲突。"""
+    try:
+        kind, build = BENCH_TESTS[test]
+    except KeyError:
+        raise ValueError(f"未知的测试: {test}（可选: {', '.join(BENCH_TESTS)}）") from None
+    value = b"x" * data_size
+
+    def factory(rng: random.Random) -> Tuple:
+        rand = _rand(rng, keyspace)
+        return build(f"{prefix}{kind}:{rand}", value, rand)
+
+    return factory
+
+
+def custom_workload(parts: Sequence[str], keyspace: int) -> CommandFactory:
+    """
+    自定义命令（与 ``exec`` 的参数写法相同），参数中的 ``__rand_int__``
+    每次都会替换为 ``[0, keyspace)`` 内的随机数。
+    """
+    if not parts:
+        raise ValueError("自定义命令不能为空")
+    templated = [idx for idx, part in enumerate(parts) if RAND_PLACEHOLDER in part]
+    if not templated:
+        return lambda rng: parts
+
+    def factory(rng: random.Random) -> List[str]:
+        args = list(parts)
+        for idx in templated:
+            args[idx] = args[idx].replace(RAND_PLACEHOLDER, _rand(rng, keyspace))
+        return args
+
+    return factory
+
+
+@dataclass
+class BenchResult:
+    name: str
+    requests: int
+    errors: int
+    elapsed: float
+    latency: LatencyHistogram
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class _Budget:
+    """所有客户端共享的请求预算，每次最多领取一个 pipeline 的命令数。"""
+
+    def __init__(self, requests: int):
+        self.remaining = requests
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> int:
+        with self._lock:
+            n = min(n, self.remaining)
+            self.remaining -= n
+            return n
+
+
+def _count_errors(replies: Sequence) -> int:
+    return sum(isinstance(reply, Exception) for reply in replies)
+
+
+def _merge(name: str, results: Sequence[Tuple[LatencyHistogram, int]], elapsed: float) -> BenchResult:
+    latency = LatencyHistogram()
+    errors = 0
+    for histogram, failed in results:
+        latency.merge(histogram)
+        errors += failed
+    return BenchResult(name, latency.count, errors, elapsed, latency)
+
+
+def run_threads(
+    client,
+    name: str,
+    workload: CommandFactory,
+    requests: int,
+    clients: int,
+    pipeline: int,
+    seed: Optional[int] = None,
+) -> BenchResult:
+    """用 ``clients`` 个线程共享一个同步客户端（连接池）压测。"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from redis.exceptions import ResponseError
+
+    budget = _Budget(requests)
+    # 所有线程先各自建立连接，再同时开始计时
+    ready = threading.Barrier(clients + 1)
+
+    def worker(index: int) -> Tuple[LatencyHistogram, int]:
+        rng = random.Random(None if seed is None else seed + index)
+        histogram = LatencyHistogram()
+        errors = 0
+        try:
+            client.ping()
+        finally:
+            ready.wait()
+        while True:
+            n = budget.take(pipeline)
+            if not n:
+                return histogram, errors
+            if n == 1:
+                args = workload(rng)
+                started = time.perf_counter()
+                try:
+                    client.execute_command(*args)
+                except ResponseError:
+                    errors += 1
+            else:
+                pipe = client.pipeline(transaction=False)
+                for _ in range(n):
+                    pipe.execute_command(*workload(rng))
+                started = time.perf_counter()
+                errors += _count_errors(pipe.execute(raise_on_error=False))
+            histogram.record((time.perf_counter() - started) * 1_000_000, n)
+
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        futures = [pool.submit(worker, index) for index in range(clients)]
+        ready.wait()
+        started = time.perf_counter()
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+    return _merge(name, results, elapsed)
+
+
+async def run_async(
+    client,
+    name: str,
+    workload: CommandFactory,
+    requests: int,
+    clients: int,
+    pipeline: int,
+    seed: Optional[int] = None,
+) -> BenchResult:
+    """在单个事件循环中用 ``clients`` 个协程共享一个异步客户端压测。"""
+    import asyncio
+
+    from redis.exceptions import ResponseError
+
+    budget = _Budget(requests)
+    # 并发 PING 让连接池先建立 clients 个连接
+    await asyncio.gather(*(client.ping() for _ in range(clients)))
+
+    async def worker(index: int) -> Tuple[LatencyHistogram, int]:
+        rng = random.Random(None if seed is None else seed + index)
+        histogram = LatencyHistogram()
+        errors = 0
+        while True:
+            n = budget.take(pipeline)
+            if not n:
+                return histogram, errors
+            if n == 1:
+                args = workload(rng)
+                started = time.perf_counter()
+                try:
+                    await client.execute_command(*args)
+                except ResponseError:
+                    errors += 1
+            else:
+                pipe = client.pipeline(transaction=False)
+                for _ in range(n):
+                    pipe.execute_command(*workload(rng))
+                started = time.perf_counter()
+                errors += _count_errors(await pipe.execute(raise_on_error=False))
+            histogram.record((time.perf_counter() - started) * 1_000_000, n)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(worker(index) for index in range(clients)))
+    return _merge(name, results, time.perf_counter() - started)
+
+
+__all__ = [
+    "BENCH_TESTS",
+    "BenchResult",
+    "DEFAULT_PREFIX",
+    "RAND_PLACEHOLDER",
+    "builtin_workload",
+    "custom_workload",
+    "run_async",
+    "run_threads",
+]
@@ -0,0 +1,132 @@
+"""
+长时间扫描任务的检查点。
+
+定期把每个节点已提交的 SCAN 游标与计数写入 JSON 文件，进程中断后可以用
+``--resume`` 从上次提交的位置继续。文件先写入临时文件再原子替换，
+写到一半被杀掉也不会留下损坏的检查点。
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Union
+
+CHECKPOINT_VERSION = 1
+DEFAULT_INTERVAL = 5.0
+
+
+class CheckpointError(ValueError):
+    """检查点文件无法读取，或与本次任务的参数不一致。"""
+
+
+class Checkpoint:
+    """
+    ``task`` 描述任务本身（命令、匹配模式、源地址等），恢复时必须与文件中
+    记录的一致；``cursors`` 为 ``{节点名: 下一次 SCAN 的游标}``，值为 None
+    表示该节点已经扫描完成，可直接传给 ``iter_scan_pages(resume=...)``。
+
+    ``before_save`` 在每次落盘前调用。输出有缓冲时应设为输出的 flush，
+    保证检查点记录的页都已真正写出；它抛出异常时本次不会落盘。
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        task: Mapping[str, Any],
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        self.path = Path(path)
+        self.task = dict(task)
+        self.interval = interval
+        self.cursors: Dict[str, Optional[int]] = {}
+        self.counters: Dict[str, int] = {}
+        self.before_save: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+        self._saved_at = time.monotonic()
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        task: Mapping[str, Any],
+        interval: float = DEFAULT_INTERVAL,
+    ) -> "Checkpoint":
+        checkpoint = cls(path, task, interval)
+        try:
+            with checkpoint.path.open("r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except FileNotFoundError as exc:
+            raise CheckpointError(f"检查点文件不存在: {path}") from exc
+        except (OSError, ValueError) as exc:
+            raise CheckpointError(f"无法读取检查点文件 {path}: {exc}") from exc
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            raise CheckpointError(f"不支持的检查点格式: {path}")
+        if data.get("task") != checkpoint.task:
+            raise CheckpointError(
+                f"检查点 {path} 属于另一个任务: {json.dumps(data.get('task'), ensure_ascii=False)}"
+            )
+        checkpoint.cursors = dict(data.get("cursors") or {})
+        checkpoint.counters = dict(data.get("counters") or {})
+        return checkpoint
+
+    @property
+    def resume(self) -> Dict[str, Optional[int]]:
+        with self._lock:
+            return dict(self.cursors)
+
+    def track(self, nodes: Iterable[str]) -> None:
+        """登记任务涉及的全部节点，尚未开始的节点记为游标 0。"""
+        with self._lock:
+            for node in nodes:
+                self.cursors.setdefault(node, 0)
+
+    @property
+    def finished(self) -> bool:
+        """登记过的节点都已扫描完成。"""
+        with self._lock:
+            return bool(self.cursors) and all(
+                cursor is None for cursor in self.cursors.values()
+            )
+
+    def commit(
+        self, node: str, cursor: int, counts: Optional[Mapping[str, int]] = None
+    ) -> None:
+        """记录某节点已处理完游标 ``cursor`` 之前的全部 key，到达间隔时落盘。"""
+        with self._lock:
+            self.cursors[node] = cursor or None
+            for name, value in (counts or {}).items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            if time.monotonic() - self._saved_at >= self.interval:
+                self._save()
+
+    def save(self) -> None:
+        with self._lock:
+            self._save()
+
+    def _save(self) -> None:
+        if self.before_save:
+            self.before_save()
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "task": self.task,
+            "cursors": self.cursors,
+            "counters": self.counters,
+            "updated_at": time.time(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            json.dump(data, fh, ensure_ascii=False, indent=2)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self._saved_at = time.monotonic()
+
+
+__all__ = [
+    "Checkpoint",
+    "CheckpointError",
+]
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
 import typer
 
+from mzrds.agent import connect_agent, needs_direct_connection
+from mzrds.batch import DEFAULT_CHUNK_SIZE, execute_batch, iter_commands
 from mzrds.client import get_client
+from mzrds.commands.agent import agent_app
+from mzrds.commands.bench import register_bench_commands
+from mzrds.commands.bulk import register_bulk_commands
 from mzrds.commands.connection import connection_app
+from mzrds.commands.keyspace import register_keyspace_commands
+from mzrds.commands.latency import register_latency_commands
+from mzrds.commands.migrate import register_migrate_commands
+from mzrds.commands.monitor import register_monitor_commands
+from mzrds.commands.pubsub import register_pubsub_commands
+from mzrds.commands.repl import register_repl_commands
 from mzrds.commands.scan import register_scan_commands
+from mzrds.commands.top import register_top_commands
+from mzrds.commands.transfer import register_transfer_commands
 from mzrds.config import ConfigStore, ConnectionOptions, merge_options
-from mzrds.executor import execute_raw, print_response
+from mzrds.executor import execute_command_reply, print_response
+from mzrds.output import OUTPUT_HELP, OutputFormat, OutputWriter
 
 
 app = typer.Typer(
@@ -35,21 +49,48 @@ Examples:
     add_completion=False,
 )
 app.add_typer(connection_app, name="config", help="管理连接配置 (list, save, use, delete...)")
+app.add_typer(agent_app, name="agent", help="管理本地连接代理 (start, stop, status)")
 register_scan_commands(app)
+register_transfer_commands(app)
+register_migrate_commands(app)
+register_keyspace_commands(app)
+register_bulk_commands(app)
+register_bench_commands(app)
+register_latency_commands(app)
+register_top_commands(app)
+register_monitor_commands(app)
+register_pubsub_commands(app)
+register_repl_commands(app)
 
 @dataclass
 class CLIState:
     store: ConfigStore
     options: ConnectionOptions
     active_profile: Optional[str] = None
+    use_agent: bool = True
     _client: Any = None
+    _agent: Any = None
 
     def get_client(self):
         if self._client is None:
             self._client = get_client(self.options)
         return self._client
 
+    def get_command_client(self, command: Sequence = ()):
+        """
+        单条命令优先经本地代理转发，代理不可用时回退为直连客户端。
+
+        会改变连接状态的命令（SELECT、MULTI、SUBSCRIBE 等）总是直连执行。
+        """
+        if needs_direct_connection(command):
+            return self.get_client()
+        if self.use_agent and self._agent is None:
+            self._agent = connect_agent(self.options, fallback=self.get_client) or False
+        return self._agent or self.get_client()
+
     def close(self) -> None:
+        if self._agent:
+            self._agent.close()
         if self._client and hasattr(self._client, "close"):
             self._client.close()
 
@@ -66,6 +107,7 @@ def _collect_overrides(
     cert: Optional[str],
     key: Optional[str],
     cluster: Optional[bool],
+    pool: Optional[Dict[str, object]] = None,
 ) -> Dict[str, object]:
     overrides: Dict[str, object] = {
         "host": host,
@@ -78,6 +120,8 @@ def _collect_overrides(
         "cert": cert,
         "key": key,
     }
+    # 套接字 / 连接池设置：None 表示沿用配置中的值
+    overrides.update(pool or {})
     if tls is not None:
         overrides["tls"] = tls
     if cluster is not None:
@@ -106,6 +150,32 @@ def main(
     cluster: Optional[bool] = typer.Option(
         None, "--cluster/--no-cluster", help="启用 Redis Cluster"
     ),
+    no_agent: bool = typer.Option(
+        False, "--no-agent", help="不经过本地连接代理，直接连接 Redis"
+    ),
+    socket_timeout: Optional[float] = typer.Option(
+        None, "--socket-timeout", min=0, help="读写超时（秒），避免在半开连接上无限等待"
+    ),
+    connect_timeout: Optional[float] = typer.Option(
+        None, "--connect-timeout", min=0, help="建立连接的超时（秒）"
+    ),
+    keepalive: Optional[bool] = typer.Option(
+        None, "--keepalive/--no-keepalive", help="启用或关闭 TCP keepalive"
+    ),
+    health_check: Optional[float] = typer.Option(
+        None, "--health-check", min=0,
+        help="连接空闲超过该秒数后，复用前先发 PING 检查（0 表示关闭）",
+    ),
+    max_connections: Optional[int] = typer.Option(
+        None, "--max-connections", min=1,
+        help="连接池上限（Cluster 下按节点计），多线程命令的并发数不会超过它",
+    ),
+    retries: Optional[int] = typer.Option(
+        None, "--retries", min=0, help="连接错误或超时后的重试次数（0 表示不重试）"
+    ),
+    retry_backoff: Optional[float] = typer.Option(
+        None, "--retry-backoff", min=0, help="重试的初始退避时间（秒），按指数增长并加随机抖动"
+    ),
 ) -> None:
     store = ConfigStore()
     profile_name = use or store.get_current()
@@ -114,11 +184,25 @@ def main(
         base = store.get_profile(profile_name)
         if not base and use:
             raise typer.BadParameter(f"配置 {profile_name} 不存在")
+    pool = {
+        "socket_timeout": socket_timeout,
+        "socket_connect_timeout": connect_timeout,
+        "socket_keepalive": keepalive,
+        "health_check_interval": health_check,
+        "max_connections": max_connections,
+        "retries": retries,
+        "retry_backoff": retry_backoff,
+    }
     overrides = _collect_overrides(
-        host, port, password, username, db, uri, tls, cacert, cert, key, cluster
+        host, port, password, username, db, uri, tls, cacert, cert, key, cluster, pool
     )
     options = merge_options(base, overrides)
-    state = CLIState(store=store, options=options, active_profile=profile_name)
+    state = CLIState(
+        store=store,
+        options=options,
+        active_profile=profile_name,
+        use_agent=not no_agent,
+    )
     ctx.obj = state
 
     def _cleanup():
@@ -130,31 +214,115 @@ def main(
         typer.echo(ctx.get_help())
         raise typer.Exit()
 
-@app.command("exec")
+def _run_batch(
+    state: CLIState,
+    source,
+    chunk_size: int,
+    quiet: bool,
+    fmt: OutputFormat = OutputFormat.text,
+) -> None:
+    client = state.get_client()
+    replies = errors = 0
+    try:
+        with OutputWriter(fmt=fmt) as out:
+            for reply in execute_batch(client, iter_commands(source), chunk_size):
+                replies += 1
+                if isinstance(reply, Exception):
+                    errors += 1
+                if not quiet:
+                    out.write_reply(reply)
+    except ValueError as exc:
+        raise typer.BadParameter(f"{exc}（之前的 {replies} 条命令已执行）") from exc
+    if quiet:
+        typer.echo(f"errors: {errors}, replies: {replies}")
+    if errors:
+        raise typer.Exit(code=1)
+
+
+@app.command(
+    "exec",
+    # COMMAND 之后的内容原样作为命令参数（例如 lrange key 0 -1 中的 -1）
+    context_settings={"allow_interspersed_args": False, "ignore_unknown_options": True},
+)
 def exec_command(
     ctx: typer.Context,
-    command: List[str] = typer.Argument(
-        ...,
+    command: Optional[List[str]] = typer.Argument(
+        None,
         metavar="COMMAND",
         help="Redis 命令及参数。例如: set key value, get key, info...",
     ),
+    batch: Optional[typer.FileBinaryRead] = typer.Option(
+        None, "--batch", "-b", help="从文件（- 表示标准输入）批量读取命令"
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CHUNK_SIZE, "--chunk-size", min=1, help="批量模式下每个 pipeline 的命令数"
+    ),
+    output: OutputFormat = typer.Option(
+        OutputFormat.text, "--output", "-o", help=OUTPUT_HELP
+    ),
 ) -> None:
     """
     执行任意 Redis 命令。
 
+    使用 --batch 时按行读取命令（也支持 RESP 格式），
+    通过 pipeline 分批发送并按顺序输出每条回复。
+
     Examples:
       mzrds exec ping
       mzrds exec set mykey "hello world"
       mzrds exec get mykey
       mzrds exec keys "user:*"
+      mzrds exec --batch commands.txt
+      cat commands.txt | mzrds exec --batch -
+      mzrds exec -o json hgetall myhash
     """
     state: CLIState = ctx.obj
 
     if not state:
         raise typer.Exit(code=1)
-    client = state.get_client()
-    response = execute_raw(client, command)
-    print_response(response)
+    if batch is not None:
+        if command:
+            raise typer.BadParameter("--batch 模式下不能同时指定命令")
+        _run_batch(state, batch, chunk_size, quiet=False, fmt=output)
+        return
+    client = state.get_command_client(command or [])
+    response = execute_command_reply(client, command or [])
+    if output is OutputFormat.text:
+        print_response(response)
+    else:
+        with OutputWriter(fmt=output) as out:
+            out.write_reply(response)
+    if isinstance(response, Exception):
+        raise typer.Exit(code=1)
+
+
+@app.command("pipe")
+def pipe_command(
+    ctx: typer.Context,
+    source: typer.FileBinaryRead = typer.Argument(
+        "-", help="命令文件，默认读取标准输入"
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CHUNK_SIZE, "--chunk-size", min=1, help="每个 pipeline 的命令数"
+    ),
+    replies: bool = typer.Option(
+        False, "--replies", help="逐条输出回复，而不是只输出汇总"
+    ),
+) -> None:
+    """
+    批量导入命令，类似 redis-cli --pipe。
+
+    输入可以是每行一条的文本命令，也可以是 RESP 格式的原始协议数据。
+    默认只在结束时输出错误数与回复数。
+
+    Examples:
+      cat data.txt | mzrds pipe
+      mzrds pipe data.resp --chunk-size 5000
+    """
+    state: CLIState = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    _run_batch(state, source, chunk_size, quiet=not replies)
 
 
 def run() -> None:
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-import ssl
-from typing import Any, Dict
-
-from redis import Redis, from_url
-from redis.cluster import RedisCluster
+from typing import TYPE_CHECKING, Any, Dict
 
 from .config import ConnectionOptions
 
+# redis / ssl 导入耗时明显，推迟到真正创建客户端时再加载，
+# 让 config 等不需要连接的命令保持快速启动。
+if TYPE_CHECKING:
+    from redis import Redis
+    from redis.cluster import RedisCluster
+
 
 def _build_ssl_kwargs(options: ConnectionOptions) -> Dict[str, Any]:
     if not options.tls and not any([options.cacert, options.cert, options.key]):
         return {}
+    import ssl
+
     kwargs: Dict[str, Any] = {"ssl": True}
     cert_reqs = ssl.CERT_REQUIRED if options.cacert else ssl.CERT_NONE
     kwargs["ssl_cert_reqs"] = cert_reqs
@@ -24,19 +28,63 @@ def _build_ssl_kwargs(options: ConnectionOptions) -> Dict[str, Any]:
     return kwargs
 
 
-def _common_kwargs(options: ConnectionOptions) -> Dict[str, Any]:
+# 只指定 --retry-backoff 时的重试次数，与 redis-py 默认的 Retry 一致
+DEFAULT_RETRIES = 10
+DEFAULT_RETRY_BACKOFF = 0.01
+# 指数退避的单次等待上限（秒）
+RETRY_BACKOFF_CAP = 1.0
+
+
+def build_retry(options: ConnectionOptions, asyncio: bool = False) -> Any:
+    """
+    按 ``retries`` / ``retry_backoff`` 构造带抖动的指数退避 Retry；都未设置时返回 None。
+
+    连接错误与超时会在新连接上重试，``retries=0`` 关闭重试。
+    """
+    if options.retries is None and options.retry_backoff is None:
+        return None
+    from redis.backoff import ExponentialWithJitterBackoff
+
+    if asyncio:
+        from redis.asyncio.retry import Retry
+    else:
+        from redis.retry import Retry
+
+    base = DEFAULT_RETRY_BACKOFF if options.retry_backoff is None else options.retry_backoff
+    retries = DEFAULT_RETRIES if options.retries is None else options.retries
+    backoff = ExponentialWithJitterBackoff(cap=max(RETRY_BACKOFF_CAP, base), base=base)
+    return Retry(backoff, retries)
+
+
+def _common_kwargs(options: ConnectionOptions, asyncio: bool = False) -> Dict[str, Any]:
     kwargs: Dict[str, Any] = {
         "username": options.username,
         "password": options.password,
         "db": options.db,
         "decode_responses": False,
+        "socket_timeout": options.socket_timeout,
+        "socket_connect_timeout": options.socket_connect_timeout,
+        "socket_keepalive": options.socket_keepalive,
+        "health_check_interval": options.health_check_interval,
+        "max_connections": options.max_connections,
+        "retry": build_retry(options, asyncio),
     }
     kwargs.update(_build_ssl_kwargs(options))
     return {k: v for k, v in kwargs.items() if v is not None}
 
 
-def create_redis_client(options: ConnectionOptions) -> Redis:
+def _cluster_kwargs(options: ConnectionOptions, asyncio: bool = False) -> Dict[str, Any]:
+    kwargs = _common_kwargs(options, asyncio)
+    # Cluster 只有 0 号库，redis-py 遇到 db 参数会直接报错
+    kwargs.pop("db", None)
+    return kwargs
+
+
+def create_redis_client(options: ConnectionOptions, **overrides: Any) -> Redis:
+    from redis import Redis, from_url
+
     kwargs = _common_kwargs(options)
+    kwargs.update(overrides)
     if options.uri:
         return from_url(options.uri, **kwargs)
     return Redis(
@@ -47,7 +95,9 @@ def create_redis_client(options: ConnectionOptions) -> Redis:
 
 
 def create_cluster_client(options: ConnectionOptions) -> RedisCluster:
-    kwargs = _common_kwargs(options)
+    from redis.cluster import RedisCluster
+
+    kwargs = _cluster_kwargs(options)
     if options.uri:
         return RedisCluster.from_url(options.uri, **kwargs)
     return RedisCluster(
@@ -57,6 +107,47 @@ def create_cluster_client(options: ConnectionOptions) -> RedisCluster:
     )
 
 
+def connection_endpoint(options: ConnectionOptions) -> Dict[str, Any]:
+    """连接的 host / port / db / 认证信息，URI 会被解析。"""
+    if options.uri:
+        from redis.connection import parse_url
+
+        parsed = parse_url(options.uri)
+        return {
+            "host": parsed.get("host", options.host),
+            "port": parsed.get("port", options.port),
+            "db": options.db or parsed.get("db", 0),
+            "username": options.username or parsed.get("username"),
+            "password": options.password or parsed.get("password"),
+        }
+    return {
+        "host": options.host,
+        "port": options.port,
+        "db": options.db,
+        "username": options.username,
+        "password": options.password,
+    }
+
+
+def connection_address(options: ConnectionOptions) -> str:
+    """``host:port/db`` 形式的地址（不含密码），用于识别检查点所属的实例。"""
+    endpoint = connection_endpoint(options)
+    db = 0 if options.cluster else endpoint["db"]
+    return f"{endpoint['host']}:{endpoint['port']}/{db}"
+
+
+def pool_workers(options: ConnectionOptions, workers: int) -> int:
+    """
+    多线程共用一个客户端时的并发数上限。
+
+    redis-py 的连接池满时会直接报 Too many connections，而不是等待空闲连接，
+    所以设置了 ``max_connections`` 时并发线程数不能超过它（Cluster 下按节点计）。
+    """
+    if options.max_connections and workers > options.max_connections:
+        return options.max_connections
+    return workers
+
+
 def get_client(options: ConnectionOptions):
     if options.cluster:
         return create_cluster_client(options)
@@ -64,7 +155,11 @@ def get_client(options: ConnectionOptions):
 
 
 __all__ = [
+    "build_retry",
+    "connection_address",
+    "connection_endpoint",
     "get_client",
+    "pool_workers",
     "create_redis_client",
     "create_cluster_client",
 ]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from typing import List
+
+import typer
+
+from ..agent import connect_agent, default_socket_path
+from ..agent_server import DEFAULT_IDLE_TIMEOUT, DEFAULT_POOL_IDLE, serve
+from ..config import ConfigStore
+
+
+agent_app = typer.Typer(
+    help="""
+管理本地连接代理 (agent)。
+代理在后台保持到 Redis 的常驻连接池，exec 命令会自动通过它转发，
+省去每次调用的 TCP/TLS/AUTH 握手；代理未运行时自动回退为直连。
+
+Examples:
+  mzrds agent start --profile prod
+  mzrds agent status
+  mzrds agent stop
+"""
+)
+
+
+def _profiles(store: ConfigStore, names: List[str]):
+    options = []
+    for name in names:
+        profile = store.get_profile(name)
+        if not profile:
+            raise typer.BadParameter(f"配置 {name} 不存在")
+        options.append(profile)
+    return options
+
+
+def _spawn_args(pool_idle: float, idle_timeout: float, profiles: List[str]) -> List[str]:
+    if getattr(sys, "frozen", False):
+        args = [sys.executable]
+    else:
+        args = [sys.executable, "-m", "mzrds.cli"]
+    args += ["agent", "run", "--pool-idle", str(pool_idle), "--idle-timeout", str(idle_timeout)]
+    for name in profiles:
+        args += ["--profile", name]
+    return args
+
+
+@agent_app.command("start")
+def start_agent(
+    ctx: typer.Context,
+    profile: List[str] = typer.Option(
+        [], "--profile", help="启动时预热的已保存配置（可多次指定）"
+    ),
+    pool_idle: float = typer.Option(
+        DEFAULT_POOL_IDLE, "--pool-idle", help="连接池空闲多少秒后关闭"
+    ),
+    idle_timeout: float = typer.Option(
+        DEFAULT_IDLE_TIMEOUT, "--idle-timeout", help="代理无请求多少秒后退出（0 表示不退出）"
+    ),
+) -> None:
+    """
+    在后台启动连接代理。
+
+    Examples:
+      mzrds agent start
+      mzrds agent start --profile prod --profile staging --idle-timeout 600
+    """
+    existing = connect_agent()
+    if existing:
+        existing.close()
+        typer.echo("代理已在运行。")
+        return
+    _profiles(ctx.obj.store, profile)
+    subprocess.Popen(
+        _spawn_args(pool_idle, idle_timeout, profile),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        agent = connect_agent()
+        if agent:
+            agent.close()
+            typer.echo(f"代理已启动: {default_socket_path()}")
+            return
+        time.sleep(0.05)
+    typer.echo("代理启动超时。", err=True)
+    raise typer.Exit(code=1)
+
+
+@agent_app.command("run")
+def run_agent(
+    ctx: typer.Context,
+    profile: List[str] = typer.Option([], "--profile", help="启动时预热的已保存配置"),
+    pool_idle: float = typer.Option(DEFAULT_POOL_IDLE, "--pool-idle"),
+    idle_timeout: float = typer.Option(DEFAULT_IDLE_TIMEOUT, "--idle-timeout"),
+) -> None:
+    """
+    在前台运行连接代理（start 会在后台调用本命令）。
+    """
+    serve(
+        pool_idle=pool_idle,
+        idle_timeout=idle_timeout,
+        warm=_profiles(ctx.obj.store, profile),
+    )
+
+
+@agent_app.command("status")
+def agent_status() -> None:
+    """
+    显示代理状态及当前保持的连接池。
+    """
+    agent = connect_agent()
+    if not agent:
+        typer.echo("代理未运行。")
+        raise typer.Exit(code=1)
+    try:
+        for line in agent.request("STATUS"):
+            typer.echo(line)
+    finally:
+        agent.close()
+
+
+@agent_app.command("stop")
+def stop_agent() -> None:
+    """
+    停止连接代理。
+    """
+    agent = connect_agent()
+    if not agent:
+        typer.echo("代理未运行。")
+        return
+    try:
+        agent.request("SHUTDOWN")
+    finally:
+        agent.close()
+    # 等待代理关闭连接池并删除 socket 文件
+    path = default_socket_path()
+    deadline = time.monotonic() + 10
+    while path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    typer.echo("代理已停止。")
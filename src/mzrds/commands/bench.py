@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING, List, Optional
+
+import typer
+
+if TYPE_CHECKING:
+    from ..bench import BenchResult
+    from ..cli import CLIState
+
+
+class BenchEngine(str, Enum):
+    thread = "thread"
+    asyncio = "async"
+
+
+def _state(ctx: typer.Context) -> "CLIState":
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state
+
+
+def _print_result(
+    result: "BenchResult", clients: int, pipeline: int, data_size: int, quiet: bool
+) -> None:
+    latency = result.latency
+    if quiet:
+        typer.echo(
+            f"{result.name}: {result.throughput:.2f} requests/s, "
+            f"p50={latency.percentile(50) / 1000:.3f} msec"
+        )
+        return
+    typer.echo(f"====== {result.name} ======")
+    typer.echo(
+        f"  {result.requests} 个请求，耗时 {result.elapsed:.2f}s，{clients} 个客户端，"
+        f"pipeline {pipeline}，value {data_size} 字节"
+    )
+    if result.errors:
+        typer.echo(f"  错误回复: {result.errors}")
+    typer.echo(f"  吞吐: {result.throughput:.2f} requests/s")
+    typer.echo("  延迟 (msec):")
+    typer.echo(
+        f"    avg {latency.mean / 1000:.3f}  min {latency.min / 1000:.3f}  "
+        f"p50 {latency.percentile(50) / 1000:.3f}  "
+        f"p99 {latency.percentile(99) / 1000:.3f}  "
+        f"p99.9 {latency.percentile(99.9) / 1000:.3f}  max {latency.max / 1000:.3f}"
+    )
+    typer.echo("")
+
+
+def bench_command(
+    ctx: typer.Context,
+    command: Optional[List[str]] = typer.Argument(
+        None,
+        metavar="[COMMAND]...",
+        help="自定义命令（写法同 exec），参数中的 __rand_int__ 会替换为随机数",
+    ),
+    tests: str = typer.Option(
+        "ping,set,get,incr,lpush,zadd", "--tests", "-t",
+        help="逗号分隔的内置测试：ping,set,get,incr,lpush,zadd",
+    ),
+    requests: int = typer.Option(100000, "--requests", "-n", min=1, help="每个测试的请求总数"),
+    clients: int = typer.Option(50, "--clients", "-c", min=1, help="并发客户端数"),
+    pipeline: int = typer.Option(1, "--pipeline", "-P", min=1, help="每个 pipeline 的命令数"),
+    keyspace: int = typer.Option(
+        100000, "--keyspace", "-r", min=1, help="随机 key 的取值范围"
+    ),
+    data_size: int = typer.Option(3, "--data-size", "-d", min=0, help="SET/LPUSH 的 value 字节数"),
+    prefix: str = typer.Option(
+        "mzrds:bench:", "--prefix", help="内置测试写入的 key 前缀"
+    ),
+    engine: BenchEngine = typer.Option(
+        BenchEngine.thread, "--engine",
+        help="客户端实现：thread 为多线程同步客户端，async 为单线程 asyncio",
+    ),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="每个测试只输出一行"),
+) -> None:
+    """
+    压测 Redis，输出吞吐与 p50/p99/p99.9 延迟，类似 redis-benchmark。
+
+    复用当前的连接配置（--use / -h / --cluster 等）。内置测试写入的 key
+    都带 --prefix 前缀，压测结束后不会自动清理。
+
+    Examples:
+      mzrds bench -t set,get -n 200000 -c 100 -P 16
+      mzrds --use staging bench -t get --engine async -c 500 -q
+      mzrds bench -n 50000 -- hset user:__rand_int__ name alice
+    """
+    from ..bench import builtin_workload, custom_workload
+    from ..client import pool_workers
+
+    state = _state(ctx)
+    # 每个并发客户端同时占用一个连接，不能超过连接池上限
+    clients = pool_workers(state.options, clients)
+    try:
+        if command:
+            workloads = [(" ".join(command), custom_workload(command, keyspace))]
+        else:
+            workloads = [
+                (name.upper(), builtin_workload(name, keyspace, data_size, prefix))
+                for name in (part.strip().lower() for part in tests.split(","))
+                if name
+            ]
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    if engine is BenchEngine.asyncio:
+        import asyncio
+
+        from ..aio import get_async_client
+        from ..bench import run_async
+
+        async def run_all() -> None:
+            client = get_async_client(state.options)
+            try:
+                for name, workload in workloads:
+                    result = await run_async(client, name, workload, requests, clients, pipeline)
+                    _print_result(result, clients, pipeline, data_size, quiet)
+            finally:
+                await client.aclose()
+
+        asyncio.run(run_all())
+        return
+
+    from ..bench import run_threads
+
+    client = state.get_client()
+    for name, workload in workloads:
+        result = run_threads(client, name, workload, requests, clients, pipeline)
+        _print_result(result, clients, pipeline, data_size, quiet)
+
+
+def register_bench_commands(app: typer.Typer) -> None:
+    app.command("bench")(bench_command)
+
+
+__all__ = ["register_bench_commands"]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence
+
+import typer
+
+from ..scanner import group_by_slot, is_cluster, iter_scan_pages
+from ..throttle import LatencyGuard, RateLimiter
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+
+
+def _client(ctx: typer.Context):
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state.get_client()
+
+
+def _unlink(pipe, keys: Sequence[bytes], by_slot: bool) -> None:
+    for group in group_by_slot(keys) if by_slot else [keys]:
+        pipe.unlink(*group)
+
+
+def _expire(ttl: int) -> Callable:
+    def queue(pipe, keys: Sequence[bytes], by_slot: bool) -> None:
+        for key in keys:
+            pipe.expire(key, ttl)
+
+    return queue
+
+
+class BulkAction:
+    """
+    对每个 SCAN 页执行一次 pipeline 批量操作（在扫描线程中调用）。
+
+    所有节点共享一个速率限制器；延迟退避按节点独立计算。单条命令的错误
+    不会中断扫描，而是计入 ``errors``，``last_error`` 保留最后一个错误。
+    """
+
+    def __init__(
+        self,
+        queue: Callable,
+        by_slot: bool,
+        rate: Optional[float],
+        max_latency: Optional[float],
+    ):
+        self.queue = queue
+        self.by_slot = by_slot
+        self.limiter = RateLimiter(rate)
+        self.max_latency = max_latency
+        self._guards: Dict[int, LatencyGuard] = {}
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, client, keys: Sequence[bytes]) -> int:
+        guard = self._guards.setdefault(id(client), LatencyGuard(self.max_latency))
+        self.limiter.acquire(len(keys))
+        pipe = client.pipeline(transaction=False)
+        self.queue(pipe, keys, self.by_slot)
+        started = time.monotonic()
+        replies = pipe.execute(raise_on_error=False)
+        guard.observe(time.monotonic() - started)
+        failed = [reply for reply in replies if isinstance(reply, Exception)]
+        if failed:
+            with self._lock:
+                self.errors += len(failed)
+                self.last_error = failed[-1]
+        return sum(int(reply) for reply in replies if not isinstance(reply, Exception))
+
+
+def _run(
+    ctx: typer.Context,
+    queue: Callable,
+    verb: str,
+    pattern: str,
+    count: int,
+    rate: Optional[float],
+    max_latency_ms: Optional[float],
+    dry_run: bool,
+    force: bool,
+    parallelism: Optional[int],
+) -> None:
+    client = _client(ctx)
+    if not dry_run and not force:
+        if not typer.confirm(f"确认{verb}所有匹配 {pattern} 的 key？", default=False):
+            typer.echo("已取消。")
+            raise typer.Exit()
+    process = None
+    if not dry_run:
+        max_latency = max_latency_ms / 1000 if max_latency_ms else None
+        process = BulkAction(queue, is_cluster(client), rate, max_latency)
+    scanned = affected = 0
+    started = time.monotonic()
+    for page in iter_scan_pages(
+        client, match=pattern, count=count, parallelism=parallelism, process=process
+    ):
+        scanned += len(page.keys)
+        affected += page.result or 0
+    elapsed = time.monotonic() - started
+    if dry_run:
+        typer.echo(f"匹配 {scanned} 个 key（dry-run，未做修改），耗时 {elapsed:.2f}s。")
+    else:
+        typer.echo(f"已{verb} {affected} 个 key（扫描到 {scanned} 个），耗时 {elapsed:.2f}s。")
+    if process is not None and process.errors:
+        typer.secho(
+            f"{process.errors} 条命令失败，最后一个错误: {process.last_error}",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(code=1)
+
+
+def delete_command(
+    ctx: typer.Context,
+    pattern: str = typer.Option(..., "--pattern", "-p", help="匹配模式"),
+    count: int = typer.Option(500, "--count", "-c", help="每次 SCAN 返回的最大条数"),
+    rate: Optional[float] = typer.Option(
+        None, "--rate", min=1, help="每秒最多删除的 key 数"
+    ),
+    max_latency: Optional[float] = typer.Option(
+        None, "--max-latency", min=1, help="批次耗时超过该毫秒数时自动退避"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="只统计匹配数量，不删除"),
+    force: bool = typer.Option(False, "--force", "-f", help="不提示直接执行"),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时处理的主节点数"
+    ),
+) -> None:
+    """
+    按模式批量删除 key（UNLINK）。
+
+    每个 SCAN 页用一个 pipeline 执行 UNLINK；Cluster 模式下按节点并行，
+    并按 slot 分组发送。
+
+    Examples:
+      mzrds del -p "session:*" --dry-run
+      mzrds del -p "session:*" --rate 5000 --max-latency 20 -f
+    """
+    _run(
+        ctx, _unlink, "删除", pattern, count, rate, max_latency, dry_run, force,
+        parallelism,
+    )
+
+
+def expire_command(
+    ctx: typer.Context,
+    pattern: str = typer.Option(..., "--pattern", "-p", help="匹配模式"),
+    ttl: int = typer.Option(..., "--ttl", min=1, help="过期时间（秒）"),
+    count: int = typer.Option(500, "--count", "-c", help="每次 SCAN 返回的最大条数"),
+    rate: Optional[float] = typer.Option(
+        None, "--rate", min=1, help="每秒最多处理的 key 数"
+    ),
+    max_latency: Optional[float] = typer.Option(
+        None, "--max-latency", min=1, help="批次耗时超过该毫秒数时自动退避"
+    ),
+    dry_run: bool = typer.Option(False, "--dry-run", help="只统计匹配数量，不修改"),
+    force: bool = typer.Option(False, "--force", "-f", help="不提示直接执行"),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时处理的主节点数"
+    ),
+) -> None:
+    """
+    按模式批量设置过期时间（EXPIRE）。
+
+    Examples:
+      mzrds expire -p "cache:*" --ttl 3600 --dry-run
+      mzrds expire -p "cache:*" --ttl 3600 --rate 10000 -f
+    """
+    _run(
+        ctx, _expire(ttl), "设置过期", pattern, count, rate, max_latency, dry_run,
+        force, parallelism,
+    )
+
+
+def register_bulk_commands(app: typer.Typer) -> None:
+    app.command("del")(delete_command)
+    app.command("expire")(expire_command)
+
+
+__all__ = ["BulkAction", "register_bulk_commands"]
@@ -0,0 +1,482 @@
+from __future__ import annotations
+
+import random
+import time
+from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
+
+import typer
+
+from ..executor import decode_value
+from ..filters import LENGTH_COMMANDS, key_types
+from ..metrics import PrefixTree, SizeDistribution, TopK, format_bytes
+from ..scanner import iter_scan_pages, primary_clients
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+
+
+KeySize = Tuple[bytes, str, int]
+KeyFreq = Tuple[bytes, int]
+# (key, MEMORY USAGE, PTTL)，未查询的字段为 None
+PrefixSample = Tuple[bytes, Optional[int], Optional[int]]
+
+
+class PrefixOrder(str, Enum):
+    count = "count"
+    memory = "memory"
+
+
+def _client(ctx: typer.Context):
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state.get_client()
+
+
+def key_lengths(client, keys: Sequence[bytes]) -> List[KeySize]:
+    """TYPE 之后再用一个 pipeline 执行各类型对应的长度命令。"""
+    sized = [
+        (key, type_)
+        for key, type_ in zip(keys, key_types(client, keys))
+        if type_ in LENGTH_COMMANDS
+    ]
+    pipe = client.pipeline(transaction=False)
+    for key, type_ in sized:
+        pipe.execute_command(LENGTH_COMMANDS[type_][0], key)
+    replies = pipe.execute(raise_on_error=False)
+    return [
+        (key, type_, reply)
+        for (key, type_), reply in zip(sized, replies)
+        if isinstance(reply, int)
+    ]
+
+
+def key_memory(client, keys: Sequence[bytes], samples: int = 5) -> List[KeySize]:
+    """在同一个 pipeline 中查询 TYPE 与 MEMORY USAGE。"""
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.type(key)
+        pipe.memory_usage(key, samples=samples)
+    replies = pipe.execute(raise_on_error=False)
+    result = []
+    for idx, key in enumerate(keys):
+        type_, usage = replies[2 * idx], replies[2 * idx + 1]
+        if isinstance(usage, int):
+            result.append((key, decode_value(type_), usage))
+    return result
+
+
+class KeyStats:
+    """按类型汇总 key 大小：每个类型保留 top-N 以及大小分布。"""
+
+    def __init__(self, top: int):
+        self.top = top
+        self.scanned = 0
+        self.by_type: Dict[str, Tuple[TopK, SizeDistribution]] = {}
+
+    def add(self, key: bytes, type_: str, size: int) -> None:
+        if type_ not in self.by_type:
+            self.by_type[type_] = (TopK(self.top), SizeDistribution())
+        biggest, distribution = self.by_type[type_]
+        biggest.push(size, key)
+        distribution.add(size)
+
+
+def _collect(
+    ctx: typer.Context,
+    process: Callable,
+    pattern: str,
+    count: int,
+    top: int,
+    parallelism: Optional[int],
+) -> Tuple[KeyStats, float]:
+    client = _client(ctx)
+    stats = KeyStats(top)
+    started = time.monotonic()
+    for page in iter_scan_pages(
+        client, match=pattern, count=count, parallelism=parallelism, process=process
+    ):
+        stats.scanned += len(page.keys)
+        for key, type_, size in page.result or ():
+            stats.add(key, type_, size)
+    return stats, time.monotonic() - started
+
+
+def _print_report(
+    stats: KeyStats,
+    elapsed: float,
+    render: Callable[[str, int], str],
+    distribution: bool,
+) -> None:
+    rate = stats.scanned / elapsed if elapsed > 0 else 0
+    typer.echo(f"扫描 {stats.scanned} 个 key，耗时 {elapsed:.2f}s（{rate:.0f} key/s）")
+    for type_ in sorted(stats.by_type):
+        biggest, sizes = stats.by_type[type_]
+        typer.echo("")
+        typer.echo(
+            f"[{type_}] {sizes.count} 个 key，合计 {render(type_, sizes.total)}，"
+            f"平均 {render(type_, round(sizes.mean))}"
+        )
+        for idx, (size, key) in enumerate(biggest.items(), start=1):
+            typer.echo(f"{idx}) {decode_value(key)} {render(type_, size)}")
+        if distribution:
+            for upper, number in sizes.rows():
+                typer.echo(f"   <= {render(type_, upper):>12}: {number}")
+
+
+def _render_length(type_: str, size: int) -> str:
+    unit = LENGTH_COMMANDS.get(type_, ("", "items"))[1]
+    return format_bytes(size) if unit == "bytes" else f"{size} {unit}"
+
+
+def _render_memory(type_: str, size: int) -> str:
+    return format_bytes(size)
+
+
+def bigkeys_command(
+    ctx: typer.Context,
+    pattern: str = typer.Option("*", "--pattern", "-p", help="匹配模式"),
+    count: int = typer.Option(500, "--count", "-c", help="每次 SCAN 返回的最大条数"),
+    top: int = typer.Option(10, "--top", "-t", min=1, help="每种类型显示的最大 key 数"),
+    distribution: bool = typer.Option(
+        False, "--dist", help="显示每种类型的大小分布"
+    ),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时扫描的主节点数"
+    ),
+) -> None:
+    """
+    按元素数量（string 为字节数）查找每种类型的最大 key，类似 redis-cli --bigkeys。
+
+    每个 SCAN 页先用 pipeline 查询 TYPE，再用 pipeline 查询
+    STRLEN/LLEN/SCARD/ZCARD/HLEN/XLEN。
+
+    Examples:
+      mzrds bigkeys
+      mzrds --cluster bigkeys -p "session:*" --top 20 --dist
+    """
+    stats, elapsed = _collect(ctx, key_lengths, pattern, count, top, parallelism)
+    _print_report(stats, elapsed, _render_length, distribution)
+
+
+def memkeys_command(
+    ctx: typer.Context,
+    pattern: str = typer.Option("*", "--pattern", "-p", help="匹配模式"),
+    count: int = typer.Option(500, "--count", "-c", help="每次 SCAN 返回的最大条数"),
+    top: int = typer.Option(10, "--top", "-t", min=1, help="每种类型显示的最大 key 数"),
+    samples: int = typer.Option(
+        5, "--samples", min=0, help="MEMORY USAGE 的 SAMPLES 参数（0 表示全部采样）"
+    ),
+    distribution: bool = typer.Option(
+        False, "--dist", help="显示每种类型的内存分布"
+    ),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时扫描的主节点数"
+    ),
+) -> None:
+    """
+    按内存占用查找每种类型的最大 key，类似 redis-cli --memkeys。
+
+    每个 SCAN 页用一个 pipeline 同时查询 TYPE 与 MEMORY USAGE。
+
+    Examples:
+      mzrds memkeys
+      mzrds memkeys -p "cache:*" --samples 0 --dist
+    """
+    process = partial(key_memory, samples=samples)
+    stats, elapsed = _collect(ctx, process, pattern, count, top, parallelism)
+    _print_report(stats, elapsed, _render_memory, distribution)
+
+
+def sample_keys(
+    client,
+    keys: Sequence[bytes],
+    rate: float = 1.0,
+    memory: bool = False,
+    ttl: bool = False,
+    samples: int = 5,
+) -> List[PrefixSample]:
+    """
+    按 ``rate`` 抽样一页 key，并用一个 pipeline 查询抽中 key 的 MEMORY USAGE / PTTL。
+
+    已删除的 key（PTTL 为 -2 或 MEMORY USAGE 为空）不计入结果。
+    """
+    if rate < 1:
+        keys = [key for key in keys if random.random() < rate]
+    if not keys or not (memory or ttl):
+        return [(key, None, None) for key in keys]
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        if memory:
+            pipe.memory_usage(key, samples=samples)
+        if ttl:
+            pipe.pttl(key)
+    replies = iter(pipe.execute(raise_on_error=False))
+    result = []
+    for key in keys:
+        usage = next(replies) if memory else None
+        pttl = next(replies) if ttl else None
+        if (memory and not isinstance(usage, int)) or pttl == -2:
+            continue
+        result.append((key, usage, pttl if isinstance(pttl, int) else None))
+    return result
+
+
+def _print_prefixes(
+    tree: PrefixTree,
+    scanned: int,
+    elapsed: float,
+    rate: float,
+    top: int,
+    order: PrefixOrder,
+    memory: bool,
+    ttl: bool,
+) -> None:
+    speed = scanned / elapsed if elapsed > 0 else 0
+    typer.echo(f"扫描 {scanned} 个 key，耗时 {elapsed:.2f}s（{speed:.0f} key/s）")
+    total = tree.root.count
+    if rate < 1:
+        typer.echo(f"抽样 {total} 个 key（{rate:g}），数量与内存为按比例估算值")
+    if not total:
+        return
+    scale = 1 / rate
+    typer.echo("")
+    for level, prefix, node in tree.walk(top, by_memory=order is PrefixOrder.memory):
+        columns = [
+            f"{'  ' * level}{decode_value(prefix)}",
+            f"{round(node.count * scale)} 个 key",
+            f"{node.count / total:.1%}",
+        ]
+        if memory:
+            columns.append(format_bytes(node.memory * scale))
+        if ttl:
+            expiring = f"{node.expiring / node.count:.0%} 带 TTL"
+            if node.expiring:
+                expiring += f"，平均 {node.mean_ttl:.0f}s"
+            columns.append(expiring)
+        typer.echo("  ".join(columns))
+
+
+def stats_command(
+    ctx: typer.Context,
+    pattern: str = typer.Option("*", "--pattern", "-p", help="匹配模式"),
+    count: int = typer.Option(500, "--count", "-c", help="每次 SCAN 返回的最大条数"),
+    depth: int = typer.Option(2, "--depth", "-d", min=1, help="按分隔符统计的前缀层数"),
+    sep: str = typer.Option(":", "--sep", help="key 的分隔符"),
+    memory: bool = typer.Option(False, "--memory", help="同时统计 MEMORY USAGE"),
+    ttl: bool = typer.Option(False, "--ttl", help="同时统计带过期时间的 key 与平均 TTL"),
+    samples: int = typer.Option(
+        5, "--samples", min=0, help="MEMORY USAGE 的 SAMPLES 参数（0 表示全部采样）"
+    ),
+    rate: float = typer.Option(
+        1.0, "--sample", min=0, max=1, help="抽样比例，如 0.01 表示只统计约 1% 的 key"
+    ),
+    top: int = typer.Option(10, "--top", "-t", min=1, help="每层显示的最大前缀数"),
+    order: PrefixOrder = typer.Option(
+        PrefixOrder.count, "--sort", help="前缀排序方式（memory 需要 --memory）"
+    ),
+    max_children: int = typer.Option(
+        1000, "--max-children", min=1, help="每个前缀最多保留的子前缀数，超出的并入 *"
+    ),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时扫描的主节点数"
+    ),
+) -> None:
+    """
+    按 key 前缀树统计 key 数量，可选内存与 TTL，列出占比最大的前缀。
+
+    SCAN 全部 key，按 --sep 切出前 --depth 段逐层累计。--sample 只对抽中的
+    key 查询 MEMORY USAGE / PTTL 并计入统计，结果按比例放大为估算值。
+
+    Examples:
+      mzrds stats --depth 2 --sep :
+      mzrds --cluster stats --memory --ttl --sample 0.01 --sort memory
+    """
+    if not sep:
+        raise typer.BadParameter("--sep 不能为空")
+    if rate <= 0:
+        raise typer.BadParameter("--sample 必须大于 0")
+    if order is PrefixOrder.memory and not memory:
+        raise typer.BadParameter("--sort memory 需要配合 --memory 使用")
+    client = _client(ctx)
+    tree = PrefixTree(depth, sep.encode(), max_children)
+    process = partial(sample_keys, rate=rate, memory=memory, ttl=ttl, samples=samples)
+    scanned = 0
+    started = time.monotonic()
+    for page in iter_scan_pages(
+        client, match=pattern, count=count, parallelism=parallelism, process=process
+    ):
+        scanned += len(page.keys)
+        for key, usage, pttl in page.result or ():
+            tree.add(key, usage, None if pttl is None or pttl < 0 else pttl / 1000)
+    elapsed = time.monotonic() - started
+    _print_prefixes(tree, scanned, elapsed, rate, top, order, memory, ttl)
+
+
+def key_freq(client, keys: Sequence[bytes]) -> List[KeyFreq]:
+    """
+    用一个 pipeline 查询一页 key 的 OBJECT FREQ，已删除的 key 不计入结果。
+
+    淘汰策略不是 LFU 时服务端对每个 key 都返回错误，这里直接抛出。
+    """
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.execute_command("OBJECT", "FREQ", key)
+    result = []
+    for key, reply in zip(keys, pipe.execute(raise_on_error=False)):
+        if isinstance(reply, Exception):
+            if "LFU" in str(reply):
+                raise reply
+            continue
+        if isinstance(reply, int):
+            result.append((key, reply))
+    return result
+
+
+def lfu_enabled(client) -> Optional[bool]:
+    """所有主节点的 maxmemory-policy 都是 LFU 时为 True；CONFIG 被禁用时为 None。"""
+    from redis.exceptions import ResponseError
+
+    for _, node in primary_clients(client):
+        try:
+            reply = node.config_get("maxmemory-policy")
+        except ResponseError:
+            return None
+        policy = next(iter(reply.values()), b"") if reply else b""
+        if "lfu" not in decode_value(policy):
+            return False
+    return True
+
+
+def _scan_hotkeys(
+    client, pattern: str, count: int, top: int, parallelism: Optional[int]
+) -> None:
+    hottest = TopK(top)
+    nodes: Dict[str, Tuple[int, int]] = {}
+    scanned = 0
+    started = time.monotonic()
+    for page in iter_scan_pages(
+        client, match=pattern, count=count, parallelism=parallelism, process=key_freq
+    ):
+        scanned += len(page.keys)
+        keys, hottest_freq = nodes.get(page.node, (0, 0))
+        for key, freq in page.result or ():
+            hottest.push(freq, (key, page.node))
+            hottest_freq = max(hottest_freq, freq)
+        nodes[page.node] = (keys + len(page.keys), hottest_freq)
+    elapsed = time.monotonic() - started
+    rate = scanned / elapsed if elapsed > 0 else 0
+    typer.echo(f"扫描 {scanned} 个 key，耗时 {elapsed:.2f}s（{rate:.0f} key/s）")
+    if len(nodes) > 1:
+        typer.echo("")
+        for name in sorted(nodes):
+            keys, freq = nodes[name]
+            typer.echo(f"[{name}] {keys} 个 key，最高 freq {freq}")
+    label = len(nodes) > 1
+    typer.echo("")
+    for idx, (freq, (key, node)) in enumerate(hottest.items(), start=1):
+        suffix = f"  [{node}]" if label else ""
+        typer.echo(f"{idx}) {decode_value(key)} freq {freq:.0f}{suffix}")
+
+
+def _monitor_hotkeys(
+    client, pattern: str, top: int, duration: float, capacity: int
+) -> None:
+    from ..monitor import MonitorFilter, sample_key_access
+
+    nodes = primary_clients(client)
+    typer.secho(f"MONITOR 采样 {duration:g}s ...", fg=typer.colors.YELLOW, err=True)
+    sample = sample_key_access(
+        nodes, duration, capacity, MonitorFilter(pattern=None if pattern == "*" else pattern)
+    )
+    elapsed = max(sample.elapsed, 1e-9)
+    typer.echo(f"采样 {sample.events} 条命令，耗时 {elapsed:.2f}s（{sample.events / elapsed:.0f}/s）")
+    if len(nodes) > 1:
+        typer.echo("")
+        total = sample.events or 1
+        for name, events in sorted(sample.nodes.items(), key=lambda item: item[1], reverse=True):
+            typer.echo(f"[{name}] {events} 条命令（{events / total:.1%}）")
+    if sample.keys.offset:
+        typer.echo(f"key 数量超过 --capacity，计数最多偏低 {sample.keys.offset}")
+    typer.echo("")
+    for idx, (key, hits) in enumerate(sample.keys.top(top), start=1):
+        suffix = ""
+        if len(nodes) > 1 and hasattr(client, "get_node_from_key"):
+            suffix = f"  [{client.get_node_from_key(key).name}]"
+        typer.echo(f"{idx}) {decode_value(key)} {hits} 次（{hits / elapsed:.1f}/s）{suffix}")
+
+
+def hotkeys_command(
+    ctx: typer.Context,
+    pattern: str = typer.Option("*", "--pattern", "-p", help="匹配模式"),
+    count: int = typer.Option(500, "--count", "-c", help="每次 SCAN 返回的最大条数"),
+    top: int = typer.Option(20, "--top", "-t", min=1, help="显示的最大 key 数"),
+    use_monitor: bool = typer.Option(
+        False, "--monitor", help="不使用 OBJECT FREQ，直接用 MONITOR 采样"
+    ),
+    duration: float = typer.Option(
+        10.0, "--duration", "-d", min=0.1, help="MONITOR 采样的秒数"
+    ),
+    capacity: int = typer.Option(
+        10000, "--capacity", min=1, help="MONITOR 采样时 key 计数保留的条目数上限"
+    ),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时扫描的主节点数"
+    ),
+) -> None:
+    """
+    查找访问最频繁的 key，类似 redis-cli --hotkeys。
+
+    maxmemory-policy 为 LFU 时 SCAN 全部 key，每页用一个 pipeline 查询
+    OBJECT FREQ（对数计数器，随时间衰减），保留 freq 最高的 --top 个。
+    不是 LFU 时（或指定 --monitor）改为 MONITOR 采样 --duration 秒，按实际
+    访问次数排序。Cluster 模式下各主节点并行扫描，并列出每个节点的情况，
+    便于定位热点造成的分片负载不均。
+
+    Examples:
+      mzrds hotkeys
+      mzrds --cluster hotkeys -p "item:*" --top 50
+      mzrds hotkeys --monitor -d 30
+    """
+    from redis.exceptions import ResponseError
+
+    client = _client(ctx)
+    if not use_monitor:
+        enabled = lfu_enabled(client)
+        if enabled is False:
+            typer.secho(
+                "maxmemory-policy 不是 LFU，OBJECT FREQ 不可用，改用 MONITOR 采样",
+                fg=typer.colors.YELLOW,
+                err=True,
+            )
+        else:
+            try:
+                _scan_hotkeys(client, pattern, count, top, parallelism)
+                return
+            except ResponseError as exc:
+                if "LFU" not in str(exc):
+                    raise
+                typer.secho(f"{exc}，改用 MONITOR 采样", fg=typer.colors.YELLOW, err=True)
+    _monitor_hotkeys(client, pattern, top, duration, capacity)
+
+
+def register_keyspace_commands(app: typer.Typer) -> None:
+    app.command("bigkeys")(bigkeys_command)
+    app.command("memkeys")(memkeys_command)
+    app.command("stats")(stats_command)
+    app.command("hotkeys")(hotkeys_command)
+
+
+__all__ = [
+    "KeyStats",
+    "PrefixOrder",
+    "key_lengths",
+    "key_freq",
+    "key_memory",
+    "key_types",
+    "lfu_enabled",
+    "register_keyspace_commands",
+    "sample_keys",
+]
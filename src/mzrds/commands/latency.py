@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import typer
+
+from ..output import iter_json
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+    from ..latency import LatencySnapshot
+
+
+def _state(ctx: typer.Context) -> "CLIState":
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state
+
+
+def _ms(micros: float) -> str:
+    return f"{micros / 1000:.2f}"
+
+
+def _format_line(snapshot: "LatencySnapshot", label: bool) -> str:
+    hist = snapshot.histogram
+    if hist.count:
+        values = (hist.min, hist.mean, hist.percentile(50), hist.percentile(99), hist.max)
+        cells = [_ms(value) for value in values]
+    else:
+        # 窗口内的请求全部超时或出错
+        cells = ["-"] * 5
+    line = "min {}  avg {}  p50 {}  p99 {}  max {} ms".format(*cells) + f"（{hist.count} 个样本"
+    if snapshot.errors:
+        line += f"，{snapshot.errors} 个错误"
+    line += "）"
+    return f"[{snapshot.node}] {line}" if label else line
+
+
+def _format_dist(snapshot: "LatencySnapshot") -> List[str]:
+    hist = snapshot.histogram
+    lines = []
+    for upper, count in hist.rows():
+        bar = "#" * max(1, round(40 * count / hist.count))
+        lines.append(f"   < {_ms(upper):>9} ms: {count:>7} {bar}")
+    return lines
+
+
+class _Report:
+    """文本按窗口逐行输出（或在终端中原地刷新），JSON 每个节点每个窗口一行。"""
+
+    def __init__(self, as_json: bool, dist: bool, label: bool):
+        self.as_json = as_json
+        self.dist = dist
+        self.label = label
+        self.interactive = sys.stdout.isatty() and not as_json
+        self._drawn = 0
+
+    def window(self, snapshots: List["LatencySnapshot"]) -> None:
+        if self.as_json:
+            now = round(time.time(), 3)
+            for snapshot in snapshots:
+                record = {"time": now, **snapshot.to_dict(self.dist)}
+                sys.stdout.write("".join(iter_json(record)) + "\n")
+            sys.stdout.flush()
+            return
+        stamp = time.strftime("%H:%M:%S")
+        for snapshot in snapshots:
+            typer.echo(f"{stamp} {_format_line(snapshot, self.label)}")
+            if self.dist:
+                for line in _format_dist(snapshot):
+                    typer.echo(line)
+
+    def live(self, snapshots: List["LatencySnapshot"]) -> None:
+        """终端中原地刷新累计统计。"""
+        if not self.interactive:
+            return
+        lines = [_format_line(snapshot, self.label) for snapshot in snapshots]
+        # 光标回到上次输出的第一行并清除
+        prefix = "\x1b[F" * max(self._drawn - 1, 0) + "\r"
+        sys.stdout.write(prefix + "\n".join(f"\x1b[K{line}" for line in lines))
+        sys.stdout.flush()
+        self._drawn = len(lines)
+
+    def final(self, snapshots: List["LatencySnapshot"]) -> None:
+        """累计模式结束时输出：终端中只补上分布，否则输出完整的一次统计。"""
+        if not self.interactive:
+            self.window(snapshots)
+            return
+        if self._drawn:
+            sys.stdout.write("\n")
+        if self.dist:
+            for snapshot in snapshots:
+                if self.label:
+                    typer.echo(f"[{snapshot.node}]")
+                for line in _format_dist(snapshot):
+                    typer.echo(line)
+
+
+def latency_command(
+    ctx: typer.Context,
+    command: Optional[List[str]] = typer.Argument(
+        None, metavar="[COMMAND]...", help="探测用的命令（写法同 exec），默认 PING"
+    ),
+    interval: float = typer.Option(
+        0.01, "--interval", "-i", min=0, help="每个节点两次请求之间的间隔（秒）"
+    ),
+    history: bool = typer.Option(
+        False, "--history", "-H", help="每个 --window 输出一行统计并重新开始，类似 --latency-history"
+    ),
+    window: float = typer.Option(
+        15.0, "--window", "-w", min=0.1, help="--history 的窗口长度（秒）"
+    ),
+    dist: bool = typer.Option(
+        False, "--dist", help="同时输出延迟分布（按 2 的幂分桶），类似 --latency-dist"
+    ),
+    as_json: bool = typer.Option(
+        False, "--json", help="每个节点每个窗口输出一行 JSON（毫秒）"
+    ),
+    duration: Optional[float] = typer.Option(
+        None, "--duration", "-d", min=0.1, help="运行指定秒数后退出，默认直到 Ctrl-C"
+    ),
+) -> None:
+    """
+    持续测量往返延迟，类似 redis-cli --latency / --latency-history / --latency-dist。
+
+    每个节点一个线程按 --interval 发送命令，统计 min/avg/p50/p99/max。
+    Cluster 模式下同时探测所有主节点与副本，分别输出，用来区分个别节点的
+    服务端卡顿与整体的网络抖动。不加 --history 时显示启动以来的累计统计。
+
+    Examples:
+      mzrds latency
+      mzrds --cluster latency --history --window 5
+      mzrds latency --json --history -w 1 --duration 60 > latency.jsonl
+      mzrds latency -i 0.1 --dist -- get hot:key
+    """
+    from ..latency import LatencyMonitor, LatencySnapshot
+    from ..scanner import node_clients
+
+    state = _state(ctx)
+    nodes = node_clients(state.get_client())
+    report = _Report(as_json, dist, label=len(nodes) > 1)
+    totals: Dict[str, LatencySnapshot] = {name: LatencySnapshot(name) for name, _ in nodes}
+    started = time.monotonic()
+    step = window if history else 1.0
+    with LatencyMonitor(nodes, command, interval) as monitor:
+        try:
+            while True:
+                remaining = duration - (time.monotonic() - started) if duration else step
+                time.sleep(max(min(step, remaining), 0))
+                snapshots = monitor.take()
+                if history:
+                    report.window(snapshots)
+                else:
+                    for snapshot in snapshots:
+                        totals[snapshot.node].merge(snapshot)
+                    report.live(list(totals.values()))
+                if duration and time.monotonic() - started >= duration:
+                    break
+        except KeyboardInterrupt:
+            if not history:
+                for snapshot in monitor.take():
+                    totals[snapshot.node].merge(snapshot)
+    if not history:
+        report.final(list(totals.values()))
+
+
+def register_latency_commands(app: typer.Typer) -> None:
+    app.command("latency")(latency_command)
+
+
+__all__ = ["register_latency_commands"]
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING, Optional
+
+import typer
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+    from ..config import ConnectionOptions
+    from ..migrate import MigrateStats, NativeTarget
+
+MAX_ERRORS_SHOWN = 10
+
+
+def _state(ctx: typer.Context) -> "CLIState":
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state
+
+
+def _profile(state: "CLIState", name: str) -> "ConnectionOptions":
+    options = state.store.get_profile(name)
+    if options is None:
+        raise typer.BadParameter(f"配置 {name} 不存在")
+    return options
+
+
+def _native_target(options: "ConnectionOptions", timeout: int) -> "NativeTarget":
+    from ..client import connection_endpoint
+    from ..migrate import NativeTarget
+
+    if options.cluster:
+        raise typer.BadParameter("--native 只支持单机目标，Cluster 目标请使用 DUMP/RESTORE 模式")
+    return NativeTarget(timeout=timeout, **connection_endpoint(options))
+
+
+class _Progress:
+    """把进度写到标准错误：终端中原地刷新一行，否则按间隔输出独立的行。"""
+
+    def __init__(self) -> None:
+        self.interactive = sys.stderr.isatty()
+        self.interval = 1.0 if self.interactive else 10.0
+        self._last_time = time.monotonic()
+        self._last_migrated = 0
+
+    def __call__(self, stats: "MigrateStats") -> None:
+        now = time.monotonic()
+        rate = (stats.migrated - self._last_migrated) / max(now - self._last_time, 1e-9)
+        self._last_time, self._last_migrated = now, stats.migrated
+        line = (
+            f"已扫描 {stats.scanned:,}  已迁移 {stats.migrated:,}  跳过 {stats.skipped:,}  "
+            f"失败 {stats.errors:,}  {rate:,.0f} key/s  "
+            f"{stats.bytes / max(stats.elapsed, 1e-9) / 1024 / 1024:.1f} MiB/s"
+        )
+        if self.interactive:
+            sys.stderr.write(f"\r\x1b[K{line}")
+        else:
+            sys.stderr.write(f"{line}\n")
+        sys.stderr.flush()
+
+    def finish(self) -> None:
+        if self.interactive:
+            sys.stderr.write("\r\x1b[K")
+            sys.stderr.flush()
+
+
+def migrate_command(
+    ctx: typer.Context,
+    target_profile: str = typer.Option(..., "--to", help="目标连接配置名"),
+    source_profile: Optional[str] = typer.Option(
+        None, "--from", help="源连接配置名，默认使用当前连接"
+    ),
+    pattern: str = typer.Option("*", "--pattern", "-p", help="匹配模式"),
+    count: int = typer.Option(500, "--count", "-c", min=1, help="每次 SCAN 返回的最大条数"),
+    readers: int = typer.Option(4, "--readers", min=1, help="读取（DUMP / MIGRATE）线程数"),
+    writers: int = typer.Option(4, "--writers", min=1, help="写入（RESTORE）线程数"),
+    queue_size: int = typer.Option(
+        16, "--queue-size", min=1, help="阶段之间最多积压的页数"
+    ),
+    replace: bool = typer.Option(
+        True, "--replace/--no-replace", help="目标 key 已存在时是否覆盖"
+    ),
+    native: bool = typer.Option(
+        False, "--native", help="在源端执行 MIGRATE，数据直接从源实例发往目标实例"
+    ),
+    timeout: int = typer.Option(
+        5000, "--timeout", min=1, help="原生 MIGRATE 的超时时间（毫秒）"
+    ),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时扫描的主节点数"
+    ),
+    checkpoint_file: Optional[str] = typer.Option(
+        None, "--checkpoint", help="定期把每个节点的游标与计数写入该文件"
+    ),
+    resume: bool = typer.Option(
+        False, "--resume", help="从 --checkpoint 文件记录的位置继续"
+    ),
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="不显示进度"),
+) -> None:
+    """
+    把匹配的 key 从一个实例流式迁移到另一个实例（含过期时间）。
+
+    默认在源端用 pipeline 执行 DUMP/PTTL、在目标端用 pipeline 执行 RESTORE，
+    扫描、读取、写入三个阶段由有界队列连接并各自并发。--native 改为在源端
+    执行 MIGRATE ... COPY，要求源实例能直接访问目标实例，源端 key 保留不动。
+
+    配合 --checkpoint 可以在中断后用 --resume 继续，已迁移的页不会重做。
+
+    Examples:
+      mzrds migrate --from prod --to staging -p "user:*"
+      mzrds migrate --from prod --to staging --native --readers 8
+      mzrds migrate --from prod --to staging --checkpoint users.ckpt --resume
+    """
+    from ..checkpoint import Checkpoint, CheckpointError
+    from ..client import connection_address, get_client, pool_workers
+    from ..migrate import Migration
+
+    state = _state(ctx)
+    source_options = _profile(state, source_profile) if source_profile else state.options
+    target_options = _profile(state, target_profile)
+    if connection_address(source_options) == connection_address(target_options):
+        raise typer.BadParameter("源与目标是同一个库")
+    if resume and not checkpoint_file:
+        raise typer.BadParameter("--resume 需要同时指定 --checkpoint")
+
+    task = {
+        "command": "migrate",
+        "pattern": pattern,
+        "source": connection_address(source_options),
+        "target": connection_address(target_options),
+    }
+    checkpoint = None
+    if checkpoint_file:
+        try:
+            checkpoint = (
+                Checkpoint.load(checkpoint_file, task)
+                if resume
+                else Checkpoint(checkpoint_file, task)
+            )
+        except CheckpointError as exc:
+            raise typer.BadParameter(str(exc)) from exc
+        if checkpoint.finished:
+            typer.echo(f"检查点 {checkpoint_file} 记录的迁移已经完成。", err=True)
+            return
+
+    progress = None if quiet else _Progress()
+    # 终端中先清掉正在刷新的进度行
+    prefix = "\r\x1b[K" if progress and progress.interactive else ""
+    shown = [0]
+
+    def on_error(key: bytes, exc: Exception) -> None:
+        shown[0] += 1
+        if shown[0] <= MAX_ERRORS_SHOWN:
+            typer.echo(f"{prefix}(error) {key!r}: {exc}", err=True)
+
+    # 读写线程共用源端 / 目标端客户端，扫描线程另占源端一个连接
+    readers = max(1, pool_workers(source_options, readers + 1) - 1)
+    writers = pool_workers(target_options, writers)
+    native_target = _native_target(target_options, timeout) if native else None
+    source = get_client(source_options)
+    target = None if native else get_client(target_options)
+    migration = Migration(
+        source,
+        target,
+        match=pattern,
+        count=count,
+        readers=readers,
+        writers=writers,
+        queue_size=queue_size,
+        replace=replace,
+        native=native_target,
+        parallelism=parallelism,
+        checkpoint=checkpoint,
+        on_error=on_error,
+    )
+    try:
+        stats = migration.run(
+            report=progress, interval=progress.interval if progress else 1.0
+        )
+    except KeyboardInterrupt:
+        if progress:
+            progress.finish()
+        if checkpoint:
+            typer.echo(f"已中断，进度已保存到 {checkpoint_file}。", err=True)
+        raise typer.Exit(code=130)
+    finally:
+        source.close()
+        if target is not None:
+            target.close()
+    if progress:
+        progress.finish()
+    typer.echo(
+        f"已迁移 {stats.migrated} 个 key，跳过 {stats.skipped} 个，失败 {stats.errors} 个，"
+        f"耗时 {stats.elapsed:.2f}s（{stats.throughput:,.0f} key/s）。",
+        err=True,
+    )
+    if resume and checkpoint:
+        total = checkpoint.counters
+        typer.echo(
+            f"累计已迁移 {total.get('migrated', 0)} 个 key，失败 {total.get('errors', 0)} 个。",
+            err=True,
+        )
+    if stats.errors:
+        raise typer.Exit(code=1)
+
+
+def register_migrate_commands(app: typer.Typer) -> None:
+    app.command("migrate")(migrate_command)
+
+
+__all__ = ["register_migrate_commands"]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import typer
+
+from ..executor import decode_value
+from ..output import iter_json
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+    from ..monitor import MonitorEvent, MonitorStats
+
+
+def _state(ctx: typer.Context) -> "CLIState":
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state
+
+
+def _event_json(node: str, event: "MonitorEvent") -> str:
+    record = {
+        "time": event.time,
+        "node": node,
+        "db": event.db,
+        "client": decode_value(event.client),
+        "args": decode_value(event.args),
+    }
+    return "".join(iter_json(record))
+
+
+def _stats_dict(stats: "MonitorStats", top: int, elapsed: float) -> Dict[str, Any]:
+    def rows(items):
+        return [
+            {"name": decode_value(name), "count": count, "per_sec": round(count / elapsed, 1)}
+            for name, count in items
+        ]
+
+    return {
+        "time": round(time.time(), 3),
+        "window": round(elapsed, 3),
+        "events": stats.events,
+        "per_sec": round(stats.events / elapsed, 1),
+        "commands": rows(stats.top_commands(top)),
+        "prefixes": rows(stats.prefixes.top(top)),
+        "clients": rows(stats.clients.top(top)),
+        # 前缀 / 客户端计数可能偏低的上限（超出容量后才不为 0）
+        "error": max(stats.prefixes.offset, stats.clients.offset),
+    }
+
+
+def _stats_lines(stats: "MonitorStats", top: int, elapsed: float) -> List[str]:
+    lines = [
+        f"{time.strftime('%H:%M:%S')} {stats.events} 条命令，{stats.events / elapsed:.0f}/s"
+        f"（窗口 {elapsed:.1f}s）"
+    ]
+    sections = (
+        ("命令", stats.top_commands(top), 0),
+        ("key 前缀", stats.prefixes.top(top), stats.prefixes.offset),
+        ("客户端", stats.clients.top(top), stats.clients.offset),
+    )
+    for title, items, error in sections:
+        if not items:
+            continue
+        note = f"（计数最多偏低 {error}）" if error else ""
+        lines.append(f"  {title}{note}:")
+        for name, count in items:
+            lines.append(
+                f"    {count:>9} {count / elapsed:>9.1f}/s  {decode_value(name)}"
+            )
+    lines.append("")
+    return lines
+
+
+def monitor_command(
+    ctx: typer.Context,
+    commands: Optional[List[str]] = typer.Option(
+        None, "--command", "-c", help="只保留指定命令（可重复，不区分大小写）"
+    ),
+    pattern: Optional[str] = typer.Option(
+        None, "--pattern", "-p", help="只保留 key 匹配该模式的命令（Redis glob 语法）"
+    ),
+    clients: Optional[List[str]] = typer.Option(
+        None, "--client", help="只保留来自该地址的命令（ip 或 ip:port，可重复）"
+    ),
+    aggregate: bool = typer.Option(
+        False, "--aggregate", "-a", help="不输出每条命令，按窗口统计最多的命令、key 前缀与客户端"
+    ),
+    window: float = typer.Option(5.0, "--window", "-w", min=0.1, help="--aggregate 的窗口长度（秒）"),
+    top: int = typer.Option(10, "--top", "-t", min=1, help="--aggregate 每项显示的条目数"),
+    depth: int = typer.Option(
+        2, "--depth", min=0, help="--aggregate 统计的 key 前缀段数，0 表示完整 key"
+    ),
+    sep: str = typer.Option(":", "--sep", help="key 前缀的分隔符"),
+    capacity: int = typer.Option(
+        10000, "--capacity", min=1, help="--aggregate 前缀与客户端计数保留的条目数上限"
+    ),
+    as_json: bool = typer.Option(
+        False, "--json", help="每条命令（或每个 --aggregate 窗口）输出一行 JSON"
+    ),
+    duration: Optional[float] = typer.Option(
+        None, "--duration", "-d", min=0.1, help="运行指定秒数后退出，默认直到 Ctrl-C"
+    ),
+) -> None:
+    """
+    持续读取 MONITOR 输出，支持按命令、key 模式与客户端过滤，或按窗口聚合。
+
+    --aggregate 用有界计数统计一个窗口内最多的命令、key 前缀和客户端，
+    几秒内就能找出热 key，不必保存大量 MONITOR 文本。Cluster 模式下同时
+    监听所有主节点。注意 MONITOR 本身会明显降低服务端吞吐，线上慎用并设置 --duration。
+
+    Examples:
+      mzrds monitor -c get -c set -p "user:*"
+      mzrds monitor --client 10.0.0.12
+      mzrds --cluster monitor --aggregate -w 10 --depth 1
+      mzrds monitor -a -d 30 --json > hot.jsonl
+    """
+    from redis.exceptions import RedisError
+
+    from ..monitor import MonitorFilter, MonitorSession, MonitorStats, parse_line
+    from ..output import OutputFormat, OutputWriter
+    from ..scanner import primary_clients
+
+    state = _state(ctx)
+    nodes = primary_clients(state.get_client())
+    label = len(nodes) > 1
+    matches = MonitorFilter(commands or (), pattern, clients or ())
+
+    def new_stats() -> MonitorStats:
+        return MonitorStats(depth, sep.encode(), capacity)
+
+    def emit_stats(out: "OutputWriter", stats: MonitorStats, elapsed: float) -> None:
+        elapsed = max(elapsed, 1e-9)
+        if as_json:
+            out.write_line("".join(iter_json(_stats_dict(stats, top, elapsed))))
+        else:
+            out.write_lines(_stats_lines(stats, top, elapsed))
+        out.flush()
+
+    started = window_start = time.monotonic()
+    stats = new_stats()
+    fmt = OutputFormat.text if as_json or aggregate else OutputFormat.raw
+    try:
+        with OutputWriter(fmt=fmt) as out, MonitorSession(nodes) as session:
+            for node, lines in session.batches(timeout=0.2):
+                if isinstance(lines, Exception):
+                    typer.secho(f"[{node}] MONITOR 连接中断: {lines}", fg=typer.colors.RED, err=True)
+                    raise typer.Exit(code=1)
+                events = [event for event in map(parse_line, lines) if event is not None]
+                if matches.active:
+                    events = [event for event in events if matches(event)]
+                if aggregate:
+                    for event in events:
+                        stats.add(event, matches.keys(event))
+                elif as_json:
+                    out.write_lines(_event_json(node, event) for event in events)
+                elif events:
+                    prefix = f"[{node}] ".encode() if label else b""
+                    out.write_page([prefix + event.raw for event in events])
+                else:
+                    out.flush()
+                now = time.monotonic()
+                if aggregate and now - window_start >= window:
+                    emit_stats(out, stats, now - window_start)
+                    stats, window_start = new_stats(), now
+                if duration and now - started >= duration:
+                    break
+            if aggregate and stats.events:
+                emit_stats(out, stats, time.monotonic() - window_start)
+    except KeyboardInterrupt:
+        if aggregate and stats.events:
+            sys.stdout.flush()
+            with OutputWriter() as out:
+                emit_stats(out, stats, time.monotonic() - window_start)
+    except RedisError as exc:
+        typer.secho(f"MONITOR 失败: {exc}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+
+def register_monitor_commands(app: typer.Typer) -> None:
+    app.command("monitor")(monitor_command)
+
+
+__all__ = ["register_monitor_commands"]
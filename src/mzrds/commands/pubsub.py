@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import itertools
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+import typer
+
+from ..batch import DEFAULT_CHUNK_SIZE
+from ..output import OUTPUT_HELP, OutputFormat
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+    from ..pubsub import SubscribeMode
+
+
+def _state(ctx: typer.Context) -> "CLIState":
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state
+
+
+def _listen(
+    ctx: typer.Context,
+    mode: "SubscribeMode",
+    channels: List[str],
+    output: OutputFormat,
+    raw: bool,
+    count: Optional[int],
+    duration: Optional[float],
+) -> None:
+    from redis.exceptions import RedisError
+
+    from ..monitor import StreamSession
+    from ..output import OutputWriter
+    from ..pubsub import subscription_streams, to_message
+
+    client = _state(ctx).get_client()
+    streams = subscription_streams(client, mode, channels)
+    received = 0
+    started = time.monotonic()
+    try:
+        with (
+            OutputWriter(fmt=OutputFormat.raw if raw else output) as out,
+            StreamSession(streams) as session,
+        ):
+            for node, replies in session.batches(timeout=0.2):
+                if isinstance(replies, Exception):
+                    typer.secho(f"[{node}] 订阅连接中断: {replies}", fg=typer.colors.RED, err=True)
+                    raise typer.Exit(code=1)
+                messages = [message for message in map(to_message, replies) if message]
+                if count:
+                    messages = messages[: count - received]
+                if messages:
+                    out.write_messages(messages)
+                    received += len(messages)
+                else:
+                    out.flush()
+                if count and received >= count:
+                    break
+                if duration and time.monotonic() - started >= duration:
+                    break
+    except KeyboardInterrupt:
+        pass
+    except RedisError as exc:
+        typer.secho(f"订阅失败: {exc}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(code=1)
+
+
+_OUTPUT = typer.Option(OutputFormat.text, "--output", "-o", help=OUTPUT_HELP)
+_RAW = typer.Option(False, "--raw", help="只输出消息内容，每行一条（等同 -o raw）")
+_COUNT = typer.Option(None, "--count", "-n", min=1, help="收到指定条数的消息后退出")
+_DURATION = typer.Option(None, "--duration", "-d", min=0.1, help="运行指定秒数后退出，默认直到 Ctrl-C")
+
+
+def subscribe_command(
+    ctx: typer.Context,
+    channels: List[str] = typer.Argument(..., help="频道名"),
+    output: OutputFormat = _OUTPUT,
+    raw: bool = _RAW,
+    count: Optional[int] = _COUNT,
+    duration: Optional[float] = _DURATION,
+) -> None:
+    """
+    订阅频道并持续输出消息（SUBSCRIBE）。
+
+    消息按批读取、整块写出，支持 -o jsonl 等格式，适合接管道处理。
+    Cluster 下普通频道的消息会广播到所有节点，只订阅一个节点。
+
+    Examples:
+      mzrds subscribe news alerts
+      mzrds subscribe events -o jsonl > events.jsonl
+      mzrds subscribe jobs --raw -n 1000 | wc -l
+    """
+    from ..pubsub import SubscribeMode
+
+    _listen(ctx, SubscribeMode.channel, channels, output, raw, count, duration)
+
+
+def psubscribe_command(
+    ctx: typer.Context,
+    patterns: List[str] = typer.Argument(..., help="频道模式（glob 语法）"),
+    output: OutputFormat = _OUTPUT,
+    raw: bool = _RAW,
+    count: Optional[int] = _COUNT,
+    duration: Optional[float] = _DURATION,
+) -> None:
+    """
+    按模式订阅频道并持续输出消息（PSUBSCRIBE），文本格式中以 [模式] 开头。
+
+    Examples:
+      mzrds psubscribe "order.*"
+      mzrds psubscribe "__keyevent@0__:*" -o jsonl
+    """
+    from ..pubsub import SubscribeMode
+
+    _listen(ctx, SubscribeMode.pattern, patterns, output, raw, count, duration)
+
+
+def ssubscribe_command(
+    ctx: typer.Context,
+    channels: List[str] = typer.Argument(..., help="分片频道名"),
+    output: OutputFormat = _OUTPUT,
+    raw: bool = _RAW,
+    count: Optional[int] = _COUNT,
+    duration: Optional[float] = _DURATION,
+) -> None:
+    """
+    订阅分片频道并持续输出消息（SSUBSCRIBE，Redis 7.0+）。
+
+    Cluster 下按频道所在的 slot 分组，到各自的主节点订阅，每个节点一个读取线程。
+
+    Examples:
+      mzrds --cluster ssubscribe orders:{eu} orders:{us}
+    """
+    from ..pubsub import SubscribeMode
+
+    _listen(ctx, SubscribeMode.shard, channels, output, raw, count, duration)
+
+
+def publish_command(
+    ctx: typer.Context,
+    channel: Optional[str] = typer.Argument(
+        None, help="频道名；--from-file 时省略表示每行为\"频道 内容\""
+    ),
+    message: Optional[str] = typer.Argument(None, help="消息内容"),
+    source: Optional[typer.FileBinaryRead] = typer.Option(
+        None, "--from-file", "-f", help="从文件（- 表示标准输入）逐行读取消息"
+    ),
+    chunk_size: int = typer.Option(
+        DEFAULT_CHUNK_SIZE, "--chunk-size", min=1, help="每个 pipeline 的 PUBLISH 数"
+    ),
+    repeat: int = typer.Option(
+        1, "--repeat", "-r", min=1, help="把文件中的消息重复发布指定轮数（用于压测）"
+    ),
+    rate: Optional[float] = typer.Option(
+        None, "--rate", min=0, help="每秒最多发布的消息数"
+    ),
+    shard: bool = typer.Option(False, "--shard", help="使用 SPUBLISH 发布到分片频道"),
+) -> None:
+    """
+    发布消息（PUBLISH / SPUBLISH），--from-file 时分块 pipeline 批量发布。
+
+    单条发布时输出收到消息的订阅者数；批量发布结束后输出条数、耗时与速率，
+    用于压测下游的消费者。
+
+    Examples:
+      mzrds publish news "hello"
+      mzrds publish events -f payloads.txt --repeat 100 --rate 50000
+      cat messages.txt | mzrds publish -f - --chunk-size 5000
+      mzrds --cluster publish --shard orders:{eu} -f orders.txt
+    """
+    from ..pubsub import iter_publish_lines, publish_messages
+    from ..throttle import RateLimiter
+
+    client = _state(ctx).get_client()
+    if source is None:
+        if channel is None or message is None:
+            raise typer.BadParameter("需要频道和消息内容，或使用 --from-file")
+        stats = publish_messages(client, [(channel.encode(), message.encode())], shard=shard)
+        if stats.last_error is not None:
+            typer.echo(f"(error) {stats.last_error}")
+            raise typer.Exit(code=1)
+        typer.echo(f"(integer) {stats.receivers}")
+        return
+    if message is not None:
+        raise typer.BadParameter("--from-file 模式下不能同时指定消息内容")
+    started = time.monotonic()
+    try:
+        messages = iter_publish_lines(source, channel.encode() if channel is not None else None)
+        if repeat > 1:
+            # 标准输入不能重读，先读入内存
+            messages = itertools.chain.from_iterable(itertools.repeat(list(messages), repeat))
+        stats = publish_messages(client, messages, chunk_size, shard, RateLimiter(rate))
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    elapsed = time.monotonic() - started
+    speed = stats.published / elapsed if elapsed > 0 else 0
+    typer.echo(
+        f"发布 {stats.published} 条消息，耗时 {elapsed:.2f}s（{speed:.0f} 条/s），"
+        f"订阅者共收到 {stats.receivers} 条"
+    )
+    if stats.errors:
+        typer.secho(
+            f"{stats.errors} 条消息发布失败，最后一个错误: {stats.last_error}",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(code=1)
+
+
+def register_pubsub_commands(app: typer.Typer) -> None:
+    app.command("subscribe")(subscribe_command)
+    app.command("psubscribe")(psubscribe_command)
+    app.command("ssubscribe")(ssubscribe_command)
+    app.command("publish")(publish_command)
+
+
+__all__ = ["register_pubsub_commands"]
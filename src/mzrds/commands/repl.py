@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import typer
+
+from ..output import OUTPUT_HELP, OutputFormat
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+
+
+def repl_command(
+    ctx: typer.Context,
+    output: OutputFormat = typer.Option(
+        OutputFormat.text, "--output", "-o", help=OUTPUT_HELP
+    ),
+    timing: bool = typer.Option(
+        True, "--timing/--no-timing", help="在每条回复后显示命令耗时"
+    ),
+) -> None:
+    """
+    进入交互模式，整个会话复用同一个连接。
+
+    支持命令历史与 Tab 补全，MULTI / WATCH / SELECT 的状态在命令之间保持，
+    提示符中显示当前库和事务状态。输入 quit 或 exit（或 Ctrl-D）退出。
+
+    Examples:
+      mzrds --use prod repl
+      mzrds repl --no-timing
+    """
+    from ..repl import ReplSession, create_session_client, run_repl
+
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    client = create_session_client(state.options)
+    try:
+        run_repl(ReplSession(client, state.options), output, timing)
+    finally:
+        client.close()
+
+
+def register_repl_commands(app: typer.Typer) -> None:
+    app.command("repl")(repl_command)
+
+
+__all__ = ["register_repl_commands"]
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
-from typing import Iterable, TYPE_CHECKING
+import time
+from contextlib import contextmanager
+from enum import Enum
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, Optional, TYPE_CHECKING
 
 import typer
 
-from ..executor import decode_value
+from ..output import OUTPUT_HELP, OutputFormat, OutputWriter
+from ..scanner import ScanPage, is_cluster, iter_scan_pages, primary_clients
 
 if TYPE_CHECKING:
+    from ..checkpoint import Checkpoint
     from ..cli import CLIState
+    from ..config import ConnectionOptions
+    from ..filters import KeyFilter
+    from ..throttle import AdaptiveCount
+    from ..values import ValueFetcher
+
+
+class ScanEngine(str, Enum):
+    thread = "thread"
+    asyncio = "async"
+
+
+class SizeBy(str, Enum):
+    memory = "memory"
+    length = "length"
 
 
 def _client(ctx: typer.Context):
@@ -17,24 +37,265 @@ def _client(ctx: typer.Context):
     return state.get_client()
 
 
-def _print_sequence(items: Iterable, with_scores: bool = False) -> None:
-    for idx, item in enumerate(items, start=1):
-        if with_scores and isinstance(item, tuple):
-            key, score = item
-            typer.echo(f"{idx}) {decode_value(key)} (score={score})")
-        elif isinstance(item, tuple) and len(item) == 2:
-            field, value = item
-            typer.echo(f"{idx}) {decode_value(field)} => {decode_value(value)}")
-        else:
-            typer.echo(f"{idx}) {decode_value(item)}")
+RAW_OPTION_HELP = "等同于 --output raw：每行原样输出一个元素，不编号不解码"
+
+
+def _output_format(output: OutputFormat, raw: bool) -> OutputFormat:
+    return OutputFormat.raw if raw else output
+
+
+ADAPTIVE_HELP = "配合 --auto：根据每页耗时与命中率动态调整 COUNT（以 --count 为初始值）"
+TARGET_HELP = "--adaptive 下每次调用的目标服务端耗时（毫秒），应低于 slowlog 阈值"
+
+
+def _tuner(
+    auto: bool,
+    adaptive: bool,
+    count: int,
+    min_count: int,
+    max_count: int,
+    target_ms: float,
+) -> Optional[Callable[[], "AdaptiveCount"]]:
+    if not adaptive:
+        return None
+    if not auto:
+        raise typer.BadParameter("--adaptive 需要配合 --auto 使用")
+    if max_count < min_count:
+        raise typer.BadParameter("--max-count 不能小于 --min-count")
+    from ..throttle import AdaptiveCount
+
+    return partial(AdaptiveCount, count, min_count, max_count, target_ms / 1000)
+
+
+def _iter_pages(
+    fetch: Callable[[int, int], tuple],
+    count: int,
+    tuner: Optional[Callable[[], "AdaptiveCount"]] = None,
+) -> Iterator:
+    """按游标逐页调用 ``fetch(cursor, count)``，直到游标回到 0。"""
+    adaptive = tuner() if tuner else None
+    cursor = 0
+    while True:
+        if adaptive:
+            count = adaptive.count
+            started = time.perf_counter()
+        cursor, items = fetch(cursor, count)
+        if adaptive:
+            adaptive.observe(time.perf_counter() - started, len(items))
+        yield items
+        if cursor == 0:
+            return
+
+
+MAX_ITEMS_HELP = "集合类型每个 key 最多输出的元素数，超过的截断（或配合 --full 分段输出）"
+MAX_BYTES_HELP = "string 每个 key 最多输出的字节数（默认不限，用 MGET 读取）"
+FULL_HELP = "超过上限的值不截断，用 HSCAN/SSCAN/LRANGE 等分段读取并逐段输出"
+
+
+def _value_fetcher(
+    client, max_items: int, max_bytes: Optional[int], full: bool
+) -> "ValueFetcher":
+    from ..values import ValueFetcher
+
+    return ValueFetcher(is_cluster(client), max_items, max_bytes, full)
+
+
+def _processor(
+    key_filter: Optional["KeyFilter"], fetcher: Optional["ValueFetcher"]
+) -> Optional[Callable]:
+    """客户端过滤之后再取值，两者都在扫描线程中按页执行。"""
+    if key_filter and fetcher:
+        return lambda client, keys: fetcher(client, key_filter(client, keys))
+    return fetcher or key_filter
+
+
+def _key_filter(
+    regex: Optional[str],
+    ttl: tuple,
+    size: tuple,
+    size_by: SizeBy,
+    idle: tuple,
+    type_: Optional[str],
+) -> Optional["KeyFilter"]:
+    from ..filters import KeyFilter
+
+    try:
+        return KeyFilter.build(regex, ttl, size, size_by.value, idle, type_)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
+@contextmanager
+def _filter_errors() -> Iterator[None]:
+    """扫描中途才能发现的过滤条件错误（如 LFU 下的空闲时间）转为参数错误。"""
+    from ..filters import IdleTimeUnavailable
+
+    try:
+        yield
+    except IdleTimeUnavailable as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
+def _open_checkpoint(
+    options: "ConnectionOptions",
+    pattern: str,
+    path: str,
+    resume: bool,
+    type_: Optional[str] = None,
+    key_filter: Optional["KeyFilter"] = None,
+    values: bool = False,
+) -> "Checkpoint":
+    from ..checkpoint import Checkpoint, CheckpointError
+    from ..client import connection_address
+
+    task: Dict[str, Any] = {
+        "command": "scan", "pattern": pattern, "source": connection_address(options)
+    }
+    # 过滤条件不同，输出也不同，不能混用同一个检查点
+    if type_:
+        task["type"] = type_
+    if key_filter:
+        task["filter"] = key_filter.describe()
+    if values:
+        task["values"] = True
+    try:
+        return Checkpoint.load(path, task) if resume else Checkpoint(path, task)
+    except CheckpointError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+
+def _checkpoint_writer(
+    checkpoint: Optional["Checkpoint"], fmt: OutputFormat
+) -> OutputWriter:
+    if not checkpoint:
+        return OutputWriter(fmt=fmt)
+    # 恢复后编号接着上次输出的 key 继续
+    out = OutputWriter(fmt=fmt, start=checkpoint.counters.get("keys", 0) + 1)
+    # 落盘前先把缓冲的页写出，检查点里记录的游标之前的 key 一定已经输出
+    checkpoint.before_save = out.flush
+    return out
+
+
+def _write_scan_page(
+    out: OutputWriter,
+    page: ScanPage,
+    checkpoint: Optional["Checkpoint"],
+    filtered: bool = False,
+    values: bool = False,
+) -> None:
+    if values:
+        from ..values import write_values
+
+        written = write_values(out, page.result or [])
+    else:
+        keys = (page.result or []) if filtered else page.keys
+        out.write_page(keys)
+        written = len(keys)
+    if checkpoint:
+        checkpoint.commit(
+            page.node,
+            page.cursor,
+            {"pages": 1, "scanned": len(page.keys), "keys": written},
+        )
+
+
+def _scan_async(
+    options: "ConnectionOptions",
+    pattern: str,
+    count: int,
+    fmt: OutputFormat,
+    checkpoint: Optional["Checkpoint"] = None,
+    type_: Optional[str] = None,
+    key_filter: Optional["KeyFilter"] = None,
+    tuner: Optional[Callable[[], "AdaptiveCount"]] = None,
+    parallelism: Optional[int] = None,
+) -> None:
+    import asyncio
 
+    from ..aio import get_async_client, iter_async_scan_pages, primary_names
 
-def _print_page(label: str, cursor: int, items, with_scores: bool = False):
-    typer.echo(f"[{label}] cursor={cursor}")
-    if not items:
-        typer.echo("（无结果）")
-        return
-    _print_sequence(items, with_scores=with_scores)
+    async def run() -> None:
+        client = get_async_client(options)
+        try:
+            resume = None
+            if checkpoint:
+                checkpoint.track(await primary_names(client))
+                resume = checkpoint.resume
+            with _checkpoint_writer(checkpoint, fmt) as out:
+                try:
+                    async for page in iter_async_scan_pages(
+                        client,
+                        match=pattern,
+                        count=count,
+                        process=key_filter.filter_async if key_filter else None,
+                        resume=resume,
+                        type_=type_,
+                        tuner=tuner,
+                        parallelism=parallelism,
+                    ):
+                        _write_scan_page(out, page, checkpoint, bool(key_filter))
+                finally:
+                    if checkpoint:
+                        checkpoint.save()
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+
+
+def _scan_threads(
+    client,
+    pattern: str,
+    count: int,
+    parallelism: Optional[int],
+    fmt: OutputFormat,
+    checkpoint: Optional["Checkpoint"] = None,
+    type_: Optional[str] = None,
+    key_filter: Optional["KeyFilter"] = None,
+    tuner: Optional[Callable[[], "AdaptiveCount"]] = None,
+    fetcher: Optional["ValueFetcher"] = None,
+) -> None:
+    resume = None
+    if checkpoint:
+        checkpoint.track(name for name, _ in primary_clients(client))
+        resume = checkpoint.resume
+    pages = iter_scan_pages(
+        client,
+        match=pattern,
+        count=count,
+        parallelism=parallelism,
+        process=_processor(key_filter, fetcher),
+        resume=resume,
+        type_=type_,
+        tuner=tuner,
+    )
+    with _checkpoint_writer(checkpoint, fmt) as out:
+        try:
+            for page in pages:
+                _write_scan_page(out, page, checkpoint, bool(key_filter), bool(fetcher))
+        finally:
+            if checkpoint:
+                checkpoint.save()
+
+
+def _print_page(
+    label: str,
+    cursor: int,
+    items,
+    with_scores: bool = False,
+    fmt: OutputFormat = OutputFormat.text,
+) -> None:
+    with OutputWriter(fmt=fmt) as out:
+        out.write_cursor(label, cursor, empty=not items)
+        out.write_page(items, with_scores=with_scores)
+
+
+def _print_pages(
+    pages, with_scores: bool = False, fmt: OutputFormat = OutputFormat.text
+) -> None:
+    with OutputWriter(fmt=fmt) as out:
+        for items in pages:
+            out.write_page(items, with_scores=with_scores)
 
 
 def scan_command(
@@ -43,6 +304,62 @@ def scan_command(
     count: int = typer.Option(100, "--count", "-c", help="每次返回的最大条数"),
     cursor: int = typer.Option(0, "--cursor", help="起始游标"),
     auto: bool = typer.Option(False, "--auto", help="自动遍历至末尾"),
+    parallelism: int | None = typer.Option(
+        None, "--parallelism", "-P", min=1,
+        help="Cluster 模式下同时扫描的主节点数（默认全部并行）",
+    ),
+    engine: ScanEngine = typer.Option(
+        ScanEngine.thread, "--engine",
+        help="--auto 的并发方式：thread 为线程池，async 为单线程 asyncio",
+    ),
+    output: OutputFormat = typer.Option(
+        OutputFormat.text, "--output", "-o", help=OUTPUT_HELP
+    ),
+    raw: bool = typer.Option(False, "--raw", help=RAW_OPTION_HELP),
+    checkpoint_file: Optional[str] = typer.Option(
+        None, "--checkpoint",
+        help="配合 --auto：定期把每个节点的游标与计数写入该文件",
+    ),
+    resume: bool = typer.Option(
+        False, "--resume", help="从 --checkpoint 文件记录的位置继续扫描"
+    ),
+    type_: Optional[str] = typer.Option(
+        None, "--type", "-t",
+        help="只返回该类型的 key（string/list/set/zset/hash/stream 等，由服务端过滤）",
+    ),
+    regex: Optional[str] = typer.Option(
+        None, "--regex", help="在客户端用正则表达式进一步过滤 key"
+    ),
+    min_ttl: Optional[int] = typer.Option(
+        None, "--min-ttl", help="剩余 TTL 不少于该秒数（没有过期时间视为无穷大）"
+    ),
+    max_ttl: Optional[int] = typer.Option(
+        None, "--max-ttl", help="剩余 TTL 不超过该秒数（会排除没有过期时间的 key）"
+    ),
+    min_size: Optional[int] = typer.Option(None, "--min-size", help="大小下限"),
+    max_size: Optional[int] = typer.Option(None, "--max-size", help="大小上限"),
+    size_by: SizeBy = typer.Option(
+        SizeBy.memory, "--size-by",
+        help="大小的度量：memory 为 MEMORY USAGE 字节数，length 为 STRLEN/HLEN/LLEN 等长度",
+    ),
+    min_idle: Optional[int] = typer.Option(
+        None, "--min-idle", help="空闲时间（OBJECT IDLETIME）不少于该秒数"
+    ),
+    max_idle: Optional[int] = typer.Option(
+        None, "--max-idle", help="空闲时间不超过该秒数"
+    ),
+    adaptive: bool = typer.Option(False, "--adaptive", help=ADAPTIVE_HELP),
+    min_count: int = typer.Option(10, "--min-count", min=1, help="--adaptive 的 COUNT 下限"),
+    max_count: int = typer.Option(
+        10000, "--max-count", min=1, help="--adaptive 的 COUNT 上限"
+    ),
+    target_ms: float = typer.Option(5.0, "--target-ms", min=0.1, help=TARGET_HELP),
+    with_values: bool = typer.Option(
+        False, "--with-values", help="同时输出每个 key 的类型与值（每页两到三个 pipeline）"
+    ),
+    max_items: int = typer.Option(1000, "--max-items", min=1, help=MAX_ITEMS_HELP),
+    max_bytes: Optional[int] = typer.Option(None, "--max-bytes", min=1, help=MAX_BYTES_HELP),
+    full: bool = typer.Option(False, "--full", help=FULL_HELP),
 ) -> None:
     """
     遍历当前数据库的 key 空间 (SCAN)。
@@ -56,14 +373,129 @@ def scan_command(
 
       # 每次迭代返回 10 个
       mzrds scan -c 10
+
+      # Cluster 模式下最多同时扫描 4 个主节点
+      mzrds --cluster scan -p "user:*" --auto -P 4
+
+      # 使用 asyncio 引擎在单线程上并发扫描所有主节点
+      mzrds --cluster scan -p "user:*" --auto --engine async
+
+      # 每行输出一个原始 key，交给其他工具处理
+      mzrds scan -p "user:*" --auto --raw | wc -l
+
+      # 输出 JSON Lines
+      mzrds scan -p "user:*" --auto -o jsonl
+
+      # 只要 hash 类型、超过 1 MiB、一天没被访问过的 key（每页一个 pipeline）
+      mzrds scan --auto -t hash --min-size 1048576 --min-idle 86400
+
+      # 正则匹配，且 1 小时内过期
+      mzrds scan --auto -p "session:*" --regex "^session:[0-9]+$" --max-ttl 3600
+
+      # 连同值一起输出，集合最多 100 个元素
+      mzrds scan -p "user:*" --auto --with-values --max-items 100 -o jsonl
+
+      # 稀疏模式：根据每页耗时自动放大 COUNT，单次调用控制在 2ms 左右
+      mzrds scan -p "rare:*" --auto --adaptive --target-ms 2
+
+      # 长时间扫描：中断后用 --resume 从检查点继续，已输出的 key 不再重复
+      mzrds scan -p "user:*" --auto --checkpoint users.ckpt >> users.txt
+      mzrds scan -p "user:*" --auto --checkpoint users.ckpt --resume >> users.txt
     """
+    fmt = _output_format(output, raw)
+    if (checkpoint_file or resume) and not auto:
+        raise typer.BadParameter("--checkpoint / --resume 需要配合 --auto 使用")
+    if resume and not checkpoint_file:
+        raise typer.BadParameter("--resume 需要同时指定 --checkpoint")
+    key_filter = _key_filter(
+        regex, (min_ttl, max_ttl), (min_size, max_size), size_by, (min_idle, max_idle), type_
+    )
+    tuner = _tuner(auto, adaptive, count, min_count, max_count, target_ms)
+    if with_values and auto and engine is ScanEngine.asyncio:
+        raise typer.BadParameter("--with-values 暂不支持 --engine async")
+    checkpoint = None
+    if checkpoint_file:
+        checkpoint = _open_checkpoint(
+            ctx.obj.options, pattern, checkpoint_file, resume, type_, key_filter, with_values
+        )
+        if checkpoint.finished:
+            typer.echo(f"检查点 {checkpoint_file} 记录的扫描已经完成。", err=True)
+            return
+    with _filter_errors():
+        if auto and engine is ScanEngine.asyncio:
+            _scan_async(
+                ctx.obj.options, pattern, count, fmt, checkpoint, type_, key_filter, tuner,
+                parallelism,
+            )
+            return
+        client = _client(ctx)
+        fetcher = _value_fetcher(client, max_items, max_bytes, full) if with_values else None
+        if auto:
+            _scan_threads(
+                client,
+                pattern,
+                count,
+                parallelism,
+                fmt,
+                checkpoint,
+                type_,
+                key_filter,
+                tuner,
+                fetcher,
+            )
+            return
+        next_cursor, keys = client.scan(
+            cursor=cursor, match=pattern, count=count, _type=type_
+        )
+        if key_filter and keys:
+            keys = key_filter(client, keys)
+        if not fetcher:
+            _print_page("scan", next_cursor, keys, fmt=fmt)
+            return
+        from ..values import write_values
+
+        entries = fetcher(client, keys)
+        with OutputWriter(fmt=fmt) as out:
+            out.write_cursor("scan", next_cursor, empty=not entries)
+            write_values(out, entries)
+
+
+def dump_values_command(
+    ctx: typer.Context,
+    pattern: str = typer.Option("*", "--pattern", "-p", help="匹配模式"),
+    count: int = typer.Option(500, "--count", "-c", help="每次 SCAN 返回的最大条数"),
+    type_: Optional[str] = typer.Option(
+        None, "--type", "-t", help="只输出该类型的 key（由服务端过滤）"
+    ),
+    max_items: int = typer.Option(1000, "--max-items", min=1, help=MAX_ITEMS_HELP),
+    max_bytes: Optional[int] = typer.Option(None, "--max-bytes", min=1, help=MAX_BYTES_HELP),
+    full: bool = typer.Option(False, "--full", help=FULL_HELP),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时扫描的主节点数"
+    ),
+    output: OutputFormat = typer.Option(
+        OutputFormat.text, "--output", "-o", help=OUTPUT_HELP
+    ),
+    raw: bool = typer.Option(False, "--raw", help=RAW_OPTION_HELP),
+) -> None:
+    """
+    遍历匹配的 key 并输出类型与值，等同于 scan --auto --with-values。
+
+    每个 SCAN 页先用 pipeline 查询 TYPE，再按类型批量读取：string 合并为 MGET，
+    hash / set 用 HGETALL / SMEMBERS（超过 --max-items 时改用 HSCAN / SSCAN），
+    list / zset / stream 用 LRANGE / ZRANGE WITHSCORES / XRANGE。
+
+    Examples:
+      mzrds dump-values -p "config:*"
+      mzrds dump-values -p "user:*" -t hash -o jsonl > users.jsonl
+      mzrds dump-values -p "queue:*" --max-items 10000 --full --raw
+    """
+    fmt = _output_format(output, raw)
     client = _client(ctx)
-    if auto:
-        iterator = client.scan_iter(match=pattern, count=count)
-        _print_sequence(iterator)
-    else:
-        next_cursor, keys = client.scan(cursor=cursor, match=pattern, count=count)
-        _print_page("scan", next_cursor, keys)
+    fetcher = _value_fetcher(client, max_items, max_bytes, full)
+    _scan_threads(
+        client, pattern, count, parallelism, fmt, type_=type_, fetcher=fetcher
+    )
 
 
 def hscan_command(
@@ -73,6 +505,16 @@ def hscan_command(
     count: int = typer.Option(100, "--count", "-c"),
     cursor: int = typer.Option(0, "--cursor"),
     auto: bool = typer.Option(False, "--auto"),
+    output: OutputFormat = typer.Option(
+        OutputFormat.text, "--output", "-o", help=OUTPUT_HELP
+    ),
+    raw: bool = typer.Option(False, "--raw", help=RAW_OPTION_HELP),
+    adaptive: bool = typer.Option(False, "--adaptive", help=ADAPTIVE_HELP),
+    min_count: int = typer.Option(10, "--min-count", min=1, help="--adaptive 的 COUNT 下限"),
+    max_count: int = typer.Option(
+        10000, "--max-count", min=1, help="--adaptive 的 COUNT 上限"
+    ),
+    target_ms: float = typer.Option(5.0, "--target-ms", min=0.1, help=TARGET_HELP),
 ) -> None:
     """
     遍历 Hash 类型的字段 (HSCAN)。
@@ -80,14 +522,21 @@ def hscan_command(
     Examples:
       mzrds hscan myhash
       mzrds hscan myhash -p "field_*" --auto
+      mzrds hscan bighash --auto --adaptive --target-ms 2
     """
+    fmt = _output_format(output, raw)
+    tuner = _tuner(auto, adaptive, count, min_count, max_count, target_ms)
     client = _client(ctx)
     if auto:
-        iterator = client.hscan_iter(key, match=pattern, count=count)
-        _print_sequence(iterator)
+        pages = _iter_pages(
+            lambda cur, cnt: client.hscan(key, cursor=cur, match=pattern, count=cnt),
+            count,
+            tuner,
+        )
+        _print_pages((result.items() for result in pages), fmt=fmt)
     else:
         next_cursor, result = client.hscan(key, cursor=cursor, match=pattern, count=count)
-        _print_page("hscan", next_cursor, result.items())
+        _print_page("hscan", next_cursor, result.items(), fmt=fmt)
 
 
 def sscan_command(
@@ -97,6 +546,16 @@ def sscan_command(
     count: int = typer.Option(100, "--count", "-c"),
     cursor: int = typer.Option(0, "--cursor"),
     auto: bool = typer.Option(False, "--auto"),
+    output: OutputFormat = typer.Option(
+        OutputFormat.text, "--output", "-o", help=OUTPUT_HELP
+    ),
+    raw: bool = typer.Option(False, "--raw", help=RAW_OPTION_HELP),
+    adaptive: bool = typer.Option(False, "--adaptive", help=ADAPTIVE_HELP),
+    min_count: int = typer.Option(10, "--min-count", min=1, help="--adaptive 的 COUNT 下限"),
+    max_count: int = typer.Option(
+        10000, "--max-count", min=1, help="--adaptive 的 COUNT 上限"
+    ),
+    target_ms: float = typer.Option(5.0, "--target-ms", min=0.1, help=TARGET_HELP),
 ) -> None:
     """
     遍历 Set 类型的成员 (SSCAN)。
@@ -105,13 +564,27 @@ def sscan_command(
       mzrds sscan myset
       mzrds sscan myset -p "member_*" --auto
     """
+    fmt = _output_format(output, raw)
+    tuner = _tuner(auto, adaptive, count, min_count, max_count, target_ms)
     client = _client(ctx)
     if auto:
-        iterator = client.sscan_iter(key, match=pattern, count=count)
-        _print_sequence(iterator)
+        pages = _iter_pages(
+            lambda cur, cnt: client.sscan(key, cursor=cur, match=pattern, count=cnt),
+            count,
+            tuner,
+        )
+        _print_pages(pages, fmt=fmt)
     else:
         next_cursor, result = client.sscan(key, cursor=cursor, match=pattern, count=count)
-        _print_page("sscan", next_cursor, result)
+        _print_page("sscan", next_cursor, result, fmt=fmt)
+
+
+def _zscan(client, key: str, cursor: int, pattern: str, count: int, with_scores: bool):
+    # ZSCAN 总是返回分数，redis-py 也没有 withscores 参数，不需要时在本地去掉
+    next_cursor, result = client.zscan(key, cursor=cursor, match=pattern, count=count)
+    if not with_scores:
+        result = [member for member, _ in result]
+    return next_cursor, result
 
 
 def zscan_command(
@@ -122,6 +595,16 @@ def zscan_command(
     cursor: int = typer.Option(0, "--cursor"),
     auto: bool = typer.Option(False, "--auto"),
     with_scores: bool = typer.Option(True, "--scores/--no-scores", help="显示分数"),
+    output: OutputFormat = typer.Option(
+        OutputFormat.text, "--output", "-o", help=OUTPUT_HELP
+    ),
+    raw: bool = typer.Option(False, "--raw", help=RAW_OPTION_HELP),
+    adaptive: bool = typer.Option(False, "--adaptive", help=ADAPTIVE_HELP),
+    min_count: int = typer.Option(10, "--min-count", min=1, help="--adaptive 的 COUNT 下限"),
+    max_count: int = typer.Option(
+        10000, "--max-count", min=1, help="--adaptive 的 COUNT 上限"
+    ),
+    target_ms: float = typer.Option(5.0, "--target-ms", min=0.1, help=TARGET_HELP),
 ) -> None:
     """
     遍历 Sorted Set 类型的成员 (ZSCAN)。
@@ -130,17 +613,19 @@ def zscan_command(
       mzrds zscan myzset
       mzrds zscan myzset --no-scores
     """
+    fmt = _output_format(output, raw)
+    tuner = _tuner(auto, adaptive, count, min_count, max_count, target_ms)
     client = _client(ctx)
     if auto:
-        iterator = client.zscan_iter(
-            key, match=pattern, count=count, withscores=with_scores
+        pages = _iter_pages(
+            lambda cur, cnt: _zscan(client, key, cur, pattern, cnt, with_scores),
+            count,
+            tuner,
         )
-        _print_sequence(iterator, with_scores=with_scores)
+        _print_pages(pages, with_scores=with_scores, fmt=fmt)
     else:
-        next_cursor, result = client.zscan(
-            key, cursor=cursor, match=pattern, count=count, withscores=with_scores
-        )
-        _print_page("zscan", next_cursor, result, with_scores=with_scores)
+        next_cursor, result = _zscan(client, key, cursor, pattern, count, with_scores)
+        _print_page("zscan", next_cursor, result, with_scores=with_scores, fmt=fmt)
 
 
 def register_scan_commands(app: typer.Typer) -> None:
@@ -148,6 +633,7 @@ def register_scan_commands(app: typer.Typer) -> None:
     app.command("hscan")(hscan_command)
     app.command("sscan")(sscan_command)
     app.command("zscan")(zscan_command)
+    app.command("dump-values")(dump_values_command)
 
 
 __all__ = ["register_scan_commands"]
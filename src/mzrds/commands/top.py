@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import sys
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
+
+import typer
+
+from ..metrics import format_bytes
+from ..output import iter_json
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+    from ..info import InfoSample
+
+# (节点名, 采样或错误, 采样时刻)
+Poll = Tuple[str, Any, float]
+
+TOTAL = "total"
+_COLUMNS = (
+    ("节点", 21), ("角色", 7), ("ops/s", 10), ("命中率", 7), ("入/s", 9), ("出/s", 9),
+    ("淘汰/s", 8), ("过期/s", 8), ("内存", 9), ("碎片率", 6), ("连接", 7), ("keys", 11),
+)
+
+
+def _state(ctx: typer.Context) -> "CLIState":
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state
+
+
+def _poll(node: Tuple[str, Any]) -> Poll:
+    from redis.exceptions import RedisError
+
+    from ..info import parse_info, raw_info
+
+    name, client = node
+    try:
+        sample: Any = parse_info(raw_info(client))
+    except RedisError as exc:
+        sample = exc
+    return name, sample, time.monotonic()
+
+
+def _sum_samples(samples: Sequence["InfoSample"]) -> "InfoSample":
+    """合并主节点的采样；碎片率不能相加，由合计的 RSS / used_memory 重新计算。"""
+    total: Dict[str, Any] = {"role": TOTAL}
+    for sample in samples:
+        for name, value in sample.items():
+            if name not in ("role", "mem_fragmentation_ratio"):
+                total[name] = total.get(name, 0) + value
+    total.setdefault("keys", 0)
+    return total
+
+
+def _rows(previous: Sequence[Poll], current: Sequence[Poll]) -> List[Dict[str, Any]]:
+    from ..info import compute_rates
+
+    rows = []
+    pairs = []
+    for (name, before, started), (_, after, finished) in zip(previous, current):
+        if isinstance(after, Exception) or isinstance(before, Exception):
+            error = after if isinstance(after, Exception) else before
+            rows.append({"node": name, "error": str(error)})
+            continue
+        pairs.append((before, after, finished - started))
+        row = {"node": name, "role": after.get("role", "")}
+        row.update(compute_rates(before, after, finished - started))
+        rows.append(row)
+    primaries = [pair for pair in pairs if pair[1].get("role") == "master"]
+    if len(current) > 1 and primaries:
+        elapsed = max(pair[2] for pair in primaries)
+        row = {"node": TOTAL, "role": ""}
+        row.update(
+            compute_rates(
+                _sum_samples([pair[0] for pair in primaries]),
+                _sum_samples([pair[1] for pair in primaries]),
+                elapsed,
+            )
+        )
+        rows.append(row)
+    return rows
+
+
+def _cells(row: Dict[str, Any]) -> List[str]:
+    if "error" in row:
+        return [row["node"], f"(error) {row['error']}"]
+    ratio = row["hit_ratio"]
+    fragmentation = row["fragmentation"]
+    return [
+        row["node"],
+        row["role"],
+        f"{row['ops_per_sec']:.0f}",
+        "-" if ratio is None else f"{ratio:.1%}",
+        format_bytes(row["net_in_per_sec"]),
+        format_bytes(row["net_out_per_sec"]),
+        f"{row['evicted_per_sec']:.0f}",
+        f"{row['expired_per_sec']:.0f}",
+        format_bytes(row["used_memory"]),
+        "-" if fragmentation is None else f"{fragmentation:.2f}",
+        f"{row['connected_clients']:.0f}",
+        str(int(row["keys"])),
+    ]
+
+
+def _pad(text: str, width: int) -> str:
+    # 中文等宽字符在终端中占两列
+    used = sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+    return text + " " * max(width - used, 0)
+
+
+def _line(cells: Sequence[str]) -> str:
+    return " ".join(_pad(cell, width) for cell, (_, width) in zip(cells, _COLUMNS)).rstrip()
+
+
+def _json_row(row: Dict[str, Any], now: float) -> str:
+    record = {"time": now}
+    for name, value in row.items():
+        record[name] = round(value, 4) if isinstance(value, float) else value
+    return "".join(iter_json(record))
+
+
+def _render(rows: List[Dict[str, Any]], as_json: bool, interactive: bool, first: bool) -> None:
+    if as_json:
+        now = round(time.time(), 3)
+        sys.stdout.write("".join(_json_row(row, now) + "\n" for row in rows))
+        sys.stdout.flush()
+        return
+    header = _line([title for title, _ in _COLUMNS])
+    lines = [_line(_cells(row)) for row in rows]
+    if interactive:
+        # 光标回到左上角并清屏后整体重绘
+        title = f"mzrds top  {time.strftime('%H:%M:%S')}  （Ctrl-C 退出）"
+        sys.stdout.write("\x1b[H\x1b[J" + "\n".join([title, "", header] + lines) + "\n")
+        sys.stdout.flush()
+        return
+    stamp = time.strftime("%H:%M:%S")
+    if first:
+        typer.echo(f"{_pad('时间', 8)} {header}")
+    for line in lines:
+        typer.echo(f"{stamp:<8} {line}")
+
+
+def top_command(
+    ctx: typer.Context,
+    interval: float = typer.Option(1.0, "--interval", "-i", min=0.1, help="刷新间隔（秒）"),
+    iterations: int = typer.Option(
+        0, "--iterations", "-n", min=0, help="输出指定次数后退出，0 表示直到 Ctrl-C"
+    ),
+    as_json: bool = typer.Option(
+        False, "--json", help="每个节点每次刷新输出一行 JSON（JSONL）"
+    ),
+) -> None:
+    """
+    实时查看 INFO 统计，按两次采样的差值计算每秒速率，类似 redis-cli --stat。
+
+    显示 ops/s、区间命中率、网络入/出流量、淘汰与过期速率、内存与碎片率、
+    连接数和 key 数。Cluster 模式下并行轮询所有节点（含副本），并按主节点汇总。
+    整个过程只建立一次连接，不会每次刷新都重新启动进程。
+
+    Examples:
+      mzrds top
+      mzrds --cluster top -i 2
+      mzrds top --json -n 60 > stats.jsonl
+    """
+    from ..scanner import node_clients
+
+    state = _state(ctx)
+    nodes = node_clients(state.get_client())
+    interactive = sys.stdout.isatty() and not as_json
+    shown = 0
+    with ThreadPoolExecutor(max_workers=len(nodes)) as pool:
+        previous = list(pool.map(_poll, nodes))
+        try:
+            while not iterations or shown < iterations:
+                time.sleep(max(interval - (time.monotonic() - previous[0][2]), 0))
+                current = list(pool.map(_poll, nodes))
+                _render(_rows(previous, current), as_json, interactive, first=not shown)
+                previous = current
+                shown += 1
+        except KeyboardInterrupt:
+            pass
+
+
+def register_top_commands(app: typer.Typer) -> None:
+    app.command("top")(top_command)
+
+
+__all__ = ["register_top_commands"]
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, List, Optional
+
+import typer
+
+from ..dump import DumpFormatError, DumpWriter, dump_keys, iter_records, restore_records
+from ..scanner import iter_scan_pages
+
+if TYPE_CHECKING:
+    from ..cli import CLIState
+
+
+def _client(ctx: typer.Context):
+    state: "CLIState" = ctx.obj
+    if not state:
+        raise typer.Exit(code=1)
+    return state.get_client()
+
+
+def export_command(
+    ctx: typer.Context,
+    pattern: str = typer.Option("*", "--pattern", "-p", help="匹配模式"),
+    count: int = typer.Option(500, "--count", "-c", help="每次 SCAN 返回的最大条数"),
+    output: str = typer.Option("-", "--output", "-o", help="输出文件，默认标准输出"),
+    compress: bool = typer.Option(False, "--compress", "-z", help="使用 gzip 压缩"),
+    parallelism: Optional[int] = typer.Option(
+        None, "--parallelism", "-P", min=1, help="Cluster 模式下同时导出的主节点数"
+    ),
+) -> None:
+    """
+    以 DUMP 格式流式导出匹配的 key（含过期时间）。
+
+    每个 SCAN 页用一个 pipeline 获取 DUMP 与 PTTL，边扫描边写出，内存占用与
+    key 总数无关。
+
+    Examples:
+      mzrds --use prod export -p "user:*" -z > users.mzd
+      mzrds --use prod export -p "user:*" | mzrds --use staging import -
+    """
+    client = _client(ctx)
+    if output == "-":
+        if sys.stdout.isatty():
+            raise typer.BadParameter("拒绝向终端输出二进制数据，请重定向或使用 --output")
+        stream = sys.stdout.buffer
+    else:
+        stream = open(output, "wb")
+    writer = DumpWriter(stream, compress=compress)
+    errors: List[str] = []
+
+    def on_error(key: bytes, exc: Exception) -> None:
+        errors.append(f"{key!r}: {exc}")
+
+    try:
+        for page in iter_scan_pages(
+            client,
+            match=pattern,
+            count=count,
+            parallelism=parallelism,
+            process=lambda node, keys: dump_keys(node, keys, on_error),
+        ):
+            if page.result:
+                writer.write_records(page.result)
+    finally:
+        writer.close()
+        if stream is not sys.stdout.buffer:
+            stream.close()
+    typer.echo(f"已导出 {writer.count} 个 key。", err=True)
+    if errors:
+        typer.secho(
+            f"{len(errors)} 个 key 导出失败，最后一个错误: {errors[-1]}",
+            fg=typer.colors.RED,
+            err=True,
+        )
+        raise typer.Exit(code=1)
+
+
+def _batches(records, size: int):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_command(
+    ctx: typer.Context,
+    source: typer.FileBinaryRead = typer.Argument("-", help="导入文件，默认标准输入"),
+    batch_size: int = typer.Option(
+        1000, "--batch-size", "-b", min=1, help="每个 RESTORE pipeline 的 key 数"
+    ),
+    replace: bool = typer.Option(
+        True, "--replace/--no-replace", help="目标 key 已存在时是否覆盖"
+    ),
+) -> None:
+    """
+    导入 export 生成的文件，使用 pipeline 批量执行 RESTORE。
+
+    Examples:
+      mzrds --use staging import users.mzd
+      mzrds --use staging import --no-replace users.mzd
+    """
+    client = _client(ctx)
+    restored = errors = 0
+    try:
+        for batch in _batches(iter_records(source), batch_size):
+            for (key, _, _), reply in zip(batch, restore_records(client, batch, replace)):
+                if isinstance(reply, Exception):
+                    errors += 1
+                    if errors <= 10:
+                        typer.echo(f"(error) {key!r}: {reply}", err=True)
+                else:
+                    restored += 1
+    except DumpFormatError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    typer.echo(f"已导入 {restored} 个 key，失败 {errors} 个。", err=True)
+    if errors:
+        raise typer.Exit(code=1)
+
+
+def register_transfer_commands(app: typer.Typer) -> None:
+    app.command("export")(export_command)
+    app.command("import")(import_command)
+
+
+__all__ = ["register_transfer_commands"]
@@ -5,7 +5,6 @@ from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Dict, Optional, Any
 
-import tomli_w
 try:
     import tomllib
 except ImportError:
@@ -38,6 +37,14 @@ class ConnectionOptions:
     cert: Optional[str] = None
     key: Optional[str] = None
     cluster: bool = False
+    # 套接字与连接池设置，None 表示使用 redis-py 的默认值
+    socket_timeout: Optional[float] = None
+    socket_connect_timeout: Optional[float] = None
+    socket_keepalive: Optional[bool] = None
+    health_check_interval: Optional[float] = None
+    max_connections: Optional[int] = None
+    retries: Optional[int] = None
+    retry_backoff: Optional[float] = None
 
     def to_dict(self) -> Dict[str, object]:
         data = asdict(self)
@@ -63,6 +70,9 @@ class ConfigStore:
             return tomllib.load(fh)
 
     def _dump_raw(self, data: Dict[str, Any]) -> None:
+        # 只有保存配置时才需要 TOML 写入器，按需导入以加快启动
+        import tomli_w
+
         self._ensure_dir()
         with self.file_path.open("wb") as fh:
             tomli_w.dump(data, fh)
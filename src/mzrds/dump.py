@@ -0,0 +1,169 @@
+"""
+key 导出/导入所用的流式二进制格式以及 DUMP / RESTORE 的 pipeline 封装。
+
+文件格式::
+
+    MAGIC (8 字节) | VERSION (1 字节) | 记录...
+    记录 = key 长度 (u32) | PTTL 毫秒 (i64，-1 表示不过期) | 值长度 (u32) | key | DUMP 值
+
+整个流可以再用 gzip 压缩，读取时根据 gzip 魔数自动识别。
+"""
+from __future__ import annotations
+
+import gzip
+import io
+import struct
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+MAGIC = b"MZRDSDMP"
+VERSION = 1
+GZIP_MAGIC = b"\x1f\x8b"
+
+_RECORD = struct.Struct(">IqI")
+
+Record = Tuple[bytes, int, bytes]
+
+
+class DumpFormatError(ValueError):
+    """导入文件不是合法的 mzrds 导出格式或已被截断。"""
+
+
+class DumpWriter:
+    def __init__(self, stream: BinaryIO, compress: bool = False, level: int = 6):
+        self._raw = stream
+        self._stream = (
+            gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=level)
+            if compress
+            else stream
+        )
+        self._stream.write(MAGIC + bytes([VERSION]))
+        self.count = 0
+
+    def write_records(self, records: Iterable[Record]) -> None:
+        chunks: List[bytes] = []
+        for key, pttl, value in records:
+            chunks.append(_RECORD.pack(len(key), pttl, len(value)))
+            chunks.append(key)
+            chunks.append(value)
+            self.count += 1
+        if chunks:
+            self._stream.write(b"".join(chunks))
+
+    def close(self) -> None:
+        if self._stream is not self._raw:
+            self._stream.close()
+        self._raw.flush()
+
+
+class _Prefixed(io.RawIOBase):
+    """先交还已经读出的开头字节，再继续读原始流。"""
+
+    def __init__(self, head: bytes, stream: BinaryIO):
+        self._head = head
+        self._stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._head:
+            size = min(len(buffer), len(self._head))
+            buffer[:size] = self._head[:size]
+            self._head = self._head[size:]
+            return size
+        data = self._stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _open_reader(stream: BinaryIO) -> Tuple[bytes, BinaryIO]:
+    """
+    识别 gzip 压缩，返回 ``(已读出的开头字节, 后续的流)``。
+
+    管道上的 ``peek`` / ``read`` 可能只返回 1 个字节，因此循环读满魔数长度或到 EOF。
+    """
+    head = b""
+    while len(head) < len(GZIP_MAGIC):
+        chunk = stream.read(len(GZIP_MAGIC) - len(head))
+        if not chunk:
+            break
+        head += chunk
+    if head == GZIP_MAGIC:
+        return b"", gzip.GzipFile(fileobj=_Prefixed(head, stream), mode="rb")
+    return head, stream
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise DumpFormatError("导入文件被截断")
+    return data
+
+
+def iter_records(stream: BinaryIO) -> Iterator[Record]:
+    """逐条读取导出文件中的记录，自动识别 gzip 压缩。"""
+    head, stream = _open_reader(stream)
+    header = head + stream.read(len(MAGIC) + 1 - len(head))
+    if header[: len(MAGIC)] != MAGIC:
+        raise DumpFormatError("不是 mzrds 导出文件")
+    if len(header) <= len(MAGIC):
+        raise DumpFormatError("导入文件被截断")
+    if header[len(MAGIC)] != VERSION:
+        raise DumpFormatError(f"不支持的导出格式版本: {header[len(MAGIC)]}")
+    while True:
+        head = stream.read(_RECORD.size)
+        if not head:
+            return
+        if len(head) != _RECORD.size:
+            raise DumpFormatError("导入文件被截断")
+        key_len, pttl, value_len = _RECORD.unpack(head)
+        key = _read_exact(stream, key_len)
+        value = _read_exact(stream, value_len)
+        yield key, pttl, value
+
+
+def dump_keys(
+    client,
+    keys: Sequence[bytes],
+    on_error: Optional[Callable[[bytes, Exception], None]] = None,
+) -> List[Record]:
+    """用一个 pipeline 获取一页 key 的 DUMP 与 PTTL；已消失或即将过期的 key 被跳过。
+
+    单个 key 的错误（如模块类型不支持 DUMP）不会中断整页：该 key 被跳过并交给
+    ``on_error`` 计数。
+    """
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.dump(key)
+        pipe.pttl(key)
+    replies = pipe.execute(raise_on_error=False)
+    records: List[Record] = []
+    for idx, key in enumerate(keys):
+        value, pttl = replies[2 * idx], replies[2 * idx + 1]
+        error = next((r for r in (value, pttl) if isinstance(r, Exception)), None)
+        if error is not None:
+            if on_error:
+                on_error(key, error)
+            continue
+        if value is None or pttl in (-2, 0):
+            continue
+        records.append((key, pttl, value))
+    return records
+
+
+def restore_records(client, records: Sequence[Record], replace: bool = True) -> List:
+    """用一个 pipeline 执行 RESTORE，返回每条记录的回复（错误以异常对象表示）。"""
+    pipe = client.pipeline(transaction=False)
+    for key, pttl, value in records:
+        pipe.restore(key, max(pttl, 0), value, replace=replace)
+    return pipe.execute(raise_on_error=False)
+
+
+__all__ = [
+    "DumpFormatError",
+    "DumpWriter",
+    "Record",
+    "dump_keys",
+    "iter_records",
+    "restore_records",
+]
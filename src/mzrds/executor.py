@@ -1,16 +1,46 @@
 from __future__ import annotations
 
-from typing import Iterable, Sequence
+import sys
+from typing import Iterable, List, Sequence
 
-import typer
+
+def _echo(message) -> None:
+    # 不依赖 typer，exec 的快速入口无需加载它
+    sys.stdout.write(f"{message}\n")
+
+
+# redis-cli（sdscatrepr）风格的转义：可打印 ASCII 原样保留，其余字节转义
+_ESCAPES = {code: f"\\x{code:02x}" for code in range(256) if not 32 <= code < 127}
+_ESCAPES.update(
+    {
+        ord("\\"): "\\\\",
+        ord('"'): '\\"',
+        ord("\n"): "\\n",
+        ord("\r"): "\\r",
+        ord("\t"): "\\t",
+        7: "\\a",
+        8: "\\b",
+    }
+)
+
+
+def escape_bytes(data) -> str:
+    """把字节渲染为带引号的转义字符串，例如 ``"\\x00\\xffabc"``。"""
+    return '"' + bytes(data).decode("latin-1").translate(_ESCAPES) + '"'
+
+
+def render_bytes(data) -> str:
+    """能按 UTF-8 解码且可打印时原样显示，否则按 redis-cli 的方式转义。"""
+    try:
+        text = str(data, "utf-8")
+    except UnicodeDecodeError:
+        return escape_bytes(data)
+    return text if text.isprintable() else escape_bytes(data)
 
 
 def decode_value(value):
-    if isinstance(value, bytes):
-        try:
-            return value.decode("utf-8")
-        except UnicodeDecodeError:
-            return value.hex()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return render_bytes(value)
     if isinstance(value, (list, tuple)):
         return [decode_value(v) for v in value]
     if isinstance(value, dict):
@@ -20,23 +50,68 @@ def decode_value(value):
 
 def execute_raw(client, parts: Sequence[str]):
     if not parts:
+        import typer
+
         raise typer.BadParameter("需要至少一个 Redis 命令")
     return client.execute_command(*parts)
 
 
+def execute_command_reply(client, parts: Sequence[str]):
+    """执行命令；服务端返回的错误回复作为异常对象返回，而不是抛出。"""
+    try:
+        return execute_raw(client, parts)
+    except Exception as exc:
+        # 只在出错时才导入 redis，经代理转发的快速路径不必加载它
+        from redis.exceptions import ResponseError
+
+        if isinstance(exc, ResponseError):
+            return exc
+        raise
+
+
+def format_response(response) -> List[str]:
+    """把回复格式化为 redis-cli 风格的文本行。"""
+    if isinstance(response, Exception):
+        return [f"(error) {response}"]
+    if isinstance(response, (list, tuple)):
+        # 逐个元素渲染，不先构造一份解码后的列表
+        return [
+            f"{idx}) {decode_value(item)}" for idx, item in enumerate(response, start=1)
+        ]
+    return [str(decode_value(response))]
+
+
 def print_response(response) -> None:
-    decoded = decode_value(response)
-    if isinstance(decoded, list):
-        for idx, item in enumerate(decoded, start=1):
-            typer.echo(f"{idx}) {item}")
-    else:
-        typer.echo(decoded)
+    for line in format_response(response):
+        _echo(line)
+
+
+def iter_to_console(items: Iterable, raw: bool = False, page_size: int = 1000) -> None:
+    """每 ``page_size`` 个元素格式化一次并整块写出，不逐条输出。"""
+    from itertools import islice
 
+    from .output import OutputFormat, OutputWriter
 
-def iter_to_console(items: Iterable) -> None:
-    for item in items:
-        typer.echo(decode_value(item))
+    iterator = iter(items)
+    with OutputWriter(fmt=OutputFormat.raw if raw else OutputFormat.text) as out:
+        while True:
+            page = list(islice(iterator, page_size))
+            if not page:
+                return
+            if raw:
+                out.write_page(page)
+            else:
+                out.write_lines(str(decode_value(item)) for item in page)
 
 
-__all__ = ["decode_value", "execute_raw", "print_response", "iter_to_console"]
+__all__ = [
+    "decode_value",
+    "escape_bytes",
+    "execute_command_reply",
+    "execute_raw",
+    "format_response",
+    "iter_to_console",
+    "print_response",
+    "render_bytes",
+]
 
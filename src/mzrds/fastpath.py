@@ -0,0 +1,145 @@
+"""
+mzrds 的命令行入口。
+
+``exec`` 是脚本里调用最频繁的命令，这里为它提供一个不加载 typer 的快速路径：
+只识别常用的全局连接参数，能经本地代理转发时连 redis-py 也不导入。
+遇到任何无法识别的参数（包括 --help）都交给完整的 typer 应用处理，
+以保证行为和错误提示与常规路径一致。
+"""
+from __future__ import annotations
+
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 需要取值的全局参数 -> (字段名, 类型)
+_VALUE_OPTIONS = {
+    "--use": ("use", str),
+    "-U": ("use", str),
+    "--host": ("host", str),
+    "-h": ("host", str),
+    "--port": ("port", int),
+    "-p": ("port", int),
+    "--password": ("password", str),
+    "-a": ("password", str),
+    "--user": ("username", str),
+    "--db": ("db", int),
+    "-n": ("db", int),
+    "--uri": ("uri", str),
+    "-u": ("uri", str),
+    "--cacert": ("cacert", str),
+    "--cert": ("cert", str),
+    "--key": ("key", str),
+    "--socket-timeout": ("socket_timeout", float),
+    "--connect-timeout": ("socket_connect_timeout", float),
+    "--health-check": ("health_check_interval", float),
+    "--max-connections": ("max_connections", int),
+    "--retries": ("retries", int),
+    "--retry-backoff": ("retry_backoff", float),
+}
+
+# 与 typer 选项的 min= 一致；超出范围时交给 typer 给出相同的用法错误
+_MINIMUMS = {
+    "socket_timeout": 0,
+    "socket_connect_timeout": 0,
+    "health_check_interval": 0,
+    "max_connections": 1,
+    "retries": 0,
+    "retry_backoff": 0,
+}
+
+_FLAG_OPTIONS = {
+    "--tls": ("tls", True),
+    "--no-tls": ("tls", False),
+    "--cluster": ("cluster", True),
+    "--no-cluster": ("cluster", False),
+    "--keepalive": ("socket_keepalive", True),
+    "--no-keepalive": ("socket_keepalive", False),
+    "--no-agent": ("no_agent", True),
+}
+
+
+def parse_exec_argv(argv: Sequence[str]) -> Optional[Tuple[Dict[str, object], List[str]]]:
+    """
+    解析 ``[全局参数...] exec COMMAND...``。
+
+    返回 ``(参数, 命令)``；不是可走快速路径的调用时返回 None。
+    """
+    values: Dict[str, object] = {}
+    idx = 0
+    while idx < len(argv):
+        arg = argv[idx]
+        if arg == "exec":
+            command = list(argv[idx + 1:])
+            # exec 自身的选项（--batch、--output、--help 等）交给 typer；
+            # 命令名之后以 - 开头的是命令参数（如 lrange key 0 -1）
+            if not command or command[0].startswith("-"):
+                return None
+            return values, command
+        name, _, inline = arg.partition("=")
+        if name in _VALUE_OPTIONS:
+            field, convert = _VALUE_OPTIONS[name]
+            if not inline:
+                idx += 1
+                if idx >= len(argv):
+                    return None
+                inline = argv[idx]
+            try:
+                value = convert(inline)
+            except ValueError:
+                return None
+            minimum = _MINIMUMS.get(field)
+            if minimum is not None and not value >= minimum:
+                return None
+            values[field] = value
+        elif arg in _FLAG_OPTIONS:
+            field, flag = _FLAG_OPTIONS[arg]
+            values[field] = flag
+        else:
+            return None
+        idx += 1
+    return None
+
+
+def _run_exec(values: Dict[str, object], command: List[str]) -> bool:
+    from mzrds.config import ConfigStore, merge_options
+
+    store = ConfigStore()
+    use = values.pop("use", None)
+    no_agent = values.pop("no_agent", False)
+    profile_name = use or store.get_current()
+    base = store.get_profile(profile_name) if profile_name else None
+    if use and base is None:
+        return False
+    options = merge_options(base, values)
+
+    from mzrds.agent import connect_agent, needs_direct_connection
+    from mzrds.executor import execute_command_reply, print_response
+
+    from mzrds.client import get_client
+
+    direct = no_agent or needs_direct_connection(command)
+    client = None if direct else connect_agent(options, fallback=lambda: get_client(options))
+    if client is None:
+        client = get_client(options)
+    try:
+        response = execute_command_reply(client, command)
+        print_response(response)
+    finally:
+        client.close()
+    if isinstance(response, Exception):
+        sys.exit(1)
+    return True
+
+
+def run(argv: Optional[Sequence[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parsed = parse_exec_argv(argv)
+    if parsed is not None and _run_exec(*parsed):
+        return
+    from mzrds.cli import app
+
+    app(args=argv, prog_name="mzrds")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,217 @@
+"""
+SCAN 之后在客户端执行的 key 过滤。
+
+MATCH / TYPE 由服务端处理；正则、TTL 范围、大小与空闲时间这些 SCAN 表达
+不了的条件由 ``KeyFilter`` 处理：正则在本地匹配，其余条件需要的 PTTL、
+MEMORY USAGE（或长度命令）、OBJECT IDLETIME 对每页只用一个 pipeline 查询。
+"""
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Tuple
+
+from .executor import decode_value
+
+# 类型 -> (长度命令, 单位)
+LENGTH_COMMANDS: Dict[str, Tuple[str, str]] = {
+    "string": ("STRLEN", "bytes"),
+    "list": ("LLEN", "items"),
+    "set": ("SCARD", "members"),
+    "zset": ("ZCARD", "members"),
+    "hash": ("HLEN", "fields"),
+    "stream": ("XLEN", "entries"),
+}
+
+SIZE_BY = ("memory", "length")
+
+Range = Tuple[Optional[int], Optional[int]]
+
+
+def key_types(client, keys: Sequence[bytes]) -> List[str]:
+    """用一个 pipeline 查询一页 key 的类型；已删除的 key 类型为 ``none``。"""
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.type(key)
+    return [decode_value(reply) for reply in pipe.execute()]
+
+
+async def _key_types_async(client, keys: Sequence[bytes]) -> List[str]:
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.type(key)
+    return [decode_value(reply) for reply in await pipe.execute()]
+
+
+def _in_range(value: float, bounds: Range) -> bool:
+    low, high = bounds
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def _check(reply) -> Any:
+    """WRONGTYPE（key 在两次查询之间换了类型）视为不匹配，其他错误直接抛出。"""
+    if isinstance(reply, Exception):
+        if str(reply).startswith("WRONGTYPE"):
+            return None
+        raise reply
+    return reply
+
+
+class IdleTimeUnavailable(ValueError):
+    """maxmemory-policy 为 LFU 时服务端不记录空闲时间，OBJECT IDLETIME 不可用。"""
+
+
+def _check_idle(reply) -> Any:
+    if isinstance(reply, Exception) and "LFU" in str(reply):
+        raise IdleTimeUnavailable(
+            "maxmemory-policy 为 LFU 时服务端不记录 key 的空闲时间，"
+            "无法使用 --min-idle / --max-idle"
+        ) from reply
+    return _check(reply)
+
+
+@dataclass
+class KeyFilter:
+    """
+    客户端过滤条件，可直接作为 ``iter_scan_pages`` 的 ``process`` 回调。
+
+    TTL 与空闲时间以秒为单位，没有过期时间的 key 视为 TTL 无穷大。
+    ``size_by="memory"`` 按 MEMORY USAGE 字节数比较；``"length"`` 按
+    STRLEN / HLEN / LLEN 等长度比较，若未指定 ``type_`` 需要先多查一次 TYPE。
+    """
+
+    regex: Optional[Pattern[bytes]] = None
+    ttl: Range = (None, None)
+    size: Range = (None, None)
+    size_by: str = "memory"
+    idle: Range = (None, None)
+    type_: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if self.size_by not in SIZE_BY:
+            raise ValueError(f"未知的大小度量: {self.size_by}，可选 {', '.join(SIZE_BY)}")
+        if self.size_by == "length" and self.type_ and self.type_ not in LENGTH_COMMANDS:
+            raise ValueError(f"{self.type_} 类型没有长度命令，请改用 --size-by memory")
+
+    @classmethod
+    def build(
+        cls,
+        regex: Optional[str] = None,
+        ttl: Range = (None, None),
+        size: Range = (None, None),
+        size_by: str = "memory",
+        idle: Range = (None, None),
+        type_: Optional[str] = None,
+    ) -> Optional["KeyFilter"]:
+        """根据命令行参数构造过滤器；没有任何客户端条件时返回 None。"""
+        try:
+            pattern = re.compile(regex.encode()) if regex else None
+        except re.error as exc:
+            raise ValueError(f"无效的正则表达式: {exc}") from exc
+        key_filter = cls(pattern, ttl, size, size_by, idle, type_)
+        return key_filter if key_filter.active else None
+
+    @property
+    def _ttl(self) -> bool:
+        return self.ttl != (None, None)
+
+    @property
+    def _size(self) -> bool:
+        return self.size != (None, None)
+
+    @property
+    def _idle(self) -> bool:
+        return self.idle != (None, None)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.regex) or self._ttl or self._size or self._idle
+
+    @property
+    def _needs_types(self) -> bool:
+        return self._size and self.size_by == "length" and not self.type_
+
+    def describe(self) -> Dict[str, Any]:
+        """可序列化的条件描述，用于检查点校验。"""
+        return {
+            "regex": self.regex.pattern.decode() if self.regex else None,
+            "ttl": list(self.ttl),
+            "size": list(self.size),
+            "size_by": self.size_by,
+            "idle": list(self.idle),
+        }
+
+    def _candidates(self, keys: Sequence[bytes]) -> List[bytes]:
+        if not self.regex:
+            return list(keys)
+        return [key for key in keys if self.regex.search(key)]
+
+    def _queue(self, pipe, keys: Sequence[bytes], types: Optional[List[str]]) -> List[bytes]:
+        """把每个 key 需要的查询放进 pipeline，返回实际排队的 key。"""
+        queued = []
+        for idx, key in enumerate(keys):
+            if self._size and self.size_by == "length":
+                type_ = types[idx] if types else self.type_
+                if type_ not in LENGTH_COMMANDS:
+                    continue
+                pipe.execute_command(LENGTH_COMMANDS[type_][0], key)
+            elif self._size:
+                pipe.memory_usage(key)
+            if self._ttl:
+                pipe.pttl(key)
+            if self._idle:
+                pipe.object("idletime", key)
+            queued.append(key)
+        return queued
+
+    def _select(self, keys: Sequence[bytes], replies: Sequence) -> List[bytes]:
+        width = self._size + self._ttl + self._idle
+        matched = []
+        for idx, key in enumerate(keys):
+            row = iter(replies[idx * width:(idx + 1) * width])
+            if self._size:
+                size = _check(next(row))
+                if size is None or not _in_range(size, self.size):
+                    continue
+            if self._ttl:
+                pttl = _check(next(row))
+                if pttl is None or pttl == -2:
+                    continue
+                ttl = math.inf if pttl == -1 else pttl / 1000
+                if not _in_range(ttl, self.ttl):
+                    continue
+            if self._idle:
+                idle = _check_idle(next(row))
+                if idle is None or not _in_range(idle, self.idle):
+                    continue
+            matched.append(key)
+        return matched
+
+    def __call__(self, client, keys: Sequence[bytes]) -> List[bytes]:
+        keys = self._candidates(keys)
+        if not keys or not (self._size or self._ttl or self._idle):
+            return keys
+        types = key_types(client, keys) if self._needs_types else None
+        pipe = client.pipeline(transaction=False)
+        queued = self._queue(pipe, keys, types)
+        return self._select(queued, pipe.execute(raise_on_error=False))
+
+    async def filter_async(self, client, keys: Sequence[bytes]) -> List[bytes]:
+        """``__call__`` 的 redis.asyncio 版本。"""
+        keys = self._candidates(keys)
+        if not keys or not (self._size or self._ttl or self._idle):
+            return keys
+        types = await _key_types_async(client, keys) if self._needs_types else None
+        pipe = client.pipeline(transaction=False)
+        queued = self._queue(pipe, keys, types)
+        return self._select(queued, await pipe.execute(raise_on_error=False))
+
+
+__all__ = [
+    "IdleTimeUnavailable",
+    "KeyFilter",
+    "LENGTH_COMMANDS",
+    "SIZE_BY",
+    "key_types",
+]
@@ -0,0 +1,117 @@
+"""
+INFO 的解析与增量计算（``mzrds top``）。
+
+``parse_info`` 逐行扫描 INFO 的原始回复，只保留计算速率需要的字段与
+各库的 key 数，不构造完整的字典；``compute_rates`` 用前后两次采样的差值
+算出每秒的命令数、网络流量、淘汰与过期数以及区间命中率。
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+# 单调递增的计数器，按差值计算每秒速率
+COUNTERS = (
+    "total_commands_processed",
+    "keyspace_hits",
+    "keyspace_misses",
+    "total_net_input_bytes",
+    "total_net_output_bytes",
+    "evicted_keys",
+    "expired_keys",
+    "total_connections_received",
+    "rejected_connections",
+)
+# 按当前值显示的指标
+GAUGES = (
+    "connected_clients",
+    "blocked_clients",
+    "used_memory",
+    "used_memory_rss",
+    "mem_fragmentation_ratio",
+    "uptime_in_seconds",
+)
+_NUMERIC = frozenset(name.encode() for name in COUNTERS + GAUGES)
+
+InfoSample = Dict[str, Any]
+
+
+def _raw_reply(response, **options):
+    return response
+
+
+def raw_info(client, section: str = "all") -> bytes:
+    """
+    执行 INFO 并返回未解析的原始回复。
+
+    redis-py 默认把 INFO 解析成包含所有字段的嵌套字典，这里在该客户端上
+    换成原样返回的回调，交给 ``parse_info`` 只提取需要的字段。
+    """
+    client.set_response_callback("INFO", _raw_reply)
+    reply = client.execute_command("INFO", section)
+    return reply.encode() if isinstance(reply, str) else reply
+
+
+def parse_info(raw: bytes) -> InfoSample:
+    """提取 ``COUNTERS`` / ``GAUGES`` 中的数值、``role`` 以及所有库的 key 与 expires 总数。"""
+    sample: InfoSample = {"keys": 0, "expires": 0}
+    for line in raw.splitlines():
+        if not line or line[:1] == b"#":
+            continue
+        name, _, value = line.partition(b":")
+        if name in _NUMERIC:
+            try:
+                sample[name.decode()] = float(value)
+            except ValueError:
+                continue
+        elif name == b"role":
+            sample["role"] = value.decode()
+        elif name[:2] == b"db" and name[2:].isdigit():
+            # db0:keys=1,expires=0,avg_ttl=0
+            for item in value.split(b","):
+                field, _, number = item.partition(b"=")
+                if field in (b"keys", b"expires"):
+                    sample[field.decode()] += int(number)
+    return sample
+
+
+def _delta(previous: InfoSample, current: InfoSample, name: str) -> float:
+    before, after = previous.get(name, 0.0), current.get(name, 0.0)
+    # 计数器变小说明实例重启或执行了 CONFIG RESETSTAT，从 0 开始算
+    return after - before if after >= before else after
+
+
+def compute_rates(
+    previous: InfoSample, current: InfoSample, elapsed: float
+) -> Dict[str, Optional[float]]:
+    """两次采样之间的每秒速率；命中率为区间内 hits / (hits + misses)，没有查找时为 None。"""
+    elapsed = max(elapsed, 1e-9)
+    hits = _delta(previous, current, "keyspace_hits")
+    misses = _delta(previous, current, "keyspace_misses")
+    used = current.get("used_memory", 0.0)
+    fragmentation = current.get("mem_fragmentation_ratio")
+    if fragmentation is None and used:
+        fragmentation = current.get("used_memory_rss", 0.0) / used
+    return {
+        "ops_per_sec": _delta(previous, current, "total_commands_processed") / elapsed,
+        "hit_ratio": hits / (hits + misses) if hits + misses else None,
+        "net_in_per_sec": _delta(previous, current, "total_net_input_bytes") / elapsed,
+        "net_out_per_sec": _delta(previous, current, "total_net_output_bytes") / elapsed,
+        "evicted_per_sec": _delta(previous, current, "evicted_keys") / elapsed,
+        "expired_per_sec": _delta(previous, current, "expired_keys") / elapsed,
+        "connections_per_sec": _delta(previous, current, "total_connections_received") / elapsed,
+        "used_memory": used,
+        "fragmentation": fragmentation,
+        "connected_clients": current.get("connected_clients", 0.0),
+        "blocked_clients": current.get("blocked_clients", 0.0),
+        "keys": current["keys"],
+    }
+
+
+__all__ = [
+    "COUNTERS",
+    "GAUGES",
+    "InfoSample",
+    "compute_rates",
+    "parse_info",
+    "raw_info",
+]
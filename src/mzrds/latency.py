@@ -0,0 +1,150 @@
+"""
+延迟监控，对应 redis-cli 的 --latency / --latency-history / --latency-dist。
+
+每个节点一个线程，按固定间隔发送 PING（或指定的命令），把往返时间记入
+``LatencyHistogram``；主线程按窗口调用 ``take`` 取走各节点的直方图并清零。
+Cluster 下所有节点（含副本）同时探测：只有个别节点变慢多半是该节点的
+服务端卡顿（慢命令、fork、换页），所有节点一起变慢则更可能是网络或客户端所在的宿主机。
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import LatencyHistogram
+
+DEFAULT_INTERVAL = 0.01
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+@dataclass
+class LatencySnapshot:
+    """一个节点在一段时间内的延迟统计（直方图单位为微秒）。"""
+
+    node: str
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def merge(self, other: "LatencySnapshot") -> None:
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+        self.elapsed += other.elapsed
+
+    def to_dict(self, dist: bool = False) -> Dict[str, Any]:
+        """JSON 输出用的字典，延迟单位为毫秒。"""
+        hist = self.histogram
+
+        def ms(micros: float) -> Optional[float]:
+            # 窗口内没有成功的样本（全部超时或出错）时延迟字段为 null
+            return round(micros / 1000, 3) if hist.count else None
+
+        data: Dict[str, Any] = {
+            "node": self.node,
+            "samples": hist.count,
+            "errors": self.errors,
+            "window": round(self.elapsed, 3),
+            "min_ms": ms(hist.min),
+            "avg_ms": ms(hist.mean),
+            "max_ms": ms(hist.max),
+        }
+        for percent in PERCENTILES:
+            data[f"p{percent:g}_ms".replace(".", "")] = ms(hist.percentile(percent))
+        if dist:
+            data["dist"] = [[upper / 1000, count] for upper, count in hist.rows()]
+        return data
+
+
+class LatencyProbe:
+    """在单个节点上按间隔重复执行命令并记录延迟。"""
+
+    def __init__(
+        self,
+        name: str,
+        client,
+        command: Sequence[str] = ("PING",),
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        self.name = name
+        self.client = client
+        self.command = list(command)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._window = LatencySnapshot(name)
+        self._since = time.monotonic()
+
+    def run(self, stop: threading.Event) -> None:
+        from redis.exceptions import RedisError
+
+        while not stop.is_set():
+            started = time.perf_counter()
+            failed = False
+            try:
+                self.client.execute_command(*self.command)
+            except RedisError:
+                # 超时和连接错误同样记录耗时，卡顿期间的样本不能丢
+                failed = True
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._window.histogram.record(elapsed * 1_000_000)
+                self._window.errors += failed
+            stop.wait(max(self.interval - elapsed, 0))
+
+    def take(self) -> LatencySnapshot:
+        """取走上次调用以来的统计并开始新的窗口。"""
+        now = time.monotonic()
+        with self._lock:
+            snapshot, self._window = self._window, LatencySnapshot(self.name)
+            snapshot.elapsed, self._since = now - self._since, now
+        return snapshot
+
+
+class LatencyMonitor:
+    """为每个节点启动一个探测线程。"""
+
+    def __init__(
+        self,
+        nodes: Sequence[Tuple[str, Any]],
+        command: Optional[Sequence[str]] = None,
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        self.probes = [
+            LatencyProbe(name, client, command or ("PING",), interval) for name, client in nodes
+        ]
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        for probe in self.probes:
+            thread = threading.Thread(
+                target=probe.run, args=(self._stop,), name=f"latency-{probe.name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def take(self) -> List[LatencySnapshot]:
+        return [probe.take() for probe in self.probes]
+
+    def stop(self) -> None:
+        self._stop.set()
+        # 卡在没有超时设置的连接上的线程不等待（守护线程随进程退出）
+        deadline = time.monotonic() + 1.0
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+    def __enter__(self) -> "LatencyMonitor":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+__all__ = [
+    "DEFAULT_INTERVAL",
+    "LatencyMonitor",
+    "LatencyProbe",
+    "LatencySnapshot",
+]
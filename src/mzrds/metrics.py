@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class TopK:
+    """只保留分值最大的 k 个元素的有界最小堆。"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[float, int, Any]] = []
+        # 分值相同时按插入顺序比较，避免比较元素本身
+        self._seq = itertools.count()
+
+    def push(self, score: float, item: Any) -> None:
+        if self.k <= 0:
+            return
+        entry = (score, next(self._seq), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif score > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def merge(self, other: "TopK") -> None:
+        for score, item in other.items():
+            self.push(score, item)
+
+    def items(self) -> List[Tuple[float, Any]]:
+        """按分值从大到小返回 ``[(分值, 元素), ...]``。"""
+        return [(score, item) for score, _, item in sorted(self._heap, reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class SizeDistribution:
+    """按 2 的幂分桶统计大小分布，内存占用与样本数无关。"""
+
+    def __init__(self):
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, size: int) -> None:
+        bucket = max(size - 1, 0).bit_length()
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += size
+        if size > self.max:
+            self.max = size
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def rows(self) -> List[Tuple[int, int]]:
+        """返回 ``[(桶上限, 数量), ...]``，桶上限为 2 的幂，按从小到大排列。"""
+        return [(1 << bucket, self._buckets[bucket]) for bucket in sorted(self._buckets)]
+
+
+class LatencyHistogram:
+    """
+    HDR 风格的延迟直方图（单位：微秒）。
+
+    按 2 的幂分段、每段再线性细分 ``2 ** (precision - 1)`` 个桶，
+    相对误差不超过 ``2 ** -(precision - 1)``（默认约 1.6%），
+    内存占用只与数值范围有关；多个线程各自记录后再 ``merge``。
+    """
+
+    def __init__(self, precision: int = 7):
+        self.precision = precision
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def _bucket(self, value: int) -> int:
+        shift = max(value.bit_length() - self.precision, 0)
+        # 以桶内最大值作为桶的代表值，与 HdrHistogram 的 highest equivalent 一致
+        return value | ((1 << shift) - 1)
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(int(value), 0)
+        bucket = self._bucket(value)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += count
+        self.total += value * count
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for bucket, count in other._buckets.items():
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + count
+        if other.count:
+            self.min = min(self.min, other.min) if self.count else other.min
+            self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> int:
+        """返回第 ``percent`` 百分位（0-100）的值，不超过记录到的最大值。"""
+        if not self.count:
+            return 0
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(bucket, self.max)
+        return self.max
+
+    def rows(self) -> List[Tuple[int, int]]:
+        """按 2 的幂合并桶，返回 ``[(桶上限, 数量), ...]``，与 ``SizeDistribution.rows`` 一致。"""
+        merged: Dict[int, int] = {}
+        for bucket, count in self._buckets.items():
+            power = bucket.bit_length()
+            merged[power] = merged.get(power, 0) + count
+        return [(1 << power, merged[power]) for power in sorted(merged)]
+
+
+class PrefixNode:
+    """前缀树的一个节点，累计该前缀下所有 key 的数量、内存与 TTL。"""
+
+    __slots__ = ("count", "memory", "expiring", "ttl", "children")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.memory = 0
+        self.expiring = 0
+        self.ttl = 0.0
+        self.children: Dict[bytes, "PrefixNode"] = {}
+
+    @property
+    def mean_ttl(self) -> float:
+        return self.ttl / self.expiring if self.expiring else 0.0
+
+
+class PrefixTree:
+    """
+    按分隔符把 key 切成前 ``depth`` 段，逐段累计到前缀树中。
+
+    每个节点最多保留 ``max_children`` 个子节点，之后出现的新前缀并入
+    ``*`` 节点，用户 ID 这类高基数的段不会让内存无限增长。
+    """
+
+    OTHER = b"*"
+
+    def __init__(self, depth: int = 2, sep: bytes = b":", max_children: int = 1000):
+        self.depth = depth
+        self.sep = sep
+        self.max_children = max_children
+        self.root = PrefixNode()
+
+    def add(
+        self, key: bytes, memory: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
+        """``ttl`` 为剩余秒数，None 表示没有过期时间（或未查询）。"""
+        node = self.root
+        path = [node]
+        for segment in key.split(self.sep, self.depth)[: self.depth]:
+            children = node.children
+            child = children.get(segment)
+            if child is None:
+                if len(children) >= self.max_children:
+                    segment = self.OTHER
+                    child = children.get(segment)
+                if child is None:
+                    child = children[segment] = PrefixNode()
+            node = child
+            path.append(node)
+        for node in path:
+            node.count += 1
+            if memory:
+                node.memory += memory
+            if ttl is not None:
+                node.expiring += 1
+                node.ttl += ttl
+
+    def walk(
+        self, top: int, by_memory: bool = False
+    ) -> Iterator[Tuple[int, bytes, PrefixNode]]:
+        """深度优先产出 ``(层级, 前缀, 节点)``，每层只取最大的 ``top`` 个子节点。"""
+
+        def weight(item: Tuple[bytes, PrefixNode]) -> tuple:
+            node = item[1]
+            return (node.memory, node.count) if by_memory else (node.count, node.memory)
+
+        def visit(node: PrefixNode, prefix: bytes, level: int):
+            children = sorted(node.children.items(), key=weight, reverse=True)[:top]
+            for segment, child in children:
+                path = prefix + self.sep + segment if prefix else segment
+                yield level, path, child
+                yield from visit(child, path, level + 1)
+
+        yield from visit(self.root, b"", 0)
+
+
+class HeavyHitters:
+    """
+    有界内存的高频元素计数（Misra-Gries）。
+
+    条目数超过 ``2 * capacity`` 时把所有计数减去第 ``capacity + 1`` 大的计数，
+    删除不再为正的条目；每次整理的代价分摊到之前的插入上。``offset`` 为累计
+    减去的量：元素的真实次数在 ``[计数, 计数 + offset]`` 之间，出现次数超过
+    总数 ``1 / (capacity + 1)`` 的元素一定会被保留。
+    """
+
+    def __init__(self, capacity: int = 10000):
+        self.capacity = max(capacity, 1)
+        self.total = 0
+        self.offset = 0
+        self._counts: Dict[Any, int] = {}
+
+    def add(self, item: Any, count: int = 1) -> None:
+        counts = self._counts
+        counts[item] = counts.get(item, 0) + count
+        self.total += count
+        if len(counts) > 2 * self.capacity:
+            self._prune()
+
+    def _prune(self) -> None:
+        threshold = heapq.nlargest(self.capacity + 1, self._counts.values())[-1]
+        self.offset += threshold
+        self._counts = {
+            item: count - threshold
+            for item, count in self._counts.items()
+            if count > threshold
+        }
+
+    def top(self, n: int) -> List[Tuple[Any, int]]:
+        """按计数从大到小返回 ``[(元素, 计数), ...]``。"""
+        return heapq.nlargest(n, self._counts.items(), key=lambda item: item[1])
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+__all__ = [
+    "HeavyHitters",
+    "LatencyHistogram",
+    "PrefixNode",
+    "PrefixTree",
+    "SizeDistribution",
+    "TopK",
+    "format_bytes",
+]
@@ -0,0 +1,360 @@
+"""
+跨实例迁移 key。
+
+流水线分三段，段与段之间是有界队列，任何一段变慢都会让上游阻塞，
+内存占用只取决于队列长度而与 key 总数无关::
+
+    扫描线程 --页--> 读取线程 x N --记录--> 写入线程 x M
+    (SCAN)           (DUMP + PTTL)          (RESTORE)
+
+原生模式下读取线程直接在源端执行 ``MIGRATE ... COPY ... KEYS``，数据由
+源实例直接发给目标实例，不经过本机，也就没有写入阶段。
+
+同一节点的页可能乱序完成，只有某页之前的页全部写完，才把该页之后的游标
+提交到检查点，因此从检查点恢复时不会漏掉 key（可能重复迁移少量 key，
+RESTORE REPLACE 下是幂等的）。
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .checkpoint import Checkpoint
+from .dump import Record, dump_keys, restore_records
+from .scanner import group_by_slot, is_cluster, iter_scan_pages, primary_clients
+
+_POLL = 0.1
+
+ErrorHandler = Callable[[bytes, Exception], None]
+
+
+@dataclass
+class NativeTarget:
+    """原生 MIGRATE 的目标地址，必须是源实例能直接访问到的单机实例。"""
+
+    host: str
+    port: int
+    db: int = 0
+    username: Optional[str] = None
+    password: Optional[str] = None
+    timeout: int = 5000
+
+    def command(self, keys: Sequence[bytes], replace: bool) -> List:
+        args: List = ["MIGRATE", self.host, self.port, "", self.db, self.timeout, "COPY"]
+        if replace:
+            args.append("REPLACE")
+        if self.password is not None:
+            if self.username:
+                args += ["AUTH2", self.username, self.password]
+            else:
+                args += ["AUTH", self.password]
+        return args + ["KEYS", *keys]
+
+
+@dataclass
+class MigrateStats:
+    scanned: int = 0
+    migrated: int = 0
+    skipped: int = 0
+    errors: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.migrated / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class _Page:
+    node: str
+    seq: int
+    cursor: int
+    keys: List[bytes]
+    records: List[Record] = field(default_factory=list)
+    counts: Counter = field(default_factory=Counter)
+
+
+class _CursorTracker:
+    """按节点记录页的完成情况，连续完成的页才推进该节点的已提交游标。"""
+
+    def __init__(self, on_commit: Callable[[str, int, Counter], None]):
+        self._on_commit = on_commit
+        self._lock = threading.Lock()
+        self._issued: Dict[str, int] = {}
+        self._next: Dict[str, int] = {}
+        self._done: Dict[str, Dict[int, tuple]] = {}
+
+    def issue(self, node: str) -> int:
+        with self._lock:
+            seq = self._issued.get(node, 0)
+            self._issued[node] = seq + 1
+            return seq
+
+    def complete(self, node: str, seq: int, cursor: int, counts: Counter) -> None:
+        with self._lock:
+            done = self._done.setdefault(node, {})
+            done[seq] = (cursor, counts)
+            expected = self._next.get(node, 0)
+            if expected not in done:
+                return
+            total: Counter = Counter()
+            while expected in done:
+                cursor, page_counts = done.pop(expected)
+                total.update(page_counts)
+                expected += 1
+            self._next[node] = expected
+            # 在锁内回调，保证同一节点的游标按顺序提交
+            self._on_commit(node, cursor, total)
+
+
+class Migration:
+    def __init__(
+        self,
+        source,
+        target=None,
+        match: str = "*",
+        count: int = 500,
+        readers: int = 4,
+        writers: int = 4,
+        queue_size: int = 16,
+        replace: bool = True,
+        native: Optional[NativeTarget] = None,
+        parallelism: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        on_error: Optional[ErrorHandler] = None,
+    ):
+        if native is None and target is None:
+            raise ValueError("非原生模式需要目标客户端")
+        self.source = source
+        self.target = target
+        self.match = match
+        self.count = count
+        self.readers = readers
+        self.writers = 0 if native else writers
+        self.replace = replace
+        self.native = native
+        self.parallelism = parallelism
+        self.checkpoint = checkpoint
+        self.on_error = on_error
+        self.stats = MigrateStats()
+        self._source_cluster = is_cluster(source)
+        self._nodes = dict(primary_clients(source))
+        if checkpoint:
+            checkpoint.track(self._nodes)
+        self._pages: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._records: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._tracker = _CursorTracker(self._commit)
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._failure: Optional[BaseException] = None
+
+    # ---- 线程间通信 ----
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=_POLL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue):
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL)
+            except queue.Empty:
+                continue
+        return None
+
+    def _guard(self, func: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                func()
+            except BaseException as exc:  # 交给主线程重新抛出
+                if self._failure is None:
+                    self._failure = exc
+                self._stop.set()
+
+        return run
+
+    # ---- 三个阶段 ----
+
+    def _produce(self) -> None:
+        resume = self.checkpoint.resume if self.checkpoint else None
+        pages = iter_scan_pages(
+            self.source,
+            match=self.match,
+            count=self.count,
+            parallelism=self.parallelism,
+            resume=resume,
+        )
+        try:
+            for scanned in pages:
+                page = _Page(
+                    node=scanned.node,
+                    seq=self._tracker.issue(scanned.node),
+                    cursor=scanned.cursor,
+                    keys=scanned.keys,
+                )
+                page.counts["scanned"] = len(page.keys)
+                if not page.keys:
+                    self._complete(page)
+                elif not self._put(self._pages, page):
+                    return
+        finally:
+            pages.close()
+
+    def _read(self) -> None:
+        while True:
+            page = self._get(self._pages)
+            if page is None:
+                return
+            client = self._nodes[page.node]
+            if self.native:
+                self._migrate_native(client, page)
+                self._complete(page)
+                continue
+            page.records = dump_keys(client, page.keys, self._dump_error(page))
+            page.counts["skipped"] = (
+                len(page.keys) - len(page.records) - page.counts["errors"]
+            )
+            if not page.records:
+                self._complete(page)
+            elif not self._put(self._records, page):
+                return
+
+    def _write(self) -> None:
+        while True:
+            page = self._get(self._records)
+            if page is None:
+                return
+            replies = restore_records(self.target, page.records, self.replace)
+            for (key, _, value), reply in zip(page.records, replies):
+                if isinstance(reply, Exception):
+                    page.counts["errors"] += 1
+                    self._error(key, reply)
+                else:
+                    page.counts["migrated"] += 1
+                    page.counts["bytes"] += len(value)
+            page.records = []
+            self._complete(page)
+
+    def _migrate_native(self, client, page: _Page) -> None:
+        # Cluster 中一条 MIGRATE 的所有 key 必须属于同一个 slot。MIGRATE 只在
+        # 所有 key 都不存在时回复 NOKEY，因此先在同一个 pipeline 里用 EXISTS
+        # 数出仍存在的 key；COPY 不删除源 key，两者看到的是同一批 key。
+        groups = group_by_slot(page.keys) if self._source_cluster else [page.keys]
+        for keys in groups:
+            pipe = client.pipeline(transaction=False)
+            pipe.execute_command("EXISTS", *keys)
+            pipe.execute_command(*self.native.command(keys, self.replace))
+            existing, reply = pipe.execute(raise_on_error=False)
+            if isinstance(existing, Exception):
+                page.counts["errors"] += len(keys)
+                self._error(keys[0], existing)
+                continue
+            existing = min(existing, len(keys))
+            page.counts["skipped"] += len(keys) - existing
+            if isinstance(reply, Exception):
+                page.counts["errors"] += existing
+                self._error(keys[0], reply)
+            elif reply not in (b"NOKEY", "NOKEY"):
+                page.counts["migrated"] += existing
+
+    # ---- 计数与检查点 ----
+
+    def _error(self, key: bytes, exc: Exception) -> None:
+        if self.on_error:
+            self.on_error(key, exc)
+
+    def _dump_error(self, page: _Page) -> Callable[[bytes, Exception], None]:
+        def record(key: bytes, exc: Exception) -> None:
+            page.counts["errors"] += 1
+            self._error(key, exc)
+
+        return record
+
+    def _complete(self, page: _Page) -> None:
+        with self._stats_lock:
+            for name, value in page.counts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
+        self._tracker.complete(page.node, page.seq, page.cursor, page.counts)
+
+    def _commit(self, node: str, cursor: int, counts: Counter) -> None:
+        if self.checkpoint:
+            self.checkpoint.commit(node, cursor, counts)
+
+    # ---- 主流程 ----
+
+    def _wait(
+        self,
+        threads: Sequence[threading.Thread],
+        started: float,
+        report: Optional[Callable[[MigrateStats], None]],
+        interval: float,
+        last: List[float],
+    ) -> None:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=_POLL)
+                now = time.monotonic()
+                if report and now - last[0] >= interval:
+                    last[0] = now
+                    self.stats.elapsed = now - started
+                    report(self.stats)
+
+    def _broadcast(self, target: queue.Queue, count: int) -> None:
+        for _ in range(count):
+            if not self._put(target, None):
+                return
+
+    def run(
+        self,
+        report: Optional[Callable[[MigrateStats], None]] = None,
+        interval: float = 1.0,
+    ) -> MigrateStats:
+        """执行迁移并返回本次运行的统计；``report`` 每隔 ``interval`` 秒被调用一次。"""
+        producer = threading.Thread(target=self._guard(self._produce), name="mzrds-migrate-scan")
+        readers = [
+            threading.Thread(target=self._guard(self._read), name=f"mzrds-migrate-read-{idx}")
+            for idx in range(self.readers)
+        ]
+        writers = [
+            threading.Thread(target=self._guard(self._write), name=f"mzrds-migrate-write-{idx}")
+            for idx in range(self.writers)
+        ]
+        started = time.monotonic()
+        last = [started]
+        for thread in [producer, *readers, *writers]:
+            thread.daemon = True
+            thread.start()
+        try:
+            self._wait([producer], started, report, interval, last)
+            self._broadcast(self._pages, len(readers))
+            self._wait(readers, started, report, interval, last)
+            self._broadcast(self._records, len(writers))
+            self._wait(writers, started, report, interval, last)
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            self.stats.elapsed = time.monotonic() - started
+            if self.checkpoint:
+                # 只包含已完整写入的页，中断或出错时保存也是安全的
+                self.checkpoint.save()
+        if self._failure is not None:
+            raise self._failure
+        return self.stats
+
+
+__all__ = [
+    "MigrateStats",
+    "Migration",
+    "NativeTarget",
+]
@@ -0,0 +1,374 @@
+"""
+MONITOR 流的读取、解析与聚合（``mzrds monitor``）。
+
+``execute_command`` 只读一个回复，MONITOR 需要在独立连接上持续读取。
+``MonitorSession`` 为每个节点占用一个连接和一个读取线程，按批读取原始行；
+``parse_line`` 直接在字节上解析，参数中没有反斜杠时（绝大多数情况）只需
+一次 ``split``，有转义时才用正则逐个还原。``MonitorStats`` 用有界的
+``HeavyHitters`` 统计 key 前缀和客户端，长时间运行内存也不会增长。
+"""
+from __future__ import annotations
+
+import fnmatch
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .metrics import HeavyHitters
+
+# MONITOR 参数的转义方式与 redis-cli 相同（sdscatrepr）
+_ARG = re.compile(rb'"((?:[^"\\]|\\.)*)"', re.S)
+_ESCAPE = re.compile(rb"\\(x[0-9a-fA-F]{2}|.)", re.S)
+_UNESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"a": b"\a", b"b": b"\b"}
+
+# 所有参数都是 key 的命令
+_ALL_KEYS = frozenset(
+    b"MGET DEL UNLINK EXISTS TOUCH WATCH SINTER SUNION SDIFF PFCOUNT RENAME".split()
+)
+# 最后一个参数是超时的阻塞命令
+_ALL_BUT_LAST = frozenset(b"BLPOP BRPOP BZPOPMIN BZPOPMAX".split())
+# key 与值交替出现
+_PAIRS = frozenset(b"MSET MSETNX".split())
+# 参数中先给出 key 的个数
+_NUMKEYS = frozenset(b"EVAL EVALSHA EVAL_RO EVALSHA_RO FCALL FCALL_RO".split())
+# 子命令之后才是 key
+_SUBCOMMAND = frozenset(b"OBJECT MEMORY".split())
+# 没有 key 的命令
+_NO_KEYS = frozenset(
+    b"PING ECHO INFO SELECT AUTH HELLO CLIENT CONFIG COMMAND CLUSTER DBSIZE TIME "
+    b"SCAN KEYS RANDOMKEY MULTI EXEC DISCARD UNWATCH SCRIPT FUNCTION PUBLISH "
+    b"SPUBLISH SLOWLOG LATENCY FLUSHDB FLUSHALL READONLY READWRITE QUIT ROLE WAIT "
+    b"LASTSAVE SWAPDB".split()
+)
+
+
+@dataclass(slots=True)
+class MonitorEvent:
+    """MONITOR 输出的一行：时间戳、库号、客户端地址（或 lua / unix:路径）与命令参数。"""
+
+    time: float
+    db: int
+    client: bytes
+    args: List[bytes]
+    raw: bytes = b""
+
+    @property
+    def command(self) -> bytes:
+        return self.args[0].upper() if self.args else b""
+
+    def keys(self) -> List[bytes]:
+        return event_keys(self.args)
+
+
+def _unescape(match: "re.Match[bytes]") -> bytes:
+    code = match.group(1)
+    if len(code) == 3:
+        return bytes((int(code[1:], 16),))
+    return _UNESCAPES.get(code, code)
+
+
+def parse_args(body: bytes) -> List[bytes]:
+    """解析 ``"SET" "k" "v"`` 形式的参数列表。"""
+    if b"\\" not in body:
+        # 没有转义时参数内部不会出现引号，按分隔符切开即可
+        return body[1:-1].split(b'" "') if body else []
+    return [_ESCAPE.sub(_unescape, arg) for arg in _ARG.findall(body)]
+
+
+def parse_line(line: bytes) -> Optional[MonitorEvent]:
+    """
+    解析一行 MONITOR 输出，格式不符（例如开头的 ``OK``）时返回 None::
+
+        1700000000.123456 [0 127.0.0.1:52000] "SET" "user:1" "v"
+    """
+    stamp, _, rest = line.partition(b" ")
+    if rest[:1] != b"[":
+        return None
+    close = rest.find(b"] ")
+    if close < 0:
+        return None
+    db, _, client = rest[1:close].partition(b" ")
+    try:
+        return MonitorEvent(float(stamp), int(db), client, parse_args(rest[close + 2:]), line)
+    except ValueError:
+        return None
+
+
+def event_keys(args: Sequence[bytes]) -> List[bytes]:
+    """按常见命令的参数布局取出 key；未知命令取第一个参数。"""
+    if len(args) < 2:
+        return []
+    name = args[0].upper()
+    if name in _NO_KEYS:
+        return []
+    if name in _ALL_KEYS:
+        return list(args[1:])
+    if name in _ALL_BUT_LAST:
+        return list(args[1:-1])
+    if name in _PAIRS:
+        return list(args[1::2])
+    if name in _NUMKEYS:
+        try:
+            count = int(args[2]) if len(args) > 2 else 0
+        except ValueError:
+            return []
+        return list(args[3:3 + count])
+    if name in _SUBCOMMAND:
+        return list(args[2:3])
+    return [args[1]]
+
+
+def key_prefix(key: bytes, depth: int, sep: bytes = b":") -> bytes:
+    """key 的前 ``depth`` 段，``depth`` 为 0 时返回完整 key。"""
+    if depth <= 0:
+        return key
+    return sep.join(key.split(sep, depth)[:depth])
+
+
+@dataclass
+class MonitorFilter:
+    """按命令名、key 模式（Redis glob）与客户端地址过滤，多个条件同时满足才保留。"""
+
+    commands: Sequence[str] = ()
+    pattern: Optional[str] = None
+    clients: Sequence[str] = ()
+    _commands: frozenset = field(init=False, repr=False)
+    _pattern: Optional["re.Pattern[bytes]"] = field(init=False, repr=False)
+    _clients: Tuple[bytes, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._commands = frozenset(name.upper().encode() for name in self.commands)
+        self._pattern = (
+            re.compile(fnmatch.translate(self.pattern).encode(), re.S) if self.pattern else None
+        )
+        self._clients = tuple(client.encode() for client in self.clients)
+
+    @property
+    def active(self) -> bool:
+        return bool(self._commands or self._pattern or self._clients)
+
+    def _client_matches(self, client: bytes) -> bool:
+        # 只写 IP 时匹配该 IP 的所有端口
+        return any(
+            client == wanted or client.startswith(wanted + b":") for wanted in self._clients
+        )
+
+    def __call__(self, event: MonitorEvent) -> bool:
+        if self._clients and not self._client_matches(event.client):
+            return False
+        if self._commands and event.command not in self._commands:
+            return False
+        if self._pattern is not None:
+            return any(self._pattern.match(key) for key in event.keys())
+        return True
+
+    def keys(self, event: MonitorEvent) -> List[bytes]:
+        """事件中与 key 模式匹配的 key，没有模式时为全部 key。"""
+        keys = event.keys()
+        if self._pattern is None:
+            return keys
+        return [key for key in keys if self._pattern.match(key)]
+
+
+class MonitorStats:
+    """
+    一个窗口内的聚合：命令计数与有界的 key 前缀、客户端计数。
+
+    命令名的种类受服务端命令表限制，直接用字典计数；key 前缀和客户端
+    可能是高基数的，交给 ``HeavyHitters``，内存不超过 ``2 * capacity`` 个条目。
+    """
+
+    def __init__(self, depth: int = 2, sep: bytes = b":", capacity: int = 10000):
+        self.depth = depth
+        self.sep = sep
+        self.events = 0
+        self.commands: Dict[bytes, int] = {}
+        self.prefixes = HeavyHitters(capacity)
+        self.clients = HeavyHitters(capacity)
+
+    def add(self, event: MonitorEvent, keys: Optional[Sequence[bytes]] = None) -> None:
+        """``keys`` 为要计入前缀统计的 key，默认取事件中的全部 key。"""
+        self.events += 1
+        name = event.command
+        self.commands[name] = self.commands.get(name, 0) + 1
+        self.clients.add(event.client)
+        for key in event.keys() if keys is None else keys:
+            self.prefixes.add(key_prefix(key, self.depth, self.sep))
+
+    def top_commands(self, n: int) -> List[Tuple[bytes, int]]:
+        return sorted(self.commands.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+@dataclass
+class KeySample:
+    """MONITOR 采样期间各 key 的访问次数与各节点的命令数。"""
+
+    keys: HeavyHitters
+    nodes: Dict[str, int]
+    events: int = 0
+    elapsed: float = 0.0
+
+
+def sample_key_access(
+    nodes: Sequence[Tuple[str, Any]],
+    duration: float,
+    capacity: int = 10000,
+    matches: Optional[MonitorFilter] = None,
+) -> KeySample:
+    """
+    监听 ``duration`` 秒 MONITOR，统计每个 key 被访问的次数（``hotkeys`` 的回退方案）。
+
+    给出 ``matches`` 时只统计匹配的命令与 key；key 的计数有界，见 ``HeavyHitters``。
+    """
+    sample = KeySample(HeavyHitters(capacity), {name: 0 for name, _ in nodes})
+    started = time.monotonic()
+    with MonitorSession(nodes) as session:
+        for node, lines in session.batches(timeout=0.2):
+            if isinstance(lines, Exception):
+                raise lines
+            for line in lines:
+                event = parse_line(line)
+                if event is None or (matches is not None and not matches(event)):
+                    continue
+                sample.events += 1
+                sample.nodes[node] += 1
+                for key in event.keys() if matches is None else matches.keys(event):
+                    sample.keys.add(key)
+            if time.monotonic() - started >= duration:
+                break
+    sample.elapsed = time.monotonic() - started
+    return sample
+
+
+class MonitorStream:
+    """在一个节点的独立连接上执行 MONITOR，按批读取原始行。"""
+
+    def __init__(self, name: str, client):
+        self.name = name
+        self.client = client
+        self._connection = None
+
+    def open(self) -> None:
+        from redis.exceptions import RedisError
+
+        connection = self.client.connection_pool.get_connection()
+        self._connection = connection
+        connection.send_command("MONITOR")
+        reply = connection.read_response()
+        if reply not in (b"OK", "OK"):
+            raise RedisError(f"MONITOR failed: {reply!r}")
+
+    def read(self, timeout: float, limit: int = 1000) -> List[bytes]:
+        """等待最多 ``timeout`` 秒，返回已到达的行（最多 ``limit`` 行）。"""
+        connection = self._connection
+        lines: List[bytes] = []
+        if not connection.can_read(timeout):
+            return lines
+        while len(lines) < limit:
+            lines.append(connection.read_response(disable_decoding=True))
+            if not connection.can_read(0):
+                break
+        return lines
+
+    def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            # MONITOR 状态的连接不能复用，断开后再归还
+            connection.disconnect()
+            self.client.connection_pool.release(connection)
+
+
+class StreamSession:
+    """
+    每个流一个读取线程，读到的回复按批放入有界队列，由调用方在主线程解析。
+
+    流需要提供 ``name``、``open()``、``read(timeout)`` 与 ``close()``。队列满时
+    读取线程阻塞，积压留在服务端的输出缓冲区中，超过 ``client-output-buffer-limit``
+    时由服务端断开该连接，不会拖垮实例。
+    """
+
+    def __init__(self, streams: Sequence[Any], max_batches: int = 1000):
+        self.streams = list(streams)
+        self._queue: "queue.Queue[Tuple[str, Any]]" = queue.Queue(max_batches)
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def _run(self, stream) -> None:
+        from redis.exceptions import RedisError
+
+        try:
+            while not self._stop.is_set():
+                replies = stream.read(0.2)
+                if replies:
+                    self._queue.put((stream.name, replies))
+        except (RedisError, OSError) as exc:
+            if not self._stop.is_set():
+                self._queue.put((stream.name, exc))
+
+    def start(self) -> None:
+        for stream in self.streams:
+            stream.open()
+        for stream in self.streams:
+            thread = threading.Thread(
+                target=self._run, args=(stream,), name=f"stream-{stream.name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def batches(self, timeout: float) -> Iterator[Tuple[Optional[str], Any]]:
+        """
+        产出 ``(流名称, 回复列表)``；读取出错时回复列表换成异常对象。
+
+        ``timeout`` 秒内没有数据时产出 ``(None, [])``，调用方借此按时间刷新窗口。
+        """
+        while True:
+            try:
+                yield self._queue.get(timeout=timeout)
+            except queue.Empty:
+                yield None, []
+
+    def stop(self) -> None:
+        self._stop.set()
+        # 队列已满时读取线程阻塞在 put 上，不等待（守护线程随进程退出）
+        deadline = time.monotonic() + 1.0
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        for stream in self.streams:
+            stream.close()
+
+    def __enter__(self) -> "StreamSession":
+        try:
+            self.start()
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+class MonitorSession(StreamSession):
+    """每个节点一个 MONITOR 连接。"""
+
+    def __init__(self, nodes: Sequence[Tuple[str, Any]], max_batches: int = 1000):
+        super().__init__([MonitorStream(name, client) for name, client in nodes], max_batches)
+
+
+__all__ = [
+    "KeySample",
+    "MonitorEvent",
+    "MonitorFilter",
+    "MonitorSession",
+    "MonitorStats",
+    "MonitorStream",
+    "StreamSession",
+    "event_keys",
+    "key_prefix",
+    "parse_args",
+    "parse_line",
+    "sample_key_access",
+]
@@ -0,0 +1,527 @@
+"""
+批量输出层。
+
+逐条 ``typer.echo`` 在上千万个 key 时比 Redis 本身还慢，这里按页格式化、
+一次写入 ``sys.stdout.buffer``，并在缓冲区满或距上次刷新超过
+``FLUSH_INTERVAL`` 秒时才刷新；终端上则每页刷新，保证交互时及时可见。
+
+除默认的 redis-cli 风格文本外，还支持 json / jsonl / csv / raw / resp /
+binary 几种机器可读格式。编码器边遍历回复边写出片段，不会先构造一份解码后的
+副本，所以很大的 HGETALL / LRANGE 回复也只占用有界的额外内存。raw / resp /
+binary 完全不解码，超过缓冲区大小的 value 直接写入输出流，不再复制。
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+import math
+import sys
+import time
+from enum import Enum
+from typing import Any, BinaryIO, Iterable, Iterator, List, Optional, Sequence
+
+from .executor import decode_value, format_response
+from .resp import write_value
+
+DEFAULT_BUFFER_SIZE = 1 << 16
+FLUSH_INTERVAL = 1.0
+# 编码时每攒够这么多个片段就拼接写出一次
+_PIECES_PER_WRITE = 4096
+
+
+class OutputFormat(str, Enum):
+    text = "text"
+    json = "json"
+    jsonl = "jsonl"
+    csv = "csv"
+    raw = "raw"
+    resp = "resp"
+    binary = "binary"
+
+
+OUTPUT_HELP = (
+    "输出格式：text、json、jsonl、csv、raw、resp 或 binary"
+    "（单个值原样输出，多个元素以 NUL 结尾）"
+)
+
+_LIST_TYPES = (list, tuple, set, frozenset)
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
+def _raw_bytes(value):
+    if isinstance(value, _BYTES_TYPES):
+        return value
+    return str(value).encode("utf-8")
+
+
+def _text(value) -> str:
+    """JSON / CSV 需要文本：无法按 UTF-8 解码的字节以 ``\\xNN`` 转义。"""
+    if isinstance(value, _BYTES_TYPES):
+        return str(value, "utf-8", "backslashreplace")
+    return str(value)
+
+
+def _json_scalar(value) -> str:
+    if isinstance(value, float) and not math.isfinite(value):
+        # JSON 没有 Infinity / NaN，按 Redis 的写法输出为字符串 "inf" / "-inf" / "nan"
+        return f'"{value}"'
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, BaseException):
+        return "".join(iter_json({"error": str(value)}))
+    return json.dumps(_text(value), ensure_ascii=False)
+
+
+def iter_json(value: Any) -> Iterator[str]:
+    """逐个片段产出 ``value`` 的 JSON 编码。"""
+    if isinstance(value, dict):
+        yield "{"
+        first = True
+        for key, item in value.items():
+            if not first:
+                yield ","
+            first = False
+            yield json.dumps(_text(key), ensure_ascii=False)
+            yield ":"
+            yield from iter_json(item)
+        yield "}"
+    elif isinstance(value, _LIST_TYPES):
+        yield "["
+        first = True
+        for item in value:
+            if not first:
+                yield ","
+            first = False
+            yield from iter_json(item)
+        yield "]"
+    else:
+        yield _json_scalar(value)
+
+
+def _iter_raw(value: Any, end: bytes = b"\n") -> Iterator[bytes]:
+    # 与 redis-cli --raw 一致：嵌套结构展开为每行一个元素；value 本身不复制
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _iter_raw(key, end)
+            yield from _iter_raw(item, end)
+    elif isinstance(value, _LIST_TYPES):
+        for item in value:
+            yield from _iter_raw(item, end)
+    else:
+        if value is not None:
+            yield _raw_bytes(value)
+        yield end
+
+
+def _csv_cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, BaseException):
+        return f"(error) {value}"
+    if isinstance(value, (dict,) + _LIST_TYPES):
+        return "".join(iter_json(value))
+    return _text(value)
+
+
+def _csv_rows(value: Any) -> Iterator[List[str]]:
+    """字典每项一行（键, 值）；数组每个元素一行，元素本身是数组时展开为多列。"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield [_csv_cell(key), _csv_cell(item)]
+    elif isinstance(value, _LIST_TYPES):
+        for item in value:
+            if isinstance(item, _LIST_TYPES):
+                yield [_csv_cell(cell) for cell in item]
+            else:
+                yield [_csv_cell(item)]
+    else:
+        yield [_csv_cell(value)]
+
+
+def _value_lines(value: Any) -> Iterator[str]:
+    """``write_record`` 的文本格式：字符串一行，集合每个元素一行并编号。"""
+    if isinstance(value, dict):
+        value = value.items()
+    elif not isinstance(value, _LIST_TYPES):
+        yield str(decode_value(value))
+        return
+    for idx, item in enumerate(value, start=1):
+        if isinstance(item, tuple) and len(item) == 2:
+            first, second = item
+            if isinstance(second, float):
+                yield f"{idx}) {decode_value(first)} (score={second:g})"
+            else:
+                yield f"{idx}) {decode_value(first)} => {decode_value(second)}"
+        else:
+            yield f"{idx}) {decode_value(item)}"
+
+
+def _jsonl_values(value: Any) -> Iterator[Any]:
+    """jsonl 中每行一个值：数组按元素拆行，字典按 ``{"field", "value"}`` 拆行。"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield {"field": key, "value": item}
+    elif isinstance(value, _LIST_TYPES):
+        yield from value
+    else:
+        yield value
+
+
+class OutputWriter:
+    """
+    以页为单位写出 SCAN 结果或命令回复。
+
+    默认与原来的输出一致（``1) key`` 编号、解码后的文本）；``raw`` 格式
+    每个元素原样输出一行，不编号也不解码，适合接到其他工具的管道中。
+    ``json`` 格式下多页结果合并为一个数组，在 ``close`` 时闭合。
+    """
+
+    def __init__(
+        self,
+        stream: Optional[BinaryIO] = None,
+        fmt: OutputFormat = OutputFormat.text,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        start: int = 1,
+    ):
+        if stream is None:
+            # 之前经 typer.echo 写入文本层的内容要先落地，保证顺序
+            sys.stdout.flush()
+            stream = sys.stdout.buffer
+        self.stream = stream
+        self.fmt = OutputFormat(fmt)
+        self.buffer_size = buffer_size
+        self.index = start
+        isatty = getattr(stream, "isatty", None)
+        self.interactive = bool(isatty and isatty())
+        self._chunks: List[bytes] = []
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+        # json 格式下 SCAN 结果的外层结构：开头在第一页写出后置为 None
+        self._json_open: Optional[str] = "["
+        self._json_close = "]"
+        self._json_items = 0
+        self._json_pages = False
+
+    def _numbered(self, items: Iterable, with_scores: bool) -> bytes:
+        lines = []
+        idx = self.index
+        for item in items:
+            if with_scores and isinstance(item, tuple):
+                key, score = item
+                lines.append(f"{idx}) {decode_value(key)} (score={score})")
+            elif isinstance(item, tuple) and len(item) == 2:
+                field, value = item
+                lines.append(f"{idx}) {decode_value(field)} => {decode_value(value)}")
+            else:
+                lines.append(f"{idx}) {decode_value(item)}")
+            idx += 1
+        self.index = idx
+        if not lines:
+            return b""
+        lines.append("")
+        return "\n".join(lines).encode("utf-8")
+
+    def _raw(self, items: Iterable, end: bytes = b"\n") -> bytes:
+        # 与 redis-cli --raw 一致：字段/值、成员/分数各占一行
+        parts = []
+        for item in items:
+            if isinstance(item, tuple):
+                parts.extend(_raw_bytes(value) for value in item)
+            else:
+                parts.append(_raw_bytes(item))
+        if not parts:
+            return b""
+        parts.append(b"")
+        return end.join(parts)
+
+    def _append(self, data) -> None:
+        if len(data) >= self.buffer_size:
+            # 大 value 直接写入输出流，不再拼接进缓冲区
+            self._drain()
+            self.stream.write(data)
+            self.flush()
+            return
+        if data:
+            self._chunks.append(data)
+            self._pending += len(data)
+        if (
+            self.interactive
+            or self._pending >= self.buffer_size
+            or time.monotonic() - self._flushed_at >= FLUSH_INTERVAL
+        ):
+            self.flush()
+
+    def _append_pieces(self, pieces: Iterable[str]) -> None:
+        batch: List[str] = []
+        for piece in pieces:
+            batch.append(piece)
+            if len(batch) >= _PIECES_PER_WRITE:
+                self._append("".join(batch).encode("utf-8"))
+                batch = []
+        if batch:
+            self._append("".join(batch).encode("utf-8"))
+
+    def _append_binary(self, pieces: Iterable) -> None:
+        batch: List[Any] = []
+        size = 0
+        for piece in pieces:
+            if len(piece) >= self.buffer_size:
+                self._append(b"".join(batch))
+                self._append(piece)
+                batch, size = [], 0
+                continue
+            batch.append(piece)
+            size += len(piece)
+            if size >= self.buffer_size:
+                self._append(b"".join(batch))
+                batch, size = [], 0
+        self._append(b"".join(batch))
+
+    def _append_csv(self, rows: Iterable[List[str]]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            if count % _PIECES_PER_WRITE == 0:
+                self._append(buffer.getvalue().encode("utf-8"))
+                buffer.seek(0)
+                buffer.truncate()
+        self._append(buffer.getvalue().encode("utf-8"))
+
+    def _append_resp(self, values: Iterable) -> None:
+        pieces: List[bytes] = []
+
+        def write(data: bytes) -> None:
+            pieces.append(data)
+            if len(pieces) >= _PIECES_PER_WRITE:
+                self._append(b"".join(pieces))
+                pieces.clear()
+
+        for value in values:
+            write_value(value, write)
+        self._append(b"".join(pieces))
+
+    def _json_item(self, item, with_scores: bool):
+        if isinstance(item, tuple) and len(item) == 2:
+            if with_scores:
+                return {"member": item[0], "score": item[1]}
+            return {"field": item[0], "value": item[1]}
+        return item
+
+    def _iter_json_page(self, items: Iterable, with_scores: bool) -> Iterator[str]:
+        self._json_pages = True
+        if self._json_open is not None:
+            yield self._json_open
+            self._json_open = None
+        for item in items:
+            if self._json_items:
+                yield ","
+            self._json_items += 1
+            yield from iter_json(self._json_item(item, with_scores))
+
+    def _iter_jsonl(self, values: Iterable) -> Iterator[str]:
+        for value in values:
+            yield from iter_json(value)
+            yield "\n"
+
+    def write_page(self, items: Iterable, with_scores: bool = False) -> None:
+        """写出一页元素：普通 key、``(field, value)`` 或 ``(member, score)``。"""
+        fmt = self.fmt
+        if fmt is OutputFormat.text:
+            self._append(self._numbered(items, with_scores))
+        elif fmt is OutputFormat.raw:
+            self._append(self._raw(items))
+        elif fmt is OutputFormat.binary:
+            self._append(self._raw(items, end=b"\0"))
+        elif fmt is OutputFormat.json:
+            self._append_pieces(self._iter_json_page(items, with_scores))
+        elif fmt is OutputFormat.jsonl:
+            self._append_pieces(
+                self._iter_jsonl(self._json_item(item, with_scores) for item in items)
+            )
+        elif fmt is OutputFormat.csv:
+            self._append_csv(
+                [_csv_cell(cell) for cell in item] if isinstance(item, tuple) else [_csv_cell(item)]
+                for item in items
+            )
+        else:
+            self._append_resp(items)
+
+    def write_cursor(self, label: str, cursor: int, empty: bool) -> None:
+        """单页模式下在结果之前写出下一个游标。"""
+        fmt = self.fmt
+        if fmt is OutputFormat.text:
+            self.write_line(f"[{label}] cursor={cursor}")
+            if empty:
+                self.write_line("（无结果）")
+        elif fmt is OutputFormat.raw:
+            # 与 redis-cli --raw 一致：第一行是下一个游标
+            self.write_line(str(cursor))
+        elif fmt is OutputFormat.binary:
+            self._append(b"%d\0" % cursor)
+        elif fmt is OutputFormat.json:
+            self._json_open = f'{{"cursor":{cursor},"items":['
+            self._json_close = "]}"
+            self._json_pages = True
+        elif fmt is OutputFormat.jsonl:
+            self.write_line(f'{{"cursor":{cursor}}}')
+        elif fmt is OutputFormat.csv:
+            # CSV 中混入游标行会破坏列结构，改为写到标准错误
+            sys.stderr.write(f"cursor={cursor}\n")
+        else:
+            self._append_resp([cursor])
+
+    def write_reply(self, reply: Any) -> None:
+        """按当前格式写出一条命令回复。"""
+        fmt = self.fmt
+        if fmt is OutputFormat.text:
+            self.write_lines(format_response(reply))
+        elif fmt is OutputFormat.raw:
+            if isinstance(reply, Exception):
+                self.write_line(str(reply))
+            else:
+                self._append_binary(_iter_raw(reply))
+        elif fmt is OutputFormat.binary:
+            if isinstance(reply, Exception):
+                # 错误信息不混入二进制输出
+                sys.stderr.write(f"(error) {reply}\n")
+            elif isinstance(reply, (dict,) + _LIST_TYPES):
+                self._append_binary(_iter_raw(reply, end=b"\0"))
+            elif reply is not None:
+                self._append(_raw_bytes(reply))
+        elif fmt is OutputFormat.json:
+            self._append_pieces(iter_json(reply))
+            self._append(b"\n")
+        elif fmt is OutputFormat.jsonl:
+            self._append_pieces(self._iter_jsonl(_jsonl_values(reply)))
+        elif fmt is OutputFormat.csv:
+            self._append_csv(_csv_rows(reply))
+        else:
+            self._append_resp([reply])
+
+    def write_record(
+        self, key, type_: str, value: Any, truncated: bool = False, part: int = 1
+    ) -> None:
+        """
+        写出一个 key 及其值（``scan --with-values`` / ``dump-values``）。
+
+        大集合分段输出时同一个 key 会写出多条记录，``part`` 从 1 开始编号。
+        """
+        fmt = self.fmt
+        if fmt is OutputFormat.text:
+            notes = [type_]
+            if part > 1:
+                notes.append(f"第 {part} 段")
+            if truncated:
+                notes.append("已截断")
+            if part == 1:
+                header = f"{self.index}) {decode_value(key)}"
+                self.index += 1
+            else:
+                header = f"   {decode_value(key)}"
+            self.write_lines(
+                [f"{header} ({'，'.join(notes)})"]
+                + [f"   {line}" for line in _value_lines(value)]
+            )
+        elif fmt in (OutputFormat.raw, OutputFormat.binary):
+            end = b"\n" if fmt is OutputFormat.raw else b"\0"
+            self._append_binary(_iter_raw([key, value], end=end))
+        elif fmt in (OutputFormat.json, OutputFormat.jsonl):
+            record = {"key": key, "type": type_, "value": value}
+            if truncated:
+                record["truncated"] = True
+            if part > 1:
+                record["part"] = part
+            if fmt is OutputFormat.json:
+                self._append_pieces(self._iter_json_page([record], False))
+            else:
+                self._append_pieces(self._iter_jsonl([record]))
+        elif fmt is OutputFormat.csv:
+            self._append_csv([[_csv_cell(key), type_, _csv_cell(value)]])
+        else:
+            self._append_resp([[key, type_, value]])
+
+    def write_messages(self, messages: Sequence[tuple]) -> None:
+        """
+        写出一批 Pub/Sub 消息 ``(类型, 模式, 频道, 内容)``，模式只在 pmessage 中不为 None。
+
+        text 每条一行 ``频道: 内容``；raw / binary 只输出内容；resp 按服务端推送的
+        原样数组写出。
+        """
+        fmt = self.fmt
+        if fmt is OutputFormat.text:
+            self._append_pieces(
+                f"[{decode_value(pattern)}] {decode_value(channel)}: {decode_value(data)}\n"
+                if pattern is not None
+                else f"{decode_value(channel)}: {decode_value(data)}\n"
+                for _, pattern, channel, data in messages
+            )
+        elif fmt in (OutputFormat.raw, OutputFormat.binary):
+            end = b"\n" if fmt is OutputFormat.raw else b"\0"
+            self._append(self._raw((data for *_, data in messages), end))
+        elif fmt in (OutputFormat.json, OutputFormat.jsonl):
+            records = (
+                {"channel": channel, "data": data}
+                if pattern is None
+                else {"pattern": pattern, "channel": channel, "data": data}
+                for _, pattern, channel, data in messages
+            )
+            if fmt is OutputFormat.json:
+                self._append_pieces(self._iter_json_page(records, False))
+            else:
+                self._append_pieces(self._iter_jsonl(records))
+        elif fmt is OutputFormat.csv:
+            self._append_csv(
+                [_csv_cell(channel), _csv_cell(data), _csv_cell(pattern)]
+                for _, pattern, channel, data in messages
+            )
+        else:
+            self._append_resp(
+                [kind, channel, data] if pattern is None else [kind, pattern, channel, data]
+                for kind, pattern, channel, data in messages
+            )
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        lines = list(lines)
+        if lines:
+            lines.append("")
+        self._append("\n".join(lines).encode("utf-8"))
+
+    def write_line(self, text: str) -> None:
+        self._append(f"{text}\n".encode("utf-8"))
+
+    def _drain(self) -> None:
+        if self._chunks:
+            self.stream.write(b"".join(self._chunks))
+            self._chunks.clear()
+            self._pending = 0
+
+    def flush(self) -> None:
+        self._drain()
+        self.stream.flush()
+        self._flushed_at = time.monotonic()
+
+    def close(self) -> None:
+        if self._json_pages:
+            self._json_pages = False
+            self._append(f"{self._json_open or ''}{self._json_close}\n".encode("utf-8"))
+        self.flush()
+
+    def __enter__(self) -> "OutputWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # 管道已关闭时不再尝试写出剩余内容
+        if exc_type is None or not issubclass(exc_type, BrokenPipeError):
+            self.close()
+
+
+__all__ = [
+    "DEFAULT_BUFFER_SIZE",
+    "FLUSH_INTERVAL",
+    "OUTPUT_HELP",
+    "OutputFormat",
+    "OutputWriter",
+    "iter_json",
+]
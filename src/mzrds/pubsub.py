@@ -0,0 +1,203 @@
+"""
+Pub/Sub 的流式订阅与批量发布。
+
+``exec`` 一问一答，订阅需要在独立连接上持续读取。``PubSubStream`` 仍由
+redis-py 的 ``PubSub`` 管理订阅（断线重连后自动重新订阅），但不走
+``get_message`` 的逐条字典构造，而是按批读取原始回复，交给 ``OutputWriter``
+整块写出。Cluster 下普通频道与模式的消息会广播到所有节点，订阅任意一个节点
+即可；分片频道（SSUBSCRIBE）按 slot 分组，每个 slot 一条 SSUBSCRIBE，
+同一主节点上的 slot 共用一个订阅连接。
+
+``publish_messages`` 把 PUBLISH / SPUBLISH 分块放进 pipeline，用于压测下游的消费者。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .scanner import is_cluster, primary_clients
+
+# (类型, 模式, 频道, 内容)，模式只在 pmessage 中不为 None
+Message = Tuple[bytes, Optional[bytes], bytes, bytes]
+
+
+class SubscribeMode(str, Enum):
+    channel = "channel"
+    pattern = "pattern"
+    shard = "shard"
+
+
+def to_message(reply: Any) -> Optional[Message]:
+    """把订阅连接上的原始回复转成 ``Message``；订阅确认等其他回复返回 None。"""
+    if not isinstance(reply, list):
+        return None
+    kind = reply[0] if reply else None
+    if kind == b"pmessage" and len(reply) == 4:
+        return kind, reply[1], reply[2], reply[3]
+    if kind in (b"message", b"smessage") and len(reply) == 3:
+        return kind, None, reply[1], reply[2]
+    return None
+
+
+class PubSubStream:
+    """
+    一个节点上的订阅连接，接口与 ``monitor.MonitorStream`` 相同，可交给 ``StreamSession``。
+
+    ``groups`` 中每组频道各发一条订阅命令（分片频道每组属于同一个 slot），
+    默认全部频道一条命令。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        client,
+        mode: SubscribeMode,
+        channels: Sequence[str],
+        groups: Optional[Sequence[Sequence[str]]] = None,
+    ):
+        self.name = name
+        self.client = client
+        self.mode = SubscribeMode(mode)
+        self.channels = list(channels)
+        self.groups = [list(group) for group in groups] if groups else [self.channels]
+        self.pubsub = None
+
+    def open(self) -> None:
+        pubsub = self.client.pubsub()
+        self.pubsub = pubsub
+        subscribe = {
+            SubscribeMode.channel: pubsub.subscribe,
+            SubscribeMode.pattern: pubsub.psubscribe,
+            SubscribeMode.shard: pubsub.ssubscribe,
+        }[self.mode]
+        for group in self.groups:
+            subscribe(*group)
+
+    def read(self, timeout: float, limit: int = 1000) -> List[Any]:
+        """等待最多 ``timeout`` 秒，返回已到达的原始回复（最多 ``limit`` 条）。"""
+        pubsub = self.pubsub
+        replies: List[Any] = []
+        wait = timeout
+        while len(replies) < limit:
+            reply = pubsub.parse_response(block=False, timeout=wait)
+            if reply is None:
+                break
+            replies.append(reply)
+            wait = 0
+        return replies
+
+    def close(self) -> None:
+        pubsub, self.pubsub = self.pubsub, None
+        if pubsub is not None:
+            pubsub.close()
+
+
+def subscription_streams(
+    client, mode: SubscribeMode, channels: Sequence[str]
+) -> List[PubSubStream]:
+    """
+    按模式建立订阅流：分片频道在 Cluster 下按 slot 分组（一条 SSUBSCRIBE 中的
+    频道必须属于同一个 slot，否则报 CROSSSLOT），每个主节点一个订阅连接；
+    其余模式只订阅一个节点。
+    """
+    if mode is SubscribeMode.shard and is_cluster(client):
+        nodes: Dict[str, Tuple[Any, Dict[int, List[str]]]] = {}
+        for channel in channels:
+            node = client.get_node_from_key(channel)
+            if node.name not in nodes:
+                nodes[node.name] = (client.get_redis_connection(node), {})
+            nodes[node.name][1].setdefault(client.keyslot(channel), []).append(channel)
+        return [
+            PubSubStream(
+                name,
+                node_client,
+                mode,
+                [channel for group in slots.values() for channel in group],
+                list(slots.values()),
+            )
+            for name, (node_client, slots) in nodes.items()
+        ]
+    name, node_client = primary_clients(client)[0]
+    return [PubSubStream(name, node_client, mode, channels)]
+
+
+def iter_publish_lines(
+    stream: BinaryIO, channel: Optional[bytes] = None
+) -> Iterator[Tuple[bytes, bytes]]:
+    """
+    逐行读取要发布的消息，产出 ``(频道, 内容)``，跳过空行。
+
+    给出 ``channel`` 时每行整行作为内容；否则每行为 ``频道 内容``，按第一个空格切开。
+    """
+    for number, line in enumerate(stream, start=1):
+        line = line.rstrip(b"\r\n")
+        if not line:
+            continue
+        if channel is not None:
+            yield channel, line
+            continue
+        name, sep, data = line.partition(b" ")
+        if not sep:
+            raise ValueError(f"第 {number} 行缺少消息内容（格式为 \"频道 内容\"）")
+        yield name, data
+
+
+@dataclass
+class PublishStats:
+    published: int = 0
+    receivers: int = 0
+    errors: int = 0
+    last_error: Optional[Exception] = None
+
+
+def publish_messages(
+    client,
+    messages: Iterable[Tuple[bytes, bytes]],
+    chunk_size: int = 1000,
+    shard: bool = False,
+    limiter=None,
+) -> PublishStats:
+    """
+    每 ``chunk_size`` 条消息一个 pipeline 发布，返回发布条数、接收者合计与失败数。
+
+    PUBLISH 在 Cluster 下会广播到所有节点，固定发往第一个主节点；SPUBLISH
+    交给 Cluster pipeline 按频道所在的 slot 路由。``limiter`` 为
+    ``throttle.RateLimiter``，按条数限速。单条发布出错（MOVED、ACL 拒绝等）
+    不会中断，计入 ``errors``，``last_error`` 保留最后一个错误。
+    """
+    if shard:
+        command, target = "SPUBLISH", client
+    else:
+        command, target = "PUBLISH", primary_clients(client)[0][1]
+    iterator = iter(messages)
+    stats = PublishStats()
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return stats
+        if limiter is not None:
+            limiter.acquire(len(chunk))
+        pipe = target.pipeline(transaction=False)
+        for channel, data in chunk:
+            pipe.execute_command(command, channel, data)
+        for reply in pipe.execute(raise_on_error=False):
+            if isinstance(reply, Exception):
+                stats.errors += 1
+                stats.last_error = reply
+            else:
+                stats.published += 1
+                stats.receivers += reply
+
+
+__all__ = [
+    "Message",
+    "PubSubStream",
+    "PublishStats",
+    "SubscribeMode",
+    "iter_publish_lines",
+    "publish_messages",
+    "subscription_streams",
+    "to_message",
+]
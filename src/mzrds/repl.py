@@ -0,0 +1,250 @@
+"""
+交互式 REPL。
+
+整个会话只使用一个连接（单机模式下为 ``single_connection_client``），
+因此 MULTI / WATCH / SELECT 这类依赖连接状态的命令可以正常工作；
+回复不经过 redis-py 的回调转换，显示效果与 redis-cli 一致。
+"""
+from __future__ import annotations
+
+import sys
+import time
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence
+
+from .batch import parse_command_line
+from .client import connection_endpoint
+from .config import CONFIG_DIR, ConnectionOptions
+from .output import OutputFormat, OutputWriter
+
+if TYPE_CHECKING:
+    from redis import Redis
+
+HISTORY_FILE = CONFIG_DIR / "repl_history"
+HISTORY_LENGTH = 1000
+EXIT_COMMANDS = {"quit", "exit"}
+
+# COMMAND LIST 不可用（Redis 7 之前）时用于补全的常用命令
+FALLBACK_COMMANDS = [
+    "APPEND", "AUTH", "CLIENT", "CONFIG", "DBSIZE", "DECR", "DECRBY", "DEL",
+    "DISCARD", "DUMP", "ECHO", "EVAL", "EVALSHA", "EXEC", "EXISTS", "EXPIRE",
+    "EXPIREAT", "FLUSHDB", "GET", "GETDEL", "GETEX", "GETRANGE", "GETSET",
+    "HDEL", "HEXISTS", "HGET", "HGETALL", "HINCRBY", "HKEYS", "HLEN", "HMGET",
+    "HSCAN", "HSET", "HVALS", "INCR", "INCRBY", "INFO", "KEYS", "LINDEX",
+    "LLEN", "LPOP", "LPUSH", "LRANGE", "LREM", "LSET", "LTRIM", "MEMORY",
+    "MGET", "MSET", "MULTI", "OBJECT", "PERSIST", "PEXPIRE", "PING", "PTTL",
+    "PUBLISH", "RENAME", "RPOP", "RPUSH", "SADD", "SCAN", "SCARD", "SELECT",
+    "SET", "SISMEMBER", "SLOWLOG", "SMEMBERS", "SREM", "SSCAN", "STRLEN",
+    "TTL", "TYPE", "UNLINK", "UNWATCH", "WATCH", "XADD", "XLEN", "XRANGE",
+    "ZADD", "ZCARD", "ZINCRBY", "ZRANGE", "ZRANK", "ZREM", "ZSCAN", "ZSCORE",
+]
+
+# Cluster 客户端按 key 路由到不同节点，无法维持这些连接级状态
+CONNECTION_STATE_COMMANDS = {"MULTI", "EXEC", "DISCARD", "WATCH", "UNWATCH", "SELECT"}
+
+
+def _disable_cluster_callbacks(client) -> None:
+    """
+    Cluster 客户端的回复先经各节点客户端的回调，再经 cluster 级回调转换，两层都关闭。
+
+    拓扑刷新时新建的节点客户端同样关闭。多节点命令（KEYS、DBSIZE 等）
+    的结果合并不属于回复转换，仍然保留。
+    """
+    client.cluster_response_callbacks.clear()
+    manager = client.nodes_manager
+    create_redis_node = manager.create_redis_node
+
+    def create_raw_node(*args, **kwargs):
+        node_client = create_redis_node(*args, **kwargs)
+        node_client.response_callbacks.clear()
+        return node_client
+
+    manager.create_redis_node = create_raw_node
+    for node in client.get_nodes():
+        if node.redis_connection is not None:
+            node.redis_connection.response_callbacks.clear()
+
+
+def create_session_client(options: ConnectionOptions):
+    """REPL 专用客户端：单机模式固定使用一个连接，并关闭回复转换。"""
+    if options.cluster:
+        from .client import create_cluster_client
+
+        client = create_cluster_client(options)
+        _disable_cluster_callbacks(client)
+        return client
+    from .client import create_redis_client
+
+    client = create_redis_client(options, single_connection_client=True)
+    client.response_callbacks.clear()
+    return client
+
+
+class ReplSession:
+    """一个 REPL 会话：持有连接，并跟踪 MULTI / WATCH / SELECT 状态。"""
+
+    def __init__(self, client: "Redis", options: ConnectionOptions):
+        self.client = client
+        self.options = options
+        self.cluster = bool(options.cluster)
+        # URI 中的密码不能出现在提示符里；库号也可能来自 URI
+        endpoint = connection_endpoint(options)
+        self.address = f"{endpoint['host']}:{endpoint['port']}"
+        self.db = 0 if self.cluster else (endpoint["db"] or 0)
+        self.in_multi = False
+        self.watching = False
+        self._commands: Optional[List[str]] = None
+
+    def prompt(self) -> str:
+        db = f"[{self.db}]" if self.db else ""
+        state = "(TX)" if self.in_multi else ""
+        return f"{self.address}{db}{state}> "
+
+    def _update_state(self, name: str, args: Sequence[str], reply) -> None:
+        failed = isinstance(reply, Exception)
+        if name in ("EXEC", "DISCARD"):
+            # 无论成功与否，EXEC / DISCARD 之后事务和 WATCH 都已结束
+            self.in_multi = self.watching = False
+        elif failed or self.in_multi:
+            return
+        elif name == "MULTI":
+            self.in_multi = True
+        elif name == "WATCH":
+            self.watching = True
+        elif name == "UNWATCH":
+            self.watching = False
+        elif name == "SELECT" and args:
+            self.db = int(args[0])
+            # 断线重连时 redis-py 会重新 SELECT 连接上记录的库
+            connection = getattr(self.client, "connection", None)
+            if connection is not None:
+                connection.db = self.db
+
+    def execute(self, parts: Sequence[str]):
+        """执行一条命令，错误回复作为异常对象返回。"""
+        from redis import exceptions
+
+        name = parts[0].upper()
+        if self.cluster and name in CONNECTION_STATE_COMMANDS:
+            return exceptions.RedisError(f"Cluster 模式下不支持 {name}")
+        try:
+            reply = self.client.execute_command(*parts)
+        except exceptions.ResponseError as exc:
+            reply = exc
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as exc:
+            # 连接断开后服务端的事务状态已丢失
+            self.in_multi = self.watching = False
+            return exc
+        self._update_state(name, parts[1:], reply)
+        return reply
+
+    def command_names(self) -> List[str]:
+        if self._commands is None:
+            try:
+                names = self.client.execute_command("COMMAND", "LIST")
+                self._commands = sorted(
+                    name.decode().upper() if isinstance(name, bytes) else str(name).upper()
+                    for name in names
+                )
+            except Exception:
+                self._commands = list(FALLBACK_COMMANDS)
+        return self._commands
+
+    def complete(self, text: str, line: str) -> List[str]:
+        """补全第一个单词（命令名），保持用户输入的大小写风格。"""
+        if line.lstrip() != text:
+            return []
+        upper = text.upper()
+        matches = [name for name in self.command_names() if name.startswith(upper)]
+        if text.islower():
+            matches = [name.lower() for name in matches]
+        return matches
+
+
+def _setup_readline(session: ReplSession) -> Optional[Callable[[], None]]:
+    """启用历史与补全，返回退出时保存历史的函数；没有 readline 时返回 None。"""
+    try:
+        import readline
+    except ImportError:
+        return None
+
+    def completer(text: str, state: int) -> Optional[str]:
+        matches = session.complete(text, readline.get_line_buffer())
+        # 补全命令名后直接接一个空格，便于继续输入参数
+        return f"{matches[state]} " if state < len(matches) else None
+
+    readline.set_completer(completer)
+    readline.set_completer_delims(" \t")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+    readline.set_history_length(HISTORY_LENGTH)
+
+    def save() -> None:
+        try:
+            HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            readline.write_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+
+    return save
+
+
+def run_repl(
+    session: ReplSession,
+    fmt: OutputFormat = OutputFormat.text,
+    timing: bool = True,
+    read_line: Callable[[str], str] = input,
+) -> None:
+    interactive = sys.stdin.isatty()
+    save_history = _setup_readline(session) if interactive else None
+    out = OutputWriter(fmt=fmt)
+    try:
+        while True:
+            try:
+                line = read_line(session.prompt() if interactive else "")
+            except EOFError:
+                break
+            except KeyboardInterrupt:
+                # Ctrl-C 只放弃当前输入
+                sys.stdout.write("\n")
+                continue
+            try:
+                parts = parse_command_line(line)
+            except ValueError as exc:
+                out.write_line(f"(error) {exc}")
+                out.flush()
+                continue
+            if not parts:
+                continue
+            if parts[0].lower() in EXIT_COMMANDS:
+                break
+            started = time.perf_counter()
+            reply = session.execute(parts)
+            elapsed = time.perf_counter() - started
+            out.write_reply(reply)
+            out.flush()
+            if timing:
+                # 机器可读格式下耗时写到标准错误，不混入输出
+                note = f"({elapsed * 1000:.2f}ms)\n"
+                if fmt is OutputFormat.text:
+                    sys.stdout.write(note)
+                    sys.stdout.flush()
+                else:
+                    sys.stderr.write(note)
+    finally:
+        out.close()
+        if save_history:
+            save_history()
+
+
+__all__ = [
+    "HISTORY_FILE",
+    "ReplSession",
+    "create_session_client",
+    "run_repl",
+]
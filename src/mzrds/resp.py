@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Callable, List
+
+CRLF = b"\r\n"
+
+
+class RespError(Exception):
+    """RESP 流中的错误回复，``kind`` 为错误前缀（如 ``ERR``、``ResponseError``）。"""
+
+    def __init__(self, kind: str, message: str):
+        super().__init__(message)
+        self.kind = kind
+
+
+def _encode_into(value: Any, out: List[bytes]) -> None:
+    if value is None:
+        out.append(b"_\r\n")
+    elif value is True or value is False:
+        out.append(b"#t\r\n" if value else b"#f\r\n")
+    elif isinstance(value, int):
+        out.append(b":%d\r\n" % value)
+    elif isinstance(value, float):
+        out.append(b",%s\r\n" % repr(value).encode())
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        out.append(b"$%d\r\n" % len(value))
+        out.append(bytes(value))
+        out.append(CRLF)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out.append(b"=%d\r\ntxt:" % (len(data) + 4))
+        out.append(data)
+        out.append(CRLF)
+    elif isinstance(value, dict):
+        out.append(b"%%%d\r\n" % len(value))
+        for key, item in value.items():
+            _encode_into(key, out)
+            _encode_into(item, out)
+    elif isinstance(value, (set, frozenset)):
+        out.append(b"~%d\r\n" % len(value))
+        for item in value:
+            _encode_into(item, out)
+    elif isinstance(value, (list, tuple)):
+        out.append(b"*%d\r\n" % len(value))
+        for item in value:
+            _encode_into(item, out)
+    elif isinstance(value, BaseException):
+        data = f"{type(value).__name__} {value}".encode("utf-8")
+        out.append(b"!%d\r\n" % len(data))
+        out.append(data)
+        out.append(CRLF)
+    else:
+        _encode_into(str(value), out)
+
+
+def encode_value(value: Any) -> bytes:
+    """把 Python 值编码为 RESP3；str 使用 verbatim string 以便解码后保持类型。"""
+    out: List[bytes] = []
+    _encode_into(value, out)
+    return b"".join(out)
+
+
+class _Sink:
+    """让 ``_encode_into`` 直接把片段交给写出函数，而不是收集到列表。"""
+
+    __slots__ = ("append",)
+
+    def __init__(self, write: Callable[[bytes], None]):
+        self.append = write
+
+
+def write_value(value: Any, write: Callable[[bytes], None]) -> None:
+    """边遍历边写出 ``value`` 的 RESP3 编码，不在内存中拼出完整结果。"""
+    _encode_into(value, _Sink(write))
+
+
+def _read_line(stream: BinaryIO) -> bytes:
+    line = stream.readline()
+    if not line.endswith(CRLF):
+        raise EOFError("RESP 流意外结束")
+    return line[:-2]
+
+
+def _read_blob(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size + 2)
+    if len(data) != size + 2:
+        raise EOFError("RESP 流意外结束")
+    return data[:-2]
+
+
+def _error(text: bytes) -> RespError:
+    kind, _, message = text.decode("utf-8", "replace").partition(" ")
+    return RespError(kind, message)
+
+
+def read_value(stream: BinaryIO) -> Any:
+    """从二进制流读取一个 RESP2/RESP3 值。错误回复以 ``RespError`` 对象返回。"""
+    line = _read_line(stream)
+    kind, payload = line[:1], line[1:]
+    if kind == b"+":
+        return payload
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        size = int(payload)
+        return None if size < 0 else _read_blob(stream, size)
+    if kind == b"*":
+        size = int(payload)
+        return None if size < 0 else [read_value(stream) for _ in range(size)]
+    if kind == b"-":
+        return _error(payload)
+    if kind == b"_":
+        return None
+    if kind == b"#":
+        return payload == b"t"
+    if kind == b",":
+        return float(payload)
+    if kind == b"(":
+        return int(payload)
+    if kind == b"=":
+        return _read_blob(stream, int(payload))[4:].decode("utf-8")
+    if kind == b"!":
+        return _error(_read_blob(stream, int(payload)))
+    if kind == b"%":
+        return {read_value(stream): read_value(stream) for _ in range(int(payload))}
+    if kind == b"~":
+        return {read_value(stream) for _ in range(int(payload))}
+    raise ValueError(f"未知的 RESP 类型: {line!r}")
+
+
+__all__ = ["CRLF", "RespError", "encode_value", "read_value", "write_value"]
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+# 每个节点最多积压的页数，超过后扫描线程阻塞，保证内存有界
+_PAGES_PER_WORKER = 4
+_DONE = object()
+
+
+@dataclass
+class ScanPage:
+    """一次 SCAN 调用的结果。
+
+    ``cursor`` 是该节点下一次 SCAN 应使用的游标，为 0 表示该节点已遍历结束；
+    ``result`` 是 ``process`` 回调（若提供）在扫描线程中对本页 key 的处理结果。
+    """
+
+    node: str
+    cursor: int
+    keys: List[bytes]
+    result: Any = None
+
+
+PageProcessor = Callable[[Any, List[bytes]], Any]
+# 每个节点调用一次，返回该节点独立的 COUNT 调节器（见 throttle.AdaptiveCount）
+TunerFactory = Callable[[], Any]
+
+
+def is_cluster(client) -> bool:
+    return hasattr(client, "get_primaries")
+
+
+def node_name(client) -> str:
+    kwargs = client.connection_pool.connection_kwargs
+    if "path" in kwargs:
+        return kwargs["path"]
+    return f"{kwargs.get('host', 'localhost')}:{kwargs.get('port', 6379)}"
+
+
+def primary_clients(client) -> List[tuple]:
+    """返回 ``[(节点名, 节点 Redis 客户端), ...]``，单机模式下只有一个节点。"""
+    if not is_cluster(client):
+        return [(node_name(client), client)]
+    return [
+        (node.name, client.get_redis_connection(node))
+        for node in client.get_primaries()
+    ]
+
+
+def node_clients(client) -> List[tuple]:
+    """与 ``primary_clients`` 相同，但 Cluster 下包含副本，用于监控类命令。"""
+    if not is_cluster(client):
+        return [(node_name(client), client)]
+    return [(node.name, client.get_redis_connection(node)) for node in client.get_nodes()]
+
+
+def group_by_slot(keys: Sequence[bytes]) -> List[List[bytes]]:
+    """按 hash slot 分组，Cluster 中的多 key 命令（UNLINK、MGET 等）只能作用于同一 slot。"""
+    from redis.crc import key_slot
+
+    groups: Dict[int, List[bytes]] = {}
+    for key in keys:
+        groups.setdefault(key_slot(key), []).append(key)
+    return list(groups.values())
+
+
+def _scan_node(
+    name: str,
+    client,
+    match: str,
+    count: int,
+    cursor: int,
+    process: Optional[PageProcessor],
+    type_: Optional[str] = None,
+    tuner: Optional[TunerFactory] = None,
+) -> Iterator[ScanPage]:
+    adaptive = tuner() if tuner else None
+    while True:
+        if adaptive:
+            count = adaptive.count
+            started = time.perf_counter()
+        cursor, keys = client.scan(cursor=cursor, match=match, count=count, _type=type_)
+        if adaptive:
+            adaptive.observe(time.perf_counter() - started, len(keys))
+        result = process(client, keys) if process and keys else None
+        yield ScanPage(node=name, cursor=cursor, keys=keys, result=result)
+        if cursor == 0:
+            return
+
+
+def _put(pages: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _parallel_pages(
+    nodes: List[tuple],
+    match: str,
+    count: int,
+    parallelism: int,
+    process: Optional[PageProcessor],
+    type_: Optional[str] = None,
+    tuner: Optional[TunerFactory] = None,
+) -> Iterator[ScanPage]:
+    # nodes 中每项为 (节点名, 节点客户端, 起始游标)
+    from concurrent.futures import ThreadPoolExecutor
+
+    pages: queue.Queue = queue.Queue(maxsize=parallelism * _PAGES_PER_WORKER)
+    stop = threading.Event()
+
+    def worker(name: str, node_client, cursor: int) -> None:
+        try:
+            for page in _scan_node(
+                name, node_client, match, count, cursor, process, type_, tuner
+            ):
+                if not _put(pages, page, stop):
+                    return
+        except BaseException as exc:  # 交给消费者线程重新抛出
+            _put(pages, exc, stop)
+            return
+        _put(pages, _DONE, stop)
+
+    executor = ThreadPoolExecutor(
+        max_workers=parallelism, thread_name_prefix="mzrds-scan"
+    )
+    try:
+        for name, node_client, cursor in nodes:
+            executor.submit(worker, name, node_client, cursor)
+        remaining = len(nodes)
+        while remaining:
+            item = pages.get()
+            if item is _DONE:
+                remaining -= 1
+            elif isinstance(item, BaseException):
+                raise item
+            else:
+                yield item
+    finally:
+        stop.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_scan_pages(
+    client,
+    match: str = "*",
+    count: int = 100,
+    parallelism: Optional[int] = None,
+    process: Optional[PageProcessor] = None,
+    resume: Optional[Mapping[str, Optional[int]]] = None,
+    type_: Optional[str] = None,
+    tuner: Optional[TunerFactory] = None,
+) -> Iterator[ScanPage]:
+    """
+    逐页遍历整个 key 空间。
+
+    Cluster 模式下对每个主节点各自维护 SCAN 游标，并在线程池中并行扫描，
+    每页一到就立即产出（不同节点的页交错出现）。``parallelism`` 限制同时扫描
+    的节点数，默认等于主节点数。``process`` 会在扫描线程中以
+    ``process(节点客户端, keys)`` 调用，适合在页内做 pipeline 查询。
+
+    ``resume`` 为 ``{节点名: 起始游标}``，用于从检查点继续；值为 None 表示
+    该节点已经扫描完成，直接跳过，未出现的节点从头开始。``type_`` 作为
+    SCAN 的 TYPE 参数，由服务端按类型过滤（Redis 6.0+）。给出 ``tuner`` 时
+    每个节点的 COUNT 由各自的调节器根据耗时动态调整，``count`` 不再使用。
+    """
+    resume = resume or {}
+    nodes = [
+        (name, node_client, resume.get(name, 0))
+        for name, node_client in primary_clients(client)
+        if not (name in resume and resume[name] is None)
+    ]
+    if len(nodes) <= 1 or parallelism == 1:
+        for name, node_client, cursor in nodes:
+            yield from _scan_node(
+                name, node_client, match, count, cursor, process, type_, tuner
+            )
+        return
+    workers = min(parallelism or len(nodes), len(nodes))
+    yield from _parallel_pages(nodes, match, count, workers, process, type_, tuner)
+
+
+__all__ = [
+    "ScanPage",
+    "group_by_slot",
+    "is_cluster",
+    "iter_scan_pages",
+    "node_clients",
+    "node_name",
+    "primary_clients",
+]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    线程安全的速率限制器：``acquire(n)`` 会阻塞到允许再执行 n 次操作。
+
+    按虚拟时间排队，第一批立即放行，之后每批的间隔与批大小成正比，
+    多个扫描线程共享同一个实例即可限制总速率。
+    """
+
+    def __init__(self, rate: Optional[float]):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def acquire(self, n: int = 1) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + n / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+class LatencyGuard:
+    """
+    根据批次耗时退避：超过 ``max_latency`` 时暂停，连续超标则加倍暂停时间，
+    恢复正常后清零。每个节点使用独立实例。
+    """
+
+    MIN_DELAY = 0.01
+    MAX_DELAY = 2.0
+
+    def __init__(self, max_latency: Optional[float]):
+        self.max_latency = max_latency
+        self.delay = 0.0
+
+    def observe(self, elapsed: float) -> None:
+        if not self.max_latency:
+            return
+        if elapsed <= self.max_latency:
+            self.delay = 0.0
+            return
+        self.delay = min(max(self.delay * 2, self.MIN_DELAY), self.MAX_DELAY)
+        time.sleep(self.delay)
+
+
+class AdaptiveCount:
+    """
+    根据每页耗时与命中率调整 SCAN 的 COUNT，使每次调用的服务端耗时接近
+    ``target`` 秒。每个节点使用独立实例。
+
+    服务端耗时估计为本次耗时减去往返时间（取观测到的最小耗时），单位 COUNT
+    的开销做指数平滑后反推下一次的 COUNT。每次最多减半；稀疏模式（大部分页
+    为空）最多加倍，命中率高时每页要传回较多 key，增长得更保守。
+    """
+
+    SMOOTHING = 0.3
+    DENSE = 0.1
+    SPARSE_GROWTH = 2.0
+    DENSE_GROWTH = 1.25
+
+    def __init__(
+        self,
+        initial: int = 100,
+        minimum: int = 10,
+        maximum: int = 10000,
+        target: float = 0.005,
+    ):
+        if minimum < 1 or maximum < minimum:
+            raise ValueError("COUNT 的上下限无效")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target = target
+        self.count = min(max(initial, minimum), maximum)
+        self.rtt: Optional[float] = None
+        self.cost: Optional[float] = None
+        self.hit_rate: Optional[float] = None
+
+    def _smooth(self, previous: Optional[float], value: float) -> float:
+        if previous is None:
+            return value
+        return self.SMOOTHING * value + (1 - self.SMOOTHING) * previous
+
+    def observe(self, elapsed: float, returned: int) -> None:
+        """记录一次 ``SCAN ... COUNT self.count`` 的耗时与返回条数，并更新 COUNT。"""
+        count = self.count
+        self.rtt = elapsed if self.rtt is None else min(self.rtt, elapsed)
+        self.cost = self._smooth(self.cost, max(elapsed - self.rtt, 0.0) / count)
+        self.hit_rate = self._smooth(self.hit_rate, returned / count)
+        growth = self.SPARSE_GROWTH if self.hit_rate < self.DENSE else self.DENSE_GROWTH
+        desired = self.target / self.cost if self.cost > 0 else count * growth
+        desired = min(max(desired, count / 2), count * growth)
+        self.count = int(min(max(desired, self.minimum), self.maximum))
+
+
+__all__ = ["AdaptiveCount", "LatencyGuard", "RateLimiter"]
@@ -0,0 +1,232 @@
+"""
+SCAN 结果的批量取值。
+
+每页先用一个 pipeline 查询 TYPE，再用一个 pipeline 按类型读取：string 合并为
+MGET（Cluster 下按 slot 分组），list / zset / stream 用 LRANGE / ZRANGE
+WITHSCORES / XRANGE 只取前 ``max_items`` 个元素，hash / set 先查 HLEN / SCARD，
+元素数不超过上限的再用 HGETALL / SMEMBERS 一次取回，超过的改用 HSCAN / SSCAN
+只取第一页。指定 ``max_bytes`` 时 string 改用 GETRANGE 截断。
+
+``full=True`` 时超过上限的值不截断：``KeyValue.rest`` 在输出时用对应的
+*SCAN 或分段 RANGE 继续翻页，单个大集合也只占用一段的内存。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from .filters import key_types
+from .scanner import group_by_slot
+
+# 第二轮只取长度、第三轮才读取元素的类型
+_SIZED_TYPES = ("hash", "set")
+
+
+@dataclass
+class KeyValue:
+    """
+    一个 key 的值（或第一段）。
+
+    ``truncated`` 表示值超过上限且没有继续读取；``rest`` 不为空时逐段产出剩余部分。
+    """
+
+    key: bytes
+    type: str
+    value: Any
+    truncated: bool = False
+    rest: Optional[Iterator[Any]] = None
+
+
+def _check(reply) -> Any:
+    """WRONGTYPE（key 在 TYPE 之后换了类型）视为已删除，其他错误直接抛出。"""
+    if isinstance(reply, Exception):
+        if str(reply).startswith("WRONGTYPE"):
+            return None
+        raise reply
+    return reply
+
+
+class ValueFetcher:
+    """
+    按页批量读取 key 的值，可直接作为 ``iter_scan_pages`` 的 ``process`` 回调。
+
+    返回 ``KeyValue`` 列表；页内已删除或类型发生变化的 key 被跳过。
+    没有读取命令的类型（模块类型等）只返回类型，值为 None。
+    """
+
+    def __init__(
+        self,
+        by_slot: bool = False,
+        max_items: int = 1000,
+        max_bytes: Optional[int] = None,
+        full: bool = False,
+    ):
+        self.by_slot = by_slot
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.full = full
+
+    def _queue_read(self, pipe, key: bytes, type_: str) -> bool:
+        """排入第二轮的读取命令；返回 False 表示该类型没有读取命令。"""
+        limit = self.max_items
+        # 多取一个元素 / 一个字节，用来判断是否被截断
+        if type_ == "string":
+            pipe.getrange(key, 0, self.max_bytes)
+        elif type_ == "list":
+            pipe.lrange(key, 0, limit)
+        elif type_ == "zset":
+            pipe.zrange(key, 0, limit, withscores=True)
+        elif type_ == "stream":
+            pipe.xrange(key, count=limit + 1)
+        elif type_ == "hash":
+            pipe.hlen(key)
+        elif type_ == "set":
+            pipe.scard(key)
+        else:
+            return False
+        return True
+
+    def __call__(self, client, keys: Sequence[bytes]) -> List[KeyValue]:
+        if not keys:
+            return []
+        typed = [
+            (key, type_) for key, type_ in zip(keys, key_types(client, keys)) if type_ != "none"
+        ]
+        pipe = client.pipeline(transaction=False)
+        queued: List[Tuple[bytes, str]] = []
+        others = set()
+        strings: List[bytes] = []
+        for key, type_ in typed:
+            if type_ == "string" and self.max_bytes is None:
+                strings.append(key)
+            elif self._queue_read(pipe, key, type_):
+                queued.append((key, type_))
+            else:
+                others.add(key)
+        groups = (group_by_slot(strings) if self.by_slot else [strings]) if strings else []
+        for group in groups:
+            pipe.mget(group)
+        replies = pipe.execute(raise_on_error=False)
+
+        values = {}
+        for (key, type_), reply in zip(queued, replies):
+            reply = _check(reply)
+            if reply is not None:
+                values[key] = (type_, reply)
+        for group, reply in zip(groups, replies[len(queued):]):
+            for key, value in zip(group, _check(reply) or ()):
+                if value is not None:
+                    values[key] = ("string", value)
+        collections = self._read_collections(client, values)
+
+        result = []
+        for key, type_ in typed:
+            if key in collections:
+                result.append(collections[key])
+            elif key in values and values[key][0] not in _SIZED_TYPES:
+                # hash / set 在 HLEN 与 HGETALL 之间被删除时不在 collections 中，跳过
+                result.append(self._entry(client, key, *values[key]))
+            elif key in others:
+                result.append(KeyValue(key, type_, None))
+        return result
+
+    def _read_collections(self, client, values: dict) -> dict:
+        """第三轮：hash / set 按长度选择 HGETALL / SMEMBERS 或 HSCAN / SSCAN 第一页。"""
+        pending = [
+            (key, type_, length)
+            for key, (type_, length) in values.items()
+            if type_ in _SIZED_TYPES
+        ]
+        if not pending:
+            return {}
+        pipe = client.pipeline(transaction=False)
+        for key, type_, length in pending:
+            small = length <= self.max_items
+            if type_ == "hash" and small:
+                pipe.hgetall(key)
+            elif type_ == "hash":
+                pipe.hscan(key, 0, count=self.max_items)
+            elif small:
+                pipe.smembers(key)
+            else:
+                pipe.sscan(key, 0, count=self.max_items)
+        entries = {}
+        for (key, type_, length), reply in zip(pending, pipe.execute(raise_on_error=False)):
+            reply = _check(reply)
+            if not reply:
+                continue
+            if length <= self.max_items:
+                entries[key] = KeyValue(key, type_, list(reply) if type_ == "set" else reply)
+                continue
+            cursor, items = reply
+            items = list(items.items()) if type_ == "hash" else list(items)
+            entry = KeyValue(
+                key, type_, self._pack(type_, items[: self.max_items]), not self.full
+            )
+            if self.full:
+                entry.rest = self._scan_rest(client, key, type_, cursor, items[self.max_items:])
+            entries[key] = entry
+        return entries
+
+    @staticmethod
+    def _pack(type_: str, items: list):
+        return dict(items) if type_ == "hash" else items
+
+    def _entry(self, client, key: bytes, type_: str, value) -> KeyValue:
+        limit = self.max_bytes if type_ == "string" else self.max_items
+        if type_ == "string" and limit is None or len(value) <= limit:
+            return KeyValue(key, type_, value)
+        entry = KeyValue(key, type_, value[:limit], not self.full)
+        if self.full:
+            entry.rest = self._range_rest(client, key, type_, value[limit - 1:limit])
+        return entry
+
+    def _range_rest(self, client, key: bytes, type_: str, last) -> Iterator[Any]:
+        """string / list / zset / stream 按下标或 ID 分段读取剩余部分。"""
+        step = self.max_bytes if type_ == "string" else self.max_items
+        start = step
+        while True:
+            if type_ == "string":
+                chunk = client.getrange(key, start, start + step - 1)
+            elif type_ == "list":
+                chunk = client.lrange(key, start, start + step - 1)
+            elif type_ == "zset":
+                chunk = client.zrange(key, start, start + step - 1, withscores=True)
+            else:
+                # XRANGE 的 "(" 前缀表示不包含上一段最后一个 ID
+                chunk = client.xrange(key, min=b"(" + last[-1][0], count=step)
+                last = chunk
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < step:
+                return
+            start += step
+
+    def _scan_rest(
+        self, client, key: bytes, type_: str, cursor: int, extra: list
+    ) -> Iterator[Any]:
+        """hash / set 从第一页的游标继续 HSCAN / SSCAN。"""
+        if extra:
+            yield self._pack(type_, extra)
+        while cursor:
+            if type_ == "hash":
+                cursor, items = client.hscan(key, cursor, count=self.max_items)
+                items = list(items.items())
+            else:
+                cursor, items = client.sscan(key, cursor, count=self.max_items)
+            if items:
+                yield self._pack(type_, items)
+
+
+def write_values(out, entries: Sequence[KeyValue]) -> int:
+    """按 ``OutputWriter`` 的格式写出一页 ``KeyValue``，返回写出的 key 数。"""
+    for entry in entries:
+        out.write_record(entry.key, entry.type, entry.value, truncated=entry.truncated)
+        if entry.rest is not None:
+            for part, chunk in enumerate(entry.rest, start=2):
+                out.write_record(entry.key, entry.type, chunk, part=part)
+    return len(entries)
+
+
+__all__ = ["KeyValue", "ValueFetcher", "write_values"]
@@ -0,0 +1,170 @@
+"""测试本地连接代理"""
+from __future__ import annotations
+
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from redis.exceptions import ResponseError
+
+from mzrds.agent import connect_agent, needs_direct_connection, request_timeout
+from mzrds.agent_server import AgentServer
+from mzrds.config import ConnectionOptions
+from mzrds.resp import encode_value, read_value
+
+
+@pytest.fixture
+def agent_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "agent.sock"
+        server = AgentServer(path, pool_idle=60, idle_timeout=0)
+        thread = threading.Thread(target=server.serve, daemon=True)
+        thread.start()
+        yield path
+        server.shutdown()
+        thread.join(timeout=5)
+
+
+def test_connect_agent_missing_socket(tmp_path):
+    """测试代理未运行时返回 None（回退直连）"""
+    assert connect_agent(path=tmp_path / "missing.sock") is None
+
+
+def test_connect_agent_stale_socket(tmp_path):
+    """测试残留的 socket 文件不会导致连接失败抛错"""
+    stale = tmp_path / "stale.sock"
+    stale.touch()
+    assert connect_agent(path=stale) is None
+
+
+def test_agent_ping_and_status(agent_path):
+    """测试代理管理命令"""
+    agent = connect_agent(path=agent_path)
+    assert agent is not None
+    try:
+        assert agent.request("PING") is True
+        status = agent.request("STATUS")
+        assert status[0].startswith("pid=")
+    finally:
+        agent.close()
+
+
+def test_agent_socket_permissions(agent_path):
+    """测试 socket 仅对当前用户可读写"""
+    assert agent_path.stat().st_mode & 0o777 == 0o600
+
+
+def test_needs_direct_connection():
+    """测试识别会改变连接状态的命令"""
+    for command in (
+        ["select", "2"],
+        [b"MULTI"],
+        ["client", "setname", "x"],
+        ["Subscribe", "news"],
+        ["monitor"],
+        ["readonly"],
+        ["blpop", "q", "0"],
+        ["XREAD", "COUNT", "1", "BLOCK", "0", "STREAMS", "s", "$"],
+    ):
+        assert needs_direct_connection(command), command
+    for command in (
+        [],
+        ["get", "k"],
+        ["client", "list"],
+        [b"CLIENT"],
+        ["xread", "STREAMS", "s", "0"],
+    ):
+        assert not needs_direct_connection(command), command
+
+
+def test_agent_refuses_stateful_commands(agent_path):
+    """测试代理拒绝会污染共享连接的命令，且不会为此建立连接池"""
+    agent = connect_agent(ConnectionOptions(host="127.0.0.1", port=1), path=agent_path)
+    try:
+        with pytest.raises(ResponseError, match="不能经代理执行"):
+            agent.execute_command("SELECT", "2")
+        assert len(agent.request("STATUS")) == 1
+    finally:
+        agent.close()
+
+
+class _Direct:
+    def __init__(self):
+        self.closed = False
+
+    def execute_command(self, *args):
+        return b"direct"
+
+    def close(self):
+        self.closed = True
+
+
+def test_stalled_agent_falls_back_to_direct(tmp_path):
+    """测试代理握手后不再回复时按 socket_timeout 超时，改用直连执行"""
+    path = tmp_path / "stalled.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen(1)
+    accepted = []
+
+    def serve():
+        conn, _ = listener.accept()
+        accepted.append(conn)
+        rfile = conn.makefile("rb")
+        read_value(rfile)
+        conn.sendall(encode_value(True))
+        read_value(rfile)  # 之后的请求不再回复
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    direct = _Direct()
+    options = ConnectionOptions(socket_timeout=0.1)
+    agent = connect_agent(options, path=path, fallback=lambda: direct)
+    try:
+        assert agent.execute_command("GET", "k") == b"direct"
+        assert agent.execute_command("GET", "k") == b"direct"
+    finally:
+        agent.close()
+        listener.close()
+        for conn in accepted:
+            conn.close()
+    assert direct.closed
+
+
+def test_request_timeout():
+    """测试请求超时：配置了 socket_timeout 时留出余量，否则使用固定上限"""
+    assert request_timeout(ConnectionOptions(socket_timeout=2.0)) == 3.0
+    assert request_timeout(ConnectionOptions()) == 30.0
+    assert request_timeout(None) == 30.0
+
+
+def test_pools_keep_clients_with_running_requests():
+    """测试仍有请求在执行的客户端不会因空闲被关闭，归还后才开始计算空闲"""
+    from mzrds.agent import options_key
+    from mzrds.agent_server import _Pools
+
+    pools = _Pools(pool_idle=0)
+    key = options_key(ConnectionOptions(host="127.0.0.1", port=1))
+    with pools.borrow(key) as client:
+        pools.evict_idle()
+        assert pools.describe()[0].endswith("active=1")
+        with pools.borrow(key) as again:
+            assert again is client
+    pools.evict_idle()
+    assert pools.describe() == []
+
+
+@pytest.mark.integration
+def test_agent_exec(agent_path, redis_options):
+    """测试通过代理执行命令并复用连接池"""
+    agent = connect_agent(redis_options, path=agent_path)
+    try:
+        assert agent.execute_command("SET", "test:agent", "v") is True
+        assert agent.execute_command("GET", "test:agent") == b"v"
+        agent.execute_command("DEL", "test:agent")
+        assert len(agent.request("STATUS")) == 2
+    finally:
+        agent.close()
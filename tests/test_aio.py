@@ -0,0 +1,125 @@
+"""测试基于 redis.asyncio 的异步引擎"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from mzrds.aio import gather_bounded, get_async_client, iter_async_scan_pages
+from mzrds.config import ConnectionOptions
+
+
+class _Node:
+    """只实现 SCAN 的异步内存节点"""
+
+    def __init__(self, name, keys, fail=False):
+        self.name = name
+        self.keys = keys
+        self.fail = fail
+        self.connection_pool = SimpleNamespace(
+            connection_kwargs={"host": name, "port": 6379}
+        )
+
+    def page(self, cursor, count):
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        end = cursor + count
+        return (end if end < len(self.keys) else 0), self.keys[cursor:end]
+
+    async def scan(self, cursor=0, match=None, count=None, _type=None):
+        await asyncio.sleep(0)
+        return self.page(cursor, count)
+
+
+class _Cluster:
+    """模拟 redis.asyncio.cluster.RedisCluster 的 target_nodes 扫描"""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    async def initialize(self):
+        return self
+
+    def get_primaries(self):
+        return self.nodes
+
+    async def scan(self, cursor=0, match=None, count=None, _type=None, target_nodes=None):
+        await asyncio.sleep(0)
+        cursor, keys = target_nodes.page(cursor, count)
+        return {target_nodes.name: cursor}, keys
+
+
+async def _collect(client, **kwargs):
+    return [page async for page in iter_async_scan_pages(client, **kwargs)]
+
+
+def test_get_async_client_does_not_connect():
+    """测试按连接参数创建单机与 Cluster 异步客户端（不建立连接）"""
+    from redis.asyncio import Redis
+    from redis.asyncio.cluster import RedisCluster
+
+    standalone = get_async_client(ConnectionOptions(host="h", port=1, db=2))
+    assert isinstance(standalone, Redis)
+    assert standalone.connection_pool.connection_kwargs["db"] == 2
+    cluster = get_async_client(ConnectionOptions(host="h", port=1, db=2, cluster=True))
+    assert isinstance(cluster, RedisCluster)
+
+
+def test_gather_bounded_keeps_order_and_limit():
+    """测试并发数不超过上限且结果保持输入顺序"""
+    running = peak = 0
+
+    async def job(value):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001 * (5 - value % 5))
+        running -= 1
+        return value
+
+    result = asyncio.run(gather_bounded((job(i) for i in range(20)), limit=3))
+    assert result == list(range(20))
+    assert peak == 3
+
+
+def test_async_scan_standalone():
+    """测试单机模式逐页返回并以游标 0 结束"""
+    node = _Node("a", [f"k{i}".encode() for i in range(5)])
+    pages = asyncio.run(_collect(node, count=2))
+    assert [len(page.keys) for page in pages] == [2, 2, 1]
+    assert pages[-1].cursor == 0
+    assert pages[0].node == "a:6379"
+
+
+def test_async_scan_cluster_merges_and_processes():
+    """测试 Cluster 模式合并所有主节点并按页执行异步回调"""
+    nodes = [_Node(f"n{n}", [f"n{n}:{i}".encode() for i in range(7)]) for n in range(3)]
+
+    async def process(client, keys):
+        return len(keys)
+
+    pages = asyncio.run(_collect(_Cluster(nodes), count=3, process=process, max_pending=1))
+    keys = sorted(key for page in pages for key in page.keys)
+    assert keys == sorted(key for node in nodes for key in node.keys)
+    assert {page.node for page in pages} == {"n0", "n1", "n2"}
+    assert sum(page.result for page in pages) == 21
+
+
+def test_async_scan_cluster_propagates_errors():
+    """测试节点协程中的异常会在消费端抛出"""
+    nodes = [_Node("ok", [b"a"] * 10), _Node("bad", [], fail=True)]
+    with pytest.raises(RuntimeError, match="bad down"):
+        asyncio.run(_collect(_Cluster(nodes), count=1))
+
+
+def test_async_scan_cluster_parallelism():
+    """测试 parallelism 限制同时扫描的主节点数"""
+    nodes = [_Node(f"n{n}", [f"n{n}:{i}".encode() for i in range(4)]) for n in range(3)]
+    pages = asyncio.run(_collect(_Cluster(nodes), count=1, parallelism=1))
+    order = [page.node for page in pages]
+    # 同一时间只有一个节点在扫描：每个节点的页连续出现
+    assert order == sorted(order, key=order.index)
+    assert [order.count(name) for name in ("n0", "n1", "n2")] == [4, 4, 4]
+    pages = asyncio.run(_collect(_Cluster(nodes), count=1))
+    assert pages[0].node != pages[1].node
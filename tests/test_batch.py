@@ -0,0 +1,113 @@
+"""测试批量命令解析与 pipeline 执行"""
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from mzrds.batch import execute_batch, iter_commands, parse_command_line
+from mzrds.client import get_client
+
+
+def test_parse_command_line_quotes():
+    """测试引号参数的拆分"""
+    assert parse_command_line('set "my key" \'hello world\'') == [
+        "set",
+        "my key",
+        "hello world",
+    ]
+
+
+def test_parse_command_line_unbalanced_quote():
+    """测试未闭合的引号"""
+    with pytest.raises(ValueError):
+        parse_command_line('set key "value')
+
+
+def test_iter_commands_inline():
+    """测试按行读取 inline 命令，空行被忽略"""
+    stream = io.BytesIO(b"set a 1\n\nget a\r\n")
+    assert list(iter_commands(stream)) == [["set", "a", "1"], ["get", "a"]]
+
+
+def test_iter_commands_resp():
+    """测试 RESP 格式输入（二进制安全）"""
+    stream = io.BytesIO(b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$4\r\n\x00\r\n\xff\r\n")
+    assert list(iter_commands(stream)) == [[b"SET", b"k", b"\x00\r\n\xff"]]
+
+
+def test_iter_commands_mixed():
+    """测试 RESP 与 inline 命令混合输入"""
+    stream = io.BytesIO(b"*1\r\n$4\r\nPING\r\nget a\n")
+    assert list(iter_commands(stream)) == [[b"PING"], ["get", "a"]]
+
+
+def test_iter_commands_truncated_resp():
+    """测试截断的 RESP 输入"""
+    stream = io.BytesIO(b"*2\r\n$3\r\nGET\r\n$5\r\nab")
+    with pytest.raises(ValueError):
+        list(iter_commands(stream))
+
+
+def test_iter_commands_error_line_number():
+    """测试解析错误带有命令开始的行号（RESP 参数中的换行也计入）"""
+    stream = io.BytesIO(b"get a\n*1\r\n$3\r\na\nb\r\nset k \"v\n")
+    with pytest.raises(ValueError, match="第 6 行"):
+        list(iter_commands(stream))
+
+
+def test_iter_commands_invalid_utf8_inline():
+    """测试 inline 命令中无法解码的字节按原样传递"""
+    stream = io.BytesIO(b"set k \xff\xfe\nget k\n")
+    assert list(iter_commands(stream)) == [[b"set", b"k", b"\xff\xfe"], ["get", "k"]]
+
+
+class _Pipeline:
+    def __init__(self, executed):
+        self.executed = executed
+        self.commands = []
+
+    def execute_command(self, *parts):
+        self.commands.append(parts)
+
+    def execute(self, raise_on_error=True):
+        self.executed.extend(self.commands)
+        return [b"OK"] * len(self.commands)
+
+
+class _Client:
+    def __init__(self):
+        self.executed = []
+
+    def pipeline(self, transaction=False):
+        return _Pipeline(self.executed)
+
+
+def test_execute_batch_runs_pending_chunk_before_error():
+    """测试输入中途出错时，已读到的命令先执行完再抛出错误"""
+    client = _Client()
+    stream = io.BytesIO(b"set a 1\nset b 2\nset c 3\nset d \"4\n")
+    replies = []
+    with pytest.raises(ValueError, match="第 4 行"):
+        for reply in execute_batch(client, iter_commands(stream), chunk_size=2):
+            replies.append(reply)
+    assert len(replies) == 3
+    assert [parts[1] for parts in client.executed] == ["a", "b", "c"]
+
+
+@pytest.mark.integration
+def test_execute_batch(redis_options):
+    """测试分批 pipeline 执行并按顺序返回回复"""
+    client = get_client(redis_options)
+    try:
+        commands = [["SET", f"test:batch:{i}", str(i)] for i in range(5)]
+        commands += [["GET", f"test:batch:{i}"] for i in range(5)]
+        commands.append(["INCR", "test:batch:missing", "extra"])
+        replies = list(execute_batch(client, commands, chunk_size=3))
+        assert len(replies) == 11
+        assert replies[5:10] == [str(i).encode() for i in range(5)]
+        assert isinstance(replies[10], Exception)
+
+        client.delete(*[f"test:batch:{i}" for i in range(5)])
+    finally:
+        client.close()
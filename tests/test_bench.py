@@ -0,0 +1,106 @@
+"""测试压测的命令生成与执行"""
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+from redis.exceptions import ResponseError
+
+from mzrds.bench import builtin_workload, custom_workload, run_async, run_threads
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def execute_command(self, *args):
+        self.commands.append(args)
+
+    def execute(self, raise_on_error=True):
+        return [self.client.reply(args) for args in self.commands]
+
+
+class _Client:
+    """记录收到的命令，GET 返回错误回复"""
+
+    def __init__(self):
+        self.commands = []
+
+    def reply(self, args):
+        self.commands.append(args)
+        return ResponseError("boom") if args[0] == "GET" else b"OK"
+
+    def ping(self):
+        return True
+
+    def execute_command(self, *args):
+        reply = self.reply(args)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _AsyncPipeline(_Pipeline):
+    async def execute(self, raise_on_error=True):
+        return super().execute(raise_on_error)
+
+
+class _AsyncClient(_Client):
+    async def ping(self):
+        return True
+
+    async def execute_command(self, *args):
+        return super().execute_command(*args)
+
+    def pipeline(self, transaction=True):
+        return _AsyncPipeline(self)
+
+
+def test_builtin_workload_uses_typed_keys():
+    """测试内置测试按类型使用不同前缀并限制在 keyspace 内"""
+    rng = random.Random(1)
+    set_cmd = builtin_workload("set", 10, 4, prefix="p:")(rng)
+    assert set_cmd[0] == "SET" and set_cmd[2] == b"xxxx"
+    assert set_cmd[1].startswith("p:key:") and int(set_cmd[1][6:]) < 10
+    zadd = builtin_workload("zadd", 10, 4, prefix="p:")(rng)
+    assert zadd[1].startswith("p:zset:")
+    with pytest.raises(ValueError):
+        builtin_workload("nope", 10, 4)
+
+
+def test_custom_workload_replaces_placeholder():
+    """测试自定义命令中的 __rand_int__ 被替换，其余参数不变"""
+    factory = custom_workload(["hset", "user:__rand_int__", "name", "a"], 5)
+    args = factory(random.Random(0))
+    assert args[0] == "hset" and args[2:] == ["name", "a"]
+    assert len(args[1]) == len("user:") + 12 and int(args[1][5:]) < 5
+    assert custom_workload(["ping"], 5)(random.Random(0)) == ["ping"]
+
+
+@pytest.mark.parametrize("pipeline", [1, 7])
+def test_run_threads_consumes_exact_budget(pipeline):
+    """测试多线程压测恰好发送请求总数并统计错误回复"""
+    client = _Client()
+    result = run_threads(
+        client, "GET", builtin_workload("get", 100, 3), 100, 4, pipeline, seed=1
+    )
+    assert result.requests == 100 == len(client.commands)
+    assert result.errors == 100
+    assert result.latency.count == 100
+
+
+@pytest.mark.parametrize("pipeline", [1, 7])
+def test_run_async_consumes_exact_budget(pipeline):
+    """测试 asyncio 压测恰好发送请求总数"""
+    client = _AsyncClient()
+    result = asyncio.run(
+        run_async(client, "SET", builtin_workload("set", 100, 3), 50, 8, pipeline)
+    )
+    assert result.requests == 50 == len(client.commands)
+    assert result.errors == 0
+    assert result.throughput > 0
@@ -0,0 +1,88 @@
+"""测试按模式批量删除 / 设置过期"""
+from __future__ import annotations
+
+import pytest
+from redis.exceptions import ResponseError
+
+from mzrds.client import get_client
+from mzrds.commands.bulk import BulkAction, _expire, _unlink
+from mzrds.scanner import iter_scan_pages
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def unlink(self, *keys):
+        self.commands.append(("UNLINK", keys))
+
+    def expire(self, key, ttl):
+        self.commands.append(("EXPIRE", (key,)))
+
+    def execute(self, raise_on_error=True):
+        replies = []
+        for name, keys in self.commands:
+            if any(key in self.client.broken for key in keys):
+                error = ResponseError("WRONGTYPE Operation against a key")
+                if raise_on_error:
+                    raise error
+                replies.append(error)
+            else:
+                replies.append(len(keys) if name == "UNLINK" else 1)
+        self.client.executed.extend(self.commands)
+        return replies
+
+
+class _Client:
+    """只记录 pipeline 命令的客户端，``broken`` 中的 key 回复错误"""
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.executed = []
+
+    def pipeline(self, transaction=False):
+        return _Pipeline(self)
+
+
+def test_bulk_action_counts_errors():
+    """测试单条命令出错时不中断，其余结果照常计数"""
+    client = _Client(broken=[b"b"])
+    action = BulkAction(_expire(60), by_slot=False, rate=None, max_latency=None)
+    assert action(client, [b"a", b"b", b"c"]) == 2
+    assert action.errors == 1
+    assert "WRONGTYPE" in str(action.last_error)
+    assert len(client.executed) == 3
+
+
+def test_bulk_unlink_groups_by_slot():
+    """测试 Cluster 模式下 UNLINK 按 slot 分组发送"""
+    client = _Client()
+    action = BulkAction(_unlink, by_slot=True, rate=None, max_latency=None)
+    keys = [b"{u1}:a", b"{u1}:b", b"{u2}:a"]
+    assert action(client, keys) == 3
+    assert sorted(keys for _, keys in client.executed) == [
+        (b"{u1}:a", b"{u1}:b"), (b"{u2}:a",)
+    ]
+    assert action.errors == 0
+
+
+@pytest.mark.integration
+def test_bulk_expire_and_unlink(redis_options):
+    """测试每页一个 pipeline 的 EXPIRE 与 UNLINK"""
+    client = get_client(redis_options)
+    try:
+        for i in range(20):
+            client.set(f"test:bulk:{i}", "v")
+
+        expire = BulkAction(_expire(100), by_slot=False, rate=None, max_latency=None)
+        pages = iter_scan_pages(client, match="test:bulk:*", count=5, process=expire)
+        assert sum(page.result or 0 for page in pages) == 20
+        assert 0 < client.ttl("test:bulk:0") <= 100
+
+        unlink = BulkAction(_unlink, by_slot=True, rate=10000, max_latency=0.5)
+        pages = iter_scan_pages(client, match="test:bulk:*", count=5, process=unlink)
+        assert sum(page.result or 0 for page in pages) == 20
+        assert client.exists("test:bulk:0") == 0
+    finally:
+        client.close()
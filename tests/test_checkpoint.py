@@ -0,0 +1,64 @@
+"""测试扫描检查点的保存与恢复"""
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from mzrds.checkpoint import Checkpoint, CheckpointError
+
+TASK = {"command": "scan", "pattern": "user:*"}
+
+
+def test_save_and_load(tmp_path):
+    """测试游标与计数写入后能原样读回，完成的节点记为 None"""
+    path = tmp_path / "scan.ckpt"
+    checkpoint = Checkpoint(path, TASK)
+    checkpoint.commit("a:6379", 42, {"scanned": 10})
+    checkpoint.commit("b:6379", 0, {"scanned": 5})
+    checkpoint.commit("a:6379", 77, {"scanned": 3})
+    checkpoint.save()
+
+    loaded = Checkpoint.load(path, TASK)
+    assert loaded.resume == {"a:6379": 77, "b:6379": None}
+    assert loaded.counters == {"scanned": 18}
+    assert not loaded.finished
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_commit_saves_after_interval(tmp_path):
+    """测试到达间隔时自动落盘"""
+    path = tmp_path / "scan.ckpt"
+    checkpoint = Checkpoint(path, TASK, interval=0)
+    checkpoint.commit("a:6379", 0)
+    assert json.loads(path.read_text())["cursors"] == {"a:6379": None}
+    assert Checkpoint.load(path, TASK).finished
+
+
+def test_load_rejects_other_task(tmp_path):
+    """测试恢复时参数与检查点不一致"""
+    path = tmp_path / "scan.ckpt"
+    Checkpoint(path, TASK).save()
+    with pytest.raises(CheckpointError):
+        Checkpoint.load(path, {"command": "scan", "pattern": "order:*"})
+
+
+def test_load_missing_or_corrupt(tmp_path):
+    """测试检查点文件不存在或损坏"""
+    with pytest.raises(CheckpointError):
+        Checkpoint.load(tmp_path / "missing.ckpt", TASK)
+    path = tmp_path / "bad.ckpt"
+    path.write_text("{not json")
+    with pytest.raises(CheckpointError):
+        Checkpoint.load(path, TASK)
+
+
+def test_finished_requires_all_tracked_nodes(tmp_path):
+    """测试只有登记过的节点全部完成才算结束"""
+    checkpoint = Checkpoint(tmp_path / "scan.ckpt", TASK)
+    checkpoint.track(["a:6379", "b:6379"])
+    checkpoint.commit("a:6379", 0)
+    assert not checkpoint.finished
+    assert checkpoint.resume == {"a:6379": None, "b:6379": 0}
+    checkpoint.commit("b:6379", 0)
+    assert checkpoint.finished
@@ -3,10 +3,60 @@ from __future__ import annotations
 
 import pytest
 
-from mzrds.client import get_client
+from mzrds.client import build_retry, get_client, pool_workers
 from mzrds.config import ConnectionOptions
 
 
+POOL_OPTIONS = ConnectionOptions(
+    host="h",
+    port=1,
+    socket_timeout=2.0,
+    socket_connect_timeout=1.0,
+    socket_keepalive=True,
+    health_check_interval=30,
+    max_connections=8,
+    retries=3,
+    retry_backoff=0.05,
+)
+
+
+def test_pool_settings_reach_connection_pool():
+    """测试套接字、健康检查与连接池设置传给 Redis 的连接池（不建立连接）"""
+    client = get_client(POOL_OPTIONS)
+    pool = client.connection_pool
+    kwargs = pool.connection_kwargs
+    assert kwargs["socket_timeout"] == 2.0
+    assert kwargs["socket_connect_timeout"] == 1.0
+    assert kwargs["socket_keepalive"] is True
+    assert kwargs["health_check_interval"] == 30
+    assert pool.max_connections == 8
+    assert kwargs["retry"].get_retries() == 3
+
+
+def test_pool_settings_reach_cluster_and_async_clients():
+    """测试 Cluster 与异步客户端使用同样的设置"""
+    from redis.asyncio.retry import Retry as AsyncRetry
+
+    from mzrds.aio import get_async_client
+    from mzrds.client import _cluster_kwargs
+
+    kwargs = _cluster_kwargs(POOL_OPTIONS)
+    assert kwargs["max_connections"] == 8 and "db" not in kwargs
+    client = get_async_client(POOL_OPTIONS)
+    assert client.connection_pool.connection_kwargs["socket_timeout"] == 2.0
+    assert isinstance(build_retry(POOL_OPTIONS, asyncio=True), AsyncRetry)
+
+
+def test_retry_and_pool_defaults():
+    """测试未设置时沿用 redis-py 默认值，以及并发数受连接池上限约束"""
+    options = ConnectionOptions()
+    assert build_retry(options) is None
+    assert build_retry(ConnectionOptions(retries=0)).get_retries() == 0
+    assert pool_workers(options, 50) == 50
+    assert pool_workers(POOL_OPTIONS, 50) == 8
+    assert pool_workers(POOL_OPTIONS, 4) == 4
+
+
 @pytest.mark.integration
 def test_create_redis_client(redis_options):
     """测试创建普通 Redis 客户端"""
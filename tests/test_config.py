@@ -107,3 +107,17 @@ def test_merge_options_with_none_base():
     assert merged.port == 6380
     assert merged.db == 0  # 使用默认值
 
+
+
+def test_pool_settings_are_persisted(config_store):
+    """测试套接字与连接池设置随配置保存，未设置的字段不写入文件"""
+    opts = ConnectionOptions(socket_timeout=2.5, socket_keepalive=True, max_connections=16)
+    assert "retries" not in opts.to_dict()
+    config_store.save_profile("pool", opts)
+    retrieved = config_store.get_profile("pool")
+    assert retrieved.socket_timeout == 2.5
+    assert retrieved.socket_keepalive is True
+    assert retrieved.max_connections == 16
+    assert retrieved.health_check_interval is None
+    merged = merge_options(retrieved, {"socket_timeout": 5.0, "max_connections": None})
+    assert (merged.socket_timeout, merged.max_connections) == (5.0, 16)
@@ -0,0 +1,135 @@
+"""测试导出文件格式与 DUMP / RESTORE 批量操作"""
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from mzrds.client import get_client
+from mzrds.dump import DumpFormatError, DumpWriter, dump_keys, iter_records, restore_records
+
+RECORDS = [
+    (b"user:1", -1, b"\x00\x05hello\x0b\x00"),
+    (b"\xff\x00binary", 12345, b"\x00" * 64),
+]
+
+
+def _written(compress: bool) -> io.BufferedReader:
+    buffer = io.BytesIO()
+    writer = DumpWriter(buffer, compress=compress)
+    writer.write_records(RECORDS[:1])
+    writer.write_records(RECORDS[1:])
+    writer.close()
+    assert writer.count == 2
+    return io.BufferedReader(io.BytesIO(buffer.getvalue()))
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_roundtrip(compress):
+    """测试写入后能按顺序读回（含 gzip 自动识别）"""
+    assert list(iter_records(_written(compress))) == RECORDS
+
+
+def test_bad_magic():
+    """测试非导出文件"""
+    with pytest.raises(DumpFormatError):
+        list(iter_records(io.BufferedReader(io.BytesIO(b"not a dump file"))))
+
+
+def test_truncated_record():
+    """测试被截断的记录"""
+    data = _written(False).read()
+    with pytest.raises(DumpFormatError):
+        list(iter_records(io.BufferedReader(io.BytesIO(data[:-3]))))
+
+
+@pytest.mark.parametrize("data", [b"", b"MZ", b"MZRDSDMP"])
+def test_short_header(data):
+    """测试空文件与只有魔数的文件"""
+    with pytest.raises(DumpFormatError):
+        list(iter_records(io.BufferedReader(io.BytesIO(data))))
+
+
+class _Trickle(io.RawIOBase):
+    """每次 read 只返回 1 个字节，模拟慢速管道"""
+
+    def __init__(self, data: bytes):
+        self._data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._data.read(1)
+        buffer[: len(data)] = data
+        return len(data)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_trickling_pipe(compress):
+    """测试开头的字节分多次到达时仍能识别 gzip"""
+    stream = _Trickle(_written(compress).read())
+    assert list(iter_records(io.BufferedReader(stream, buffer_size=1))) == RECORDS
+
+
+class _Pipeline:
+    """按调用顺序返回预置回复的 pipeline"""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.raise_on_error = None
+
+    def dump(self, key):
+        pass
+
+    def pttl(self, key):
+        pass
+
+    def execute(self, raise_on_error=True):
+        self.raise_on_error = raise_on_error
+        return self.replies
+
+
+class _Client:
+    def __init__(self, replies):
+        self.pipe = _Pipeline(replies)
+
+    def pipeline(self, transaction=False):
+        return self.pipe
+
+
+def test_dump_keys_skips_errors():
+    """测试单个 key 的 DUMP 错误被跳过并报告，不影响同页其他 key"""
+    error = Exception("ERR module type cannot be dumped")
+    client = _Client([b"v1", -1, error, -1, None, -2, b"v4", 500])
+    failed = []
+    records = dump_keys(
+        client, [b"a", b"b", b"c", b"d"], on_error=lambda key, exc: failed.append((key, exc))
+    )
+    assert records == [(b"a", -1, b"v1"), (b"d", 500, b"v4")]
+    assert failed == [(b"b", error)]
+    assert client.pipe.raise_on_error is False
+
+
+@pytest.mark.integration
+def test_dump_and_restore(redis_options):
+    """测试 pipeline DUMP/PTTL 后再 RESTORE"""
+    client = get_client(redis_options)
+    try:
+        client.set("test:dump:a", "1")
+        client.set("test:dump:b", "2", px=600000)
+        records = dump_keys(client, [b"test:dump:a", b"test:dump:b", b"test:dump:missing"])
+        assert [key for key, _, _ in records] == [b"test:dump:a", b"test:dump:b"]
+        assert records[0][1] == -1 and records[1][1] > 0
+
+        client.delete("test:dump:a", "test:dump:b")
+        replies = restore_records(client, records)
+        assert not any(isinstance(reply, Exception) for reply in replies)
+        assert client.get("test:dump:a") == b"1"
+        assert client.pttl("test:dump:b") > 0
+
+        replies = restore_records(client, records, replace=False)
+        assert all(isinstance(reply, Exception) for reply in replies)
+        client.delete("test:dump:a", "test:dump:b")
+    finally:
+        client.close()
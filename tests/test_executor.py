@@ -62,7 +62,11 @@ def test_decode_value_bytes():
     from mzrds.executor import decode_value
     
     assert decode_value(b"hello") == "hello"
-    assert decode_value(b"\xff\xfe") == "fffe"  # 无法解码的字节转为 hex
+    # 无法解码或不可打印的字节按 redis-cli 的方式转义
+    assert decode_value(b"\xff\xfe") == '"\\xff\\xfe"'
+    assert decode_value(b'a\x00"\n') == '"a\\x00\\"\\n"'
+    assert decode_value("中文".encode()) == "中文"
+    assert decode_value(memoryview(b"view")) == "view"
 
 
 def test_decode_value_list():
@@ -0,0 +1,136 @@
+"""测试 scan 的客户端过滤"""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from redis.exceptions import ResponseError
+
+from mzrds.filters import IdleTimeUnavailable, KeyFilter
+
+# key -> (类型, 长度, MEMORY USAGE, PTTL, IDLETIME)
+KEYS = {
+    b"user:1": ("string", 10, 60, -1, 5),
+    b"user:2": ("hash", 200, 9000, 30000, 7200),
+    b"user:x": ("list", 3, 120, 900000, 100),
+    b"gone": ("none", 0, None, -2, None),
+}
+LENGTH = {"STRLEN": "string", "HLEN": "hash", "LLEN": "list"}
+
+
+class _Pipeline:
+    def __init__(self, client):
+        self.client = client
+        self.replies = []
+
+    def _reply(self, key, column):
+        return KEYS[key][column]
+
+    def type(self, key):
+        self.replies.append(self._reply(key, 0).encode())
+
+    def execute_command(self, name, key):
+        type_, length = KEYS[key][:2]
+        self.replies.append(
+            length if LENGTH[name] == type_ else Exception("WRONGTYPE Operation")
+        )
+
+    def memory_usage(self, key):
+        self.replies.append(self._reply(key, 2))
+
+    def pttl(self, key):
+        self.replies.append(self._reply(key, 3))
+
+    def object(self, infotype, key):
+        self.replies.append(self._reply(key, 4))
+
+    def execute(self, raise_on_error=True):
+        self.client.round_trips += 1
+        return self.replies
+
+
+class _AsyncPipeline(_Pipeline):
+    async def execute(self, raise_on_error=True):
+        return super().execute(raise_on_error)
+
+
+class _Client:
+    def __init__(self, pipeline=_Pipeline):
+        self.round_trips = 0
+        self._pipeline = pipeline
+
+    def pipeline(self, transaction=False):
+        return self._pipeline(self)
+
+
+def _run(key_filter, keys=tuple(KEYS)):
+    client = _Client()
+    return key_filter(client, list(keys)), client.round_trips
+
+
+def test_no_conditions():
+    """测试没有客户端条件时不构造过滤器"""
+    assert KeyFilter.build() is None
+
+
+def test_regex_is_local():
+    """测试正则只在本地匹配，不产生额外请求"""
+    assert _run(KeyFilter.build(regex=r"^user:\d+$")) == ([b"user:1", b"user:2"], 0)
+
+
+def test_ttl_range():
+    """测试 TTL 范围：没有过期时间视为无穷大，已删除的 key 被排除"""
+    assert _run(KeyFilter.build(ttl=(None, 60)))[0] == [b"user:2"]
+    assert _run(KeyFilter.build(ttl=(100, None)))[0] == [b"user:1", b"user:x"]
+
+
+def test_combined_conditions_use_one_pipeline():
+    """测试多个条件在同一个 pipeline 中查询"""
+    key_filter = KeyFilter.build(size=(100, None), idle=(60, None), ttl=(None, 1000))
+    assert _run(key_filter) == ([b"user:2", b"user:x"], 1)
+
+
+class _LfuPipeline(_Pipeline):
+    """maxmemory-policy 为 LFU：OBJECT IDLETIME 回复错误"""
+
+    def object(self, infotype, key):
+        self.replies.append(
+            ResponseError("An LFU maxmemory policy is selected, idle time not tracked.")
+        )
+
+
+def test_idle_under_lfu_policy():
+    """测试 LFU 策略下按空闲时间过滤给出明确的错误，而不是原样抛出"""
+    client = _Client(_LfuPipeline)
+    with pytest.raises(IdleTimeUnavailable, match="LFU"):
+        KeyFilter.build(idle=(60, None))(client, [b"user:1"])
+
+
+def test_size_by_length_with_type():
+    """测试指定类型时直接使用对应的长度命令"""
+    key_filter = KeyFilter.build(size=(100, None), size_by="length", type_="hash")
+    assert _run(key_filter, [b"user:2"]) == ([b"user:2"], 1)
+    # 类型在两次查询之间改变（WRONGTYPE）视为不匹配
+    assert _run(key_filter, [b"user:1"]) == ([], 1)
+
+
+def test_size_by_length_without_type():
+    """测试未指定类型时先查 TYPE，再按各自的长度命令比较"""
+    key_filter = KeyFilter.build(size=(5, None), size_by="length")
+    assert _run(key_filter) == ([b"user:1", b"user:2"], 2)
+
+
+def test_invalid_arguments():
+    """测试无效的正则和没有长度命令的类型"""
+    with pytest.raises(ValueError):
+        KeyFilter.build(regex="(")
+    with pytest.raises(ValueError):
+        KeyFilter.build(size=(1, None), size_by="length", type_="ReJSON-RL")
+
+
+def test_filter_async():
+    """测试 asyncio 版本与同步版本结果一致"""
+    key_filter = KeyFilter.build(regex="user", size=(100, None), idle=(60, None))
+    client = _Client(_AsyncPipeline)
+    result = asyncio.run(key_filter.filter_async(client, list(KEYS)))
+    assert result == [b"user:2", b"user:x"]
@@ -0,0 +1,114 @@
+"""测试 INFO 解析与 top 的速率计算"""
+from __future__ import annotations
+
+import pytest
+
+from mzrds.commands.top import TOTAL, _cells, _line, _rows
+from mzrds.info import compute_rates, parse_info
+
+RAW = b"""# Server
+redis_version:7.2.4
+uptime_in_seconds:100
+
+# Clients
+connected_clients:5
+blocked_clients:1
+
+# Memory
+used_memory:1048576
+used_memory_rss:2097152
+mem_fragmentation_ratio:2.00
+
+# Stats
+total_connections_received:10
+total_commands_processed:1000
+total_net_input_bytes:5000
+total_net_output_bytes:8000
+evicted_keys:0
+expired_keys:3
+keyspace_hits:80
+keyspace_misses:20
+
+# Replication
+role:master
+
+# Keyspace
+db0:keys=10,expires=2,avg_ttl=0
+db3:keys=5,expires=1,avg_ttl=100
+"""
+
+
+def _sample(**values):
+    sample = {"keys": 0, "expires": 0, "role": "master"}
+    sample.update(values)
+    return sample
+
+
+def test_parse_info_keeps_needed_fields():
+    """只提取数值字段、role 与各库 key 数之和"""
+    sample = parse_info(RAW.replace(b"\n", b"\r\n"))
+    assert sample["role"] == "master"
+    assert sample["total_commands_processed"] == 1000
+    assert sample["mem_fragmentation_ratio"] == 2.0
+    assert sample["keys"] == 15
+    assert sample["expires"] == 3
+    assert "redis_version" not in sample
+
+
+def test_compute_rates():
+    """按差值与间隔计算每秒速率与区间命中率"""
+    before = parse_info(RAW)
+    after = dict(
+        before,
+        total_commands_processed=3000.0,
+        keyspace_hits=170.0,
+        keyspace_misses=30.0,
+        total_net_input_bytes=7000.0,
+        evicted_keys=4.0,
+    )
+    rates = compute_rates(before, after, 2.0)
+    assert rates["ops_per_sec"] == 1000
+    assert rates["hit_ratio"] == pytest.approx(0.9)
+    assert rates["net_in_per_sec"] == 1000
+    assert rates["net_out_per_sec"] == 0
+    assert rates["evicted_per_sec"] == 2
+    assert rates["fragmentation"] == 2.0
+    assert rates["keys"] == 15
+
+
+def test_compute_rates_counter_reset():
+    """计数器变小（重启或 RESETSTAT）时从 0 开始计算，没有查找时命中率为 None"""
+    before = _sample(total_commands_processed=5000.0)
+    after = _sample(total_commands_processed=50.0, used_memory=100.0, used_memory_rss=150.0)
+    rates = compute_rates(before, after, 1.0)
+    assert rates["ops_per_sec"] == 50
+    assert rates["hit_ratio"] is None
+    assert rates["fragmentation"] == 1.5
+
+
+def test_rows_total_counts_primaries_only():
+    """多个节点时追加合计行，只汇总主节点；采样失败的节点单独显示错误"""
+    previous = [
+        ("a", _sample(total_commands_processed=0.0, keys=1), 0.0),
+        ("b", _sample(total_commands_processed=0.0, keys=2), 0.0),
+        ("c", _sample(total_commands_processed=0.0, keys=2, role="slave"), 0.0),
+        ("d", _sample(), 0.0),
+    ]
+    current = [
+        ("a", _sample(total_commands_processed=100.0, keys=1), 1.0),
+        ("b", _sample(total_commands_processed=300.0, keys=2), 1.0),
+        ("c", _sample(total_commands_processed=50.0, keys=2, role="slave"), 1.0),
+        ("d", ConnectionError("refused"), 1.0),
+    ]
+    rows = _rows(previous, current)
+    assert [row["node"] for row in rows] == ["a", "b", "c", "d", TOTAL]
+    assert rows[3] == {"node": "d", "error": "refused"}
+    assert rows[-1]["ops_per_sec"] == 400
+    assert rows[-1]["keys"] == 3
+    assert "400" in _line(_cells(rows[-1]))
+
+
+def test_rows_single_node_without_total():
+    """单节点不输出合计行"""
+    rows = _rows([("a", _sample(), 0.0)], [("a", _sample(), 1.0)])
+    assert [row["node"] for row in rows] == ["a"]
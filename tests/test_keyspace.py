@@ -0,0 +1,135 @@
+"""测试 bigkeys / memkeys / stats / hotkeys 的页内 pipeline 查询"""
+from __future__ import annotations
+
+import pytest
+
+from mzrds.client import get_client
+from redis.exceptions import ResponseError
+
+from mzrds.commands.keyspace import (
+    KeyStats,
+    key_freq,
+    key_lengths,
+    key_memory,
+    lfu_enabled,
+    sample_keys,
+)
+
+
+def test_key_stats_groups_by_type():
+    """测试按类型汇总"""
+    stats = KeyStats(top=1)
+    stats.add(b"a", "string", 10)
+    stats.add(b"b", "string", 30)
+    stats.add(b"c", "hash", 2)
+    biggest, sizes = stats.by_type["string"]
+    assert biggest.items() == [(30, b"b")]
+    assert sizes.count == 2 and sizes.total == 40
+    assert set(stats.by_type) == {"string", "hash"}
+
+
+class _Pipeline:
+    """MEMORY USAGE 返回 key 长度，PTTL 按 key 名返回"""
+
+    PTTL = {b"a": -1, b"bb": 5000, b"gone": -2}
+
+    def __init__(self):
+        self.replies = []
+
+    def memory_usage(self, key, samples=None):
+        self.replies.append(None if key == b"gone" else len(key))
+
+    def pttl(self, key):
+        self.replies.append(self.PTTL[key])
+
+    def execute(self, raise_on_error=True):
+        return self.replies
+
+
+class _Client:
+    def pipeline(self, transaction=False):
+        return _Pipeline()
+
+
+def test_sample_keys():
+    """测试 stats 的页内查询：已删除的 key 被丢弃，抽样比例生效"""
+    keys = [b"a", b"bb", b"gone"]
+    assert sample_keys(_Client(), keys, memory=True, ttl=True) == [
+        (b"a", 1, -1),
+        (b"bb", 2, 5000),
+    ]
+    assert sample_keys(_Client(), keys) == [(key, None, None) for key in keys]
+    sampled = sample_keys(_Client(), [b"k"] * 10000, rate=0.1)
+    assert 800 < len(sampled) < 1200
+
+
+class _FreqPipeline:
+    """OBJECT FREQ 按 key 名返回，``gone`` 视为已删除"""
+
+    def __init__(self, freqs):
+        self.freqs = freqs
+        self.keys = []
+
+    def execute_command(self, *args):
+        assert args[:2] == ("OBJECT", "FREQ")
+        self.keys.append(args[2])
+
+    def execute(self, raise_on_error=True):
+        return [self.freqs.get(key) for key in self.keys]
+
+
+class _FreqClient:
+    def __init__(self, freqs, policy=b"allkeys-lfu"):
+        self.freqs = freqs
+        self.policy = policy
+        self.connection_pool = type("Pool", (), {"connection_kwargs": {}})()
+
+    def pipeline(self, transaction=False):
+        return _FreqPipeline(self.freqs)
+
+    def config_get(self, name):
+        if self.policy is None:
+            raise ResponseError("unknown command 'CONFIG'")
+        return {name.encode(): self.policy}
+
+
+def test_key_freq():
+    """测试 hotkeys 的页内查询：已删除的 key 被丢弃，非 LFU 的报错直接抛出"""
+    client = _FreqClient({b"a": 5, b"b": 200})
+    assert key_freq(client, [b"a", b"gone", b"b"]) == [(b"a", 5), (b"b", 200)]
+    error = ResponseError("An LFU maxmemory policy is not selected, access frequency not tracked.")
+    with pytest.raises(ResponseError):
+        key_freq(_FreqClient({b"a": error}), [b"a"])
+
+
+def test_lfu_enabled():
+    """测试按 maxmemory-policy 判断 LFU，CONFIG 被禁用时返回 None"""
+    assert lfu_enabled(_FreqClient({})) is True
+    assert lfu_enabled(_FreqClient({}, policy=b"allkeys-lru")) is False
+    assert lfu_enabled(_FreqClient({}, policy=None)) is None
+
+
+@pytest.mark.integration
+def test_key_lengths_and_memory(redis_options):
+    """测试 TYPE + 长度命令以及 MEMORY USAGE"""
+    client = get_client(redis_options)
+    try:
+        client.set("test:big:s", "x" * 100)
+        client.rpush("test:big:l", "a", "b", "c")
+        client.hset("test:big:h", mapping={"f1": "1", "f2": "2"})
+        keys = [b"test:big:s", b"test:big:l", b"test:big:h", b"test:big:missing"]
+
+        lengths = key_lengths(client, keys)
+        assert lengths == [
+            (b"test:big:s", "string", 100),
+            (b"test:big:l", "list", 3),
+            (b"test:big:h", "hash", 2),
+        ]
+
+        memory = key_memory(client, keys)
+        assert [key for key, _, _ in memory] == keys[:3]
+        assert all(size > 0 for _, _, size in memory)
+
+        client.delete(*keys)
+    finally:
+        client.close()
@@ -0,0 +1,92 @@
+"""测试延迟监控"""
+from __future__ import annotations
+
+import threading
+import time
+
+from redis.exceptions import TimeoutError
+
+from mzrds.latency import LatencyMonitor, LatencyProbe, LatencySnapshot
+
+
+class _Node:
+    """每次调用耗时 ``delay`` 秒，``fail_every`` 次中有一次超时"""
+
+    def __init__(self, delay=0.0, fail_every=0):
+        self.delay = delay
+        self.fail_every = fail_every
+        self.calls = []
+
+    def execute_command(self, *args):
+        self.calls.append(args)
+        time.sleep(self.delay)
+        if self.fail_every and len(self.calls) % self.fail_every == 0:
+            raise TimeoutError("Timeout reading from socket")
+        return True
+
+
+def _run(probe, seconds=0.05):
+    stop = threading.Event()
+    thread = threading.Thread(target=probe.run, args=(stop,))
+    thread.start()
+    time.sleep(seconds)
+    stop.set()
+    thread.join()
+
+
+def test_probe_records_latency_and_errors():
+    """测试探测记录每次请求的耗时，超时计为错误但仍记录耗时"""
+    node = _Node(delay=0.002, fail_every=2)
+    probe = LatencyProbe("n", node, ["get", "k"], interval=0)
+    _run(probe)
+    snapshot = probe.take()
+    assert node.calls[0] == ("get", "k")
+    assert snapshot.histogram.count == len(node.calls)
+    assert snapshot.errors == len(node.calls) // 2
+    assert snapshot.histogram.min >= 2000
+    assert probe.take().histogram.count == 0
+
+
+def test_probe_respects_interval():
+    """测试两次请求之间按间隔等待"""
+    node = _Node()
+    _run(LatencyProbe("n", node, interval=0.02), seconds=0.1)
+    assert 3 <= len(node.calls) <= 7
+
+
+def test_monitor_probes_every_node():
+    """测试每个节点各自统计，快慢节点互不影响"""
+    fast, slow = _Node(), _Node(delay=0.01)
+    with LatencyMonitor([("fast", fast), ("slow", slow)], interval=0) as monitor:
+        time.sleep(0.05)
+    snapshots = {snapshot.node: snapshot for snapshot in monitor.take()}
+    assert fast.calls[0] == ("PING",)
+    assert snapshots["slow"].histogram.min >= 10000
+    assert snapshots["fast"].histogram.count > snapshots["slow"].histogram.count
+
+
+def test_snapshot_merge_and_json():
+    """测试累计合并与 JSON 字段（毫秒）"""
+    total = LatencySnapshot("n")
+    for value in (1000, 3000):
+        part = LatencySnapshot("n", errors=1, elapsed=1.0)
+        part.histogram.record(value)
+        total.merge(part)
+    data = total.to_dict(dist=True)
+    assert (data["samples"], data["errors"], data["window"]) == (2, 2, 2.0)
+    assert (data["min_ms"], data["max_ms"], data["avg_ms"]) == (1.0, 3.0, 2.0)
+    assert data["p999_ms"] == 3.0
+    assert [count for _, count in data["dist"]] == [1, 1]
+
+
+def test_empty_window_has_no_latency():
+    """测试全部超时的窗口：JSON 延迟字段为 null，文本显示 -"""
+    from mzrds.commands.latency import _format_line
+
+    snapshot = LatencySnapshot("n", errors=3, elapsed=1.0)
+    data = snapshot.to_dict()
+    assert (data["samples"], data["errors"]) == (0, 3)
+    assert data["min_ms"] is data["avg_ms"] is data["max_ms"] is data["p99_ms"] is None
+    line = _format_line(snapshot, label=False)
+    assert line.startswith("min -  avg -  p50 -  p99 -  max - ms")
+    assert "3 个错误" in line
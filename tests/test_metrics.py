@@ -0,0 +1,131 @@
+"""测试统计工具"""
+from __future__ import annotations
+
+from mzrds.metrics import (
+    HeavyHitters,
+    LatencyHistogram,
+    PrefixTree,
+    SizeDistribution,
+    TopK,
+    format_bytes,
+)
+
+
+def test_topk_keeps_largest():
+    """测试只保留分值最大的 k 个元素并按降序返回"""
+    top = TopK(3)
+    for score, item in [(5, "a"), (1, "b"), (9, "c"), (7, "d"), (3, "e")]:
+        top.push(score, item)
+    assert top.items() == [(9, "c"), (7, "d"), (5, "a")]
+    assert len(top) == 3
+
+
+def test_topk_equal_scores_do_not_compare_items():
+    """测试分值相同时不比较元素（元素可以是不可比较的类型）"""
+    top = TopK(2)
+    for item in ({"a": 1}, {"b": 2}, {"c": 3}):
+        top.push(1, item)
+    assert len(top.items()) == 2
+
+
+def test_topk_merge():
+    """测试合并两个 TopK"""
+    left, right = TopK(2), TopK(2)
+    left.push(1, "a")
+    left.push(4, "b")
+    right.push(3, "c")
+    left.merge(right)
+    assert left.items() == [(4, "b"), (3, "c")]
+
+
+def test_size_distribution():
+    """测试 2 的幂分桶"""
+    dist = SizeDistribution()
+    for size in [0, 1, 2, 3, 4, 5, 1024, 1025]:
+        dist.add(size)
+    assert dist.rows() == [(1, 2), (2, 1), (4, 2), (8, 1), (1024, 1), (2048, 1)]
+    assert dist.count == 8
+    assert dist.max == 1025
+    assert dist.total == sum([0, 1, 2, 3, 4, 5, 1024, 1025])
+
+
+def test_latency_histogram_percentiles_within_precision():
+    """测试百分位的相对误差在精度范围内"""
+    hist = LatencyHistogram()
+    for value in range(1, 100001):
+        hist.record(value)
+    assert hist.count == 100000
+    assert hist.min == 1 and hist.max == 100000
+    for percent, expected in [(50, 50000), (99, 99000), (99.9, 99900)]:
+        assert abs(hist.percentile(percent) - expected) / expected < 2 ** -6
+    assert hist.percentile(100) == 100000
+
+
+def test_latency_histogram_counts_and_merge():
+    """测试按次数记录以及合并"""
+    left, right = LatencyHistogram(), LatencyHistogram()
+    left.record(10, count=99)
+    right.record(5000)
+    left.merge(right)
+    assert left.count == 100
+    assert left.percentile(50) == 10
+    assert left.percentile(100) == 5000
+    assert left.mean == (10 * 99 + 5000) / 100
+    assert LatencyHistogram().percentile(99) == 0
+
+
+def test_format_bytes():
+    """测试字节数格式化"""
+    assert format_bytes(512) == "512B"
+    assert format_bytes(2048) == "2.0KB"
+    assert format_bytes(3 * 1024 * 1024) == "3.0MB"
+
+
+def test_prefix_tree_aggregates_by_segment():
+    """测试按分隔符逐层累计，短 key 只计入自身层级"""
+    tree = PrefixTree(depth=2)
+    tree.add(b"user:1:name", memory=10, ttl=60)
+    tree.add(b"user:1:age", memory=20)
+    tree.add(b"user:2", memory=5, ttl=30)
+    tree.add(b"plain")
+    rows = [(level, prefix, node.count, node.memory) for level, prefix, node in tree.walk(10)]
+    assert rows == [
+        (0, b"user", 3, 35),
+        (1, b"user:1", 2, 30),
+        (1, b"user:2", 1, 5),
+        (0, b"plain", 1, 0),
+    ]
+    user = tree.root.children[b"user"]
+    assert (user.expiring, user.mean_ttl) == (2, 45)
+
+
+def test_prefix_tree_limits_children():
+    """测试子节点数量达到上限后新前缀并入 *，walk 只返回每层 top-N"""
+    tree = PrefixTree(depth=1, max_children=2)
+    for key in [b"a", b"b", b"c", b"d", b"a", b"a"]:
+        tree.add(key, memory=100 if key == b"d" else 1)
+    assert sorted(tree.root.children) == [b"*", b"a", b"b"]
+    assert [prefix for _, prefix, _ in tree.walk(1)] == [b"a"]
+    assert [prefix for _, prefix, _ in tree.walk(1, by_memory=True)] == [b"*"]
+
+
+def test_latency_histogram_rows():
+    """测试按 2 的幂合并的延迟分布"""
+    hist = LatencyHistogram()
+    for value, count in [(3, 2), (100, 5), (1000, 1)]:
+        hist.record(value, count=count)
+    assert hist.rows() == [(4, 2), (128, 5), (1024, 1)]
+
+
+def test_heavy_hitters_bounded():
+    """测试超过容量后整理计数，高频元素保留且误差不超过 offset"""
+    counter = HeavyHitters(capacity=2)
+    for index in range(100):
+        counter.add(b"hot")
+        counter.add(f"cold:{index}".encode())
+    counter.add(b"warm", count=30)
+    assert len(counter) <= 4
+    assert counter.total == 230
+    (item, count), = counter.top(1)
+    assert item == b"hot"
+    assert count <= 100 <= count + counter.offset
@@ -0,0 +1,204 @@
+"""测试跨实例迁移流水线"""
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from mzrds.checkpoint import Checkpoint
+from mzrds.migrate import Migration, NativeTarget, _CursorTracker
+
+
+class _Pipeline:
+    def __init__(self, store):
+        self.store = store
+        self.calls = []
+
+    def dump(self, key):
+        self.calls.append(("dump", key))
+
+    def pttl(self, key):
+        self.calls.append(("pttl", key))
+
+    def restore(self, key, ttl, value, replace=False):
+        self.calls.append(("restore", key, ttl, value, replace))
+
+    def execute(self, raise_on_error=True):
+        return [self.store.apply(call) for call in self.calls]
+
+
+class _Store:
+    """只实现 SCAN / DUMP / PTTL / RESTORE 的内存实例"""
+
+    def __init__(self, name="src", data=None, fail_restore=False):
+        self.data = dict(data or {})
+        self.fail_restore = fail_restore
+        self.lock = threading.Lock()
+        self.connection_pool = SimpleNamespace(
+            connection_kwargs={"host": name, "port": 6379}
+        )
+
+    def scan(self, cursor=0, match=None, count=None, **kwargs):
+        keys = sorted(self.data)
+        end = cursor + count
+        return (end if end < len(keys) else 0), keys[cursor:end]
+
+    def pipeline(self, transaction=False):
+        return _Pipeline(self)
+
+    def apply(self, call):
+        with self.lock:
+            if call[0] == "dump":
+                entry = self.data.get(call[1])
+                return entry[0] if entry else None
+            if call[0] == "pttl":
+                entry = self.data.get(call[1])
+                return entry[1] if entry else -2
+            if self.fail_restore:
+                raise ConnectionError("target down")
+            _, key, ttl, value, replace = call
+            if key in self.data and not replace:
+                return Exception("BUSYKEY Target key name already exists.")
+            self.data[key] = (value, ttl or -1)
+            return b"OK"
+
+
+def _source(size=25):
+    return _Store(
+        data={f"k{i:02d}".encode(): (f"v{i}".encode(), 5000 if i % 2 else -1) for i in range(size)}
+    )
+
+
+@pytest.mark.parametrize("readers,writers", [(1, 1), (3, 4)])
+def test_migrate_copies_values_and_ttl(readers, writers):
+    """测试全部 key 连同过期时间被复制到目标"""
+    source, target = _source(), _Store("dst")
+    migration = Migration(
+        source, target, count=4, readers=readers, writers=writers, queue_size=2
+    )
+    stats = migration.run()
+    assert target.data == source.data
+    assert (stats.scanned, stats.migrated, stats.skipped, stats.errors) == (25, 25, 0, 0)
+    assert stats.bytes == sum(len(value) for value, _ in source.data.values())
+
+
+def test_migrate_reports_key_errors():
+    """测试目标 key 已存在且不覆盖时计为失败，其余 key 照常迁移"""
+    source, target = _source(5), _Store("dst", data={b"k01": (b"old", -1)})
+    failed = []
+    migration = Migration(
+        source, target, count=2, replace=False, on_error=lambda key, exc: failed.append(key)
+    )
+    stats = migration.run()
+    assert failed == [b"k01"]
+    assert (stats.migrated, stats.errors) == (4, 1)
+    assert target.data[b"k01"] == (b"old", -1)
+
+
+def test_migrate_counts_dump_errors():
+    """测试源端 DUMP 单个 key 出错时计为失败，不中断整页"""
+    source, target = _source(5), _Store("dst")
+    source.data[b"k02"] = (Exception("ERR module type cannot be dumped"), -1)
+    failed = []
+    migration = Migration(source, target, count=3, on_error=lambda key, exc: failed.append(key))
+    stats = migration.run()
+    assert failed == [b"k02"]
+    assert (stats.migrated, stats.skipped, stats.errors) == (4, 0, 1)
+    assert b"k02" not in target.data
+
+
+def test_migrate_checkpoint_and_resume(tmp_path):
+    """测试检查点记录完成状态，恢复时从记录的游标继续"""
+    path = tmp_path / "migrate.ckpt"
+    source, target = _source(10), _Store("dst")
+    checkpoint = Checkpoint(path, {"command": "migrate"})
+    Migration(source, target, count=3, checkpoint=checkpoint).run()
+    loaded = Checkpoint.load(path, {"command": "migrate"})
+    assert loaded.finished
+    assert loaded.counters["migrated"] == 10
+
+    partial = Checkpoint(path, {"command": "migrate"})
+    partial.cursors = {"src:6379": 6}
+    target = _Store("dst")
+    stats = Migration(source, target, count=3, checkpoint=partial).run()
+    assert sorted(target.data) == [b"k06", b"k07", b"k08", b"k09"]
+    assert stats.migrated == 4
+
+
+def test_migrate_failure_stops_pipeline(tmp_path):
+    """测试写入端出错时整个流水线停止，检查点不越过未写入的页"""
+    checkpoint = Checkpoint(tmp_path / "migrate.ckpt", {"command": "migrate"})
+    migration = Migration(
+        _source(), _Store("dst", fail_restore=True), count=4, checkpoint=checkpoint
+    )
+    with pytest.raises(ConnectionError):
+        migration.run()
+    assert checkpoint.resume == {"src:6379": 0}
+
+
+def test_cursor_tracker_commits_in_order():
+    """测试后面的页先完成时，要等前面的页完成才提交游标"""
+    commits = []
+    tracker = _CursorTracker(lambda node, cursor, counts: commits.append((node, cursor, dict(counts))))
+    seqs = [tracker.issue("a") for _ in range(3)]
+    tracker.complete("a", seqs[1], 20, Counter(migrated=2))
+    assert commits == []
+    tracker.complete("a", seqs[0], 10, Counter(migrated=1))
+    assert commits == [("a", 20, {"migrated": 3})]
+    tracker.complete("a", seqs[2], 0, Counter(migrated=4))
+    assert commits[-1] == ("a", 0, {"migrated": 4})
+
+
+def test_native_migrate_command():
+    """测试原生 MIGRATE 的参数"""
+    target = NativeTarget("10.0.0.2", 6380, db=1, username="u", password="p", timeout=100)
+    assert target.command([b"a", b"b"], replace=True) == [
+        "MIGRATE", "10.0.0.2", 6380, "", 1, 100, "COPY", "REPLACE",
+        "AUTH2", "u", "p", "KEYS", b"a", b"b",
+    ]
+    assert NativeTarget("h", 1).command([b"a"], replace=False) == [
+        "MIGRATE", "h", 1, "", 0, 5000, "COPY", "KEYS", b"a",
+    ]
+
+
+class _NativePipeline:
+    """按预设回复应答 EXISTS / MIGRATE 的 pipeline"""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.commands = []
+
+    def execute_command(self, *args):
+        self.commands.append(args[0])
+
+    def execute(self, raise_on_error=True):
+        return [next(self.replies) for _ in self.commands]
+
+
+def test_native_migrate_counts():
+    """测试原生模式只把仍存在的 key 计为已迁移，其余计为跳过"""
+    # 每组 2 个 key：(EXISTS, MIGRATE)
+    replies = iter([2, b"OK", 0, b"NOKEY", 1, b"OK"])
+    source = _source(6)
+    source.pipeline = lambda transaction=False: _NativePipeline(replies)
+    stats = Migration(source, native=NativeTarget("h", 1), count=2, readers=1).run()
+    assert (stats.migrated, stats.skipped, stats.errors) == (3, 3, 0)
+
+
+def test_native_migrate_errors():
+    """测试 MIGRATE 出错时只把存在的 key 计为失败"""
+    from redis.exceptions import ResponseError
+
+    replies = iter([1, ResponseError("IOERR")])
+    errors = []
+    source = _source(2)
+    source.pipeline = lambda transaction=False: _NativePipeline(replies)
+    migration = Migration(
+        source, native=NativeTarget("h", 1), count=2, readers=1,
+        on_error=lambda key, exc: errors.append(key),
+    )
+    stats = migration.run()
+    assert (stats.migrated, stats.skipped, stats.errors) == (0, 1, 1)
+    assert len(errors) == 1
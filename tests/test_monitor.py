@@ -0,0 +1,141 @@
+"""测试 MONITOR 流的解析、过滤与聚合"""
+from __future__ import annotations
+
+import socket
+import threading
+
+import redis
+
+from mzrds.monitor import (
+    MonitorFilter,
+    MonitorSession,
+    MonitorStats,
+    event_keys,
+    key_prefix,
+    parse_args,
+    parse_line,
+    sample_key_access,
+)
+from mzrds.resp import read_value
+
+LINES = [
+    b'1700000000.000001 [0 10.0.0.1:5000] "GET" "user:1:name"',
+    b'1700000000.000002 [0 10.0.0.2:6000] "set" "user:2:name" "x"',
+    b'1700000000.000003 [1 lua] "MGET" "order:1" "user:3"',
+    b'1700000000.000004 [0 10.0.0.1:5001] "PING"',
+]
+
+
+def test_parse_line():
+    """解析时间戳、库号、客户端与参数，保留原始行"""
+    event = parse_line(LINES[1])
+    assert event.time == 1700000000.000002
+    assert event.db == 0
+    assert event.client == b"10.0.0.2:6000"
+    assert event.args == [b"set", b"user:2:name", b"x"]
+    assert event.command == b"SET"
+    assert event.raw == LINES[1]
+    assert parse_line(b"OK") is None
+
+
+def test_parse_args_with_escapes():
+    """含反斜杠时还原引号、换行与十六进制转义"""
+    body = b'"SET" "a\\"b" "x\\ny" "\\xff\\x00" "c\\\\"'
+    assert parse_args(body) == [b"SET", b'a"b', b"x\ny", b"\xff\x00", b"c\\"]
+    assert parse_args(b'"GET" ""') == [b"GET", b""]
+
+
+def test_event_keys():
+    """按命令的参数布局取出 key"""
+    assert event_keys([b"GET", b"k"]) == [b"k"]
+    assert event_keys([b"mset", b"a", b"1", b"b", b"2"]) == [b"a", b"b"]
+    assert event_keys([b"BLPOP", b"q1", b"q2", b"0"]) == [b"q1", b"q2"]
+    assert event_keys([b"EVALSHA", b"sha", b"2", b"k1", b"k2", b"arg"]) == [b"k1", b"k2"]
+    assert event_keys([b"OBJECT", b"FREQ", b"k"]) == [b"k"]
+    assert event_keys([b"PING"]) == []
+    assert event_keys([b"CLIENT", b"LIST"]) == []
+
+
+def test_key_prefix():
+    """按分隔符截取前缀段，深度为 0 时为完整 key"""
+    assert key_prefix(b"user:1:name", 2) == b"user:1"
+    assert key_prefix(b"user", 2) == b"user"
+    assert key_prefix(b"user:1:name", 0) == b"user:1:name"
+
+
+def test_filter():
+    """命令、key 模式与客户端条件同时满足才保留"""
+    events = [parse_line(line) for line in LINES]
+    assert not MonitorFilter().active
+    by_command = MonitorFilter(commands=["get", "SET"])
+    assert [by_command(event) for event in events] == [True, True, False, False]
+    by_pattern = MonitorFilter(pattern="user:[12]*")
+    assert [by_pattern(event) for event in events] == [True, True, False, False]
+    by_pattern = MonitorFilter(pattern="user:3")
+    assert [by_pattern(event) for event in events] == [False, False, True, False]
+    by_client = MonitorFilter(clients=["10.0.0.1"])
+    assert [by_client(event) for event in events] == [True, False, False, True]
+    assert not MonitorFilter(clients=["10.0.0.1:5000"])(events[3])
+    assert MonitorFilter(pattern="user:*").keys(events[2]) == [b"user:3"]
+
+
+def test_stats():
+    """聚合命令、key 前缀与客户端计数"""
+    stats = MonitorStats(depth=1)
+    for line in LINES:
+        stats.add(parse_line(line))
+    assert stats.events == 4
+    assert stats.top_commands(1)[0][1] == 1
+    assert dict(stats.prefixes.top(10)) == {b"user": 3, b"order": 1}
+    assert len(stats.clients.top(10)) == 4
+
+
+def _serve(lines):
+    """接受一个连接，握手命令一律回复 +OK，收到 MONITOR 后写出若干行"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+
+    def run():
+        conn, _ = server.accept()
+        stream = conn.makefile("rb")
+        while True:
+            command = read_value(stream)
+            conn.sendall(b"+OK\r\n")
+            if command[0].upper() == b"MONITOR":
+                break
+        conn.sendall(b"".join(b"+" + line + b"\r\n" for line in lines))
+        conn.recv(1024)
+        conn.close()
+        server.close()
+
+    threading.Thread(target=run, daemon=True).start()
+    return server.getsockname()[1]
+
+
+def test_session_reads_batches():
+    """MonitorSession 在独立连接上执行 MONITOR，按批产出原始行"""
+    port = _serve(LINES)
+    client = redis.Redis(port=port, protocol=2)
+    received = []
+    with MonitorSession([("node", client)]) as session:
+        for node, lines in session.batches(timeout=0.2):
+            if node is None:
+                break
+            assert node == "node"
+            received.extend(lines)
+            if len(received) >= len(LINES):
+                break
+    assert received == LINES
+
+
+def test_sample_key_access():
+    """MONITOR 采样按 key 计数，只统计匹配模式的 key"""
+    port = _serve(LINES)
+    client = redis.Redis(port=port, protocol=2)
+    sample = sample_key_access(
+        [("node", client)], duration=0.3, matches=MonitorFilter(pattern="user:*")
+    )
+    assert sample.events == 3
+    assert sample.nodes == {"node": 3}
+    assert dict(sample.keys.top(10)) == {b"user:1:name": 1, b"user:2:name": 1, b"user:3": 1}
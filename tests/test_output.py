@@ -0,0 +1,222 @@
+"""测试批量输出层"""
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from mzrds.executor import iter_to_console
+from mzrds.output import OutputFormat, OutputWriter
+
+
+class _Stream(io.BytesIO):
+    def __init__(self, tty=False):
+        super().__init__()
+        self.tty = tty
+        self.writes = 0
+
+    def isatty(self):
+        return self.tty
+
+    def write(self, data):
+        self.writes += 1
+        self.last = data
+        return super().write(data)
+
+
+def test_numbered_output_continues_across_pages():
+    """测试默认输出与原格式一致且编号跨页连续"""
+    stream = _Stream()
+    with OutputWriter(stream) as out:
+        out.write_page([b"a", b"b"])
+        out.write_page([(b"f", b"v")])
+        out.write_page([(b"m", 1.5)], with_scores=True)
+        out.write_page([])
+    assert stream.getvalue().decode() == "1) a\n2) b\n3) f => v\n4) m (score=1.5)\n"
+
+
+def test_raw_output_is_binary_safe():
+    """测试 raw 模式不编号、不解码，元组按行展开"""
+    stream = _Stream()
+    with OutputWriter(stream, fmt=OutputFormat.raw) as out:
+        out.write_page([b"\xff\x00key", b"b"])
+        out.write_page([(b"m", 2.0)])
+    assert stream.getvalue() == b"\xff\x00key\nb\nm\n2.0\n"
+
+
+def test_pages_are_buffered_until_threshold():
+    """测试非终端输出按缓冲区大小批量写出"""
+    stream = _Stream()
+    out = OutputWriter(stream, fmt=OutputFormat.raw, buffer_size=1024)
+    for _ in range(10):
+        out.write_page([b"k" * 9] * 5)
+    assert stream.writes == 0
+    for _ in range(20):
+        out.write_page([b"k" * 9] * 5)
+    assert 1 <= stream.writes < 3
+    out.flush()
+    assert stream.getvalue() == (b"k" * 9 + b"\n") * 150
+
+
+def test_tty_flushes_every_page():
+    """测试终端输出每页立即刷新"""
+    stream = _Stream(tty=True)
+    out = OutputWriter(stream, fmt=OutputFormat.raw)
+    out.write_page([b"a"])
+    out.write_page([b"b"])
+    assert stream.writes == 2
+
+
+def test_iter_to_console_batches(capsys):
+    """测试 iter_to_console 不编号地逐行输出解码后的值"""
+    iter_to_console(iter([b"a", b"b", 3]), page_size=2)
+    assert capsys.readouterr().out == "a\nb\n3\n"
+
+
+def _reply(fmt, reply):
+    stream = _Stream()
+    with OutputWriter(stream, fmt=fmt) as out:
+        out.write_reply(reply)
+    return stream.getvalue()
+
+
+def test_reply_formats():
+    """测试各输出格式对嵌套回复的编码"""
+    reply = {b"name": b"alice", b"tags": [b"a", 1, None]}
+    assert _reply(OutputFormat.json, reply) == b'{"name":"alice","tags":["a",1,null]}\n'
+    assert _reply(OutputFormat.jsonl, [b"a", 2]) == b'"a"\n2\n'
+    assert _reply(OutputFormat.jsonl, {b"f": b"v"}) == b'{"field":"f","value":"v"}\n'
+    assert _reply(OutputFormat.csv, [[b"a,b", 1.5], b"c"]) == b'"a,b",1.5\nc\n'
+    assert _reply(OutputFormat.raw, [b"a", [b"b", None]]) == b"a\nb\n\n"
+    assert _reply(OutputFormat.resp, [b"a", 1]) == b"*2\r\n$1\r\na\r\n:1\r\n"
+    assert _reply(OutputFormat.text, [b"a", b"b"]) == b"1) a\n2) b\n"
+
+
+def test_reply_errors_and_binary():
+    """测试错误回复与无法解码的字节"""
+    assert _reply(OutputFormat.json, ValueError("boom")) == b'{"error":"boom"}\n'
+    assert _reply(OutputFormat.json, b"\xff") == b'"\\\\xff"\n'
+    assert _reply(OutputFormat.raw, b"\xff\x00") == b"\xff\x00\n"
+
+
+def test_json_non_finite_floats():
+    """测试 inf / nan 编码为字符串，输出仍是合法 JSON"""
+    import json
+
+    reply = [[b"a", float("inf")], [b"b", float("-inf")], float("nan"), 1.5]
+    data = _reply(OutputFormat.json, reply)
+    assert data == b'[["a","inf"],["b","-inf"],"nan",1.5]\n'
+    json.loads(data, parse_constant=lambda name: pytest.fail(name))
+
+
+def test_large_reply_is_written_in_chunks():
+    """测试大回复分多次写出，而不是先拼出整个结果"""
+    stream = _Stream()
+    with OutputWriter(stream, fmt=OutputFormat.jsonl, buffer_size=1024) as out:
+        out.write_reply([b"x" * 10] * 20000)
+    assert stream.writes > 1
+    assert stream.getvalue().count(b"\n") == 20000
+
+
+def test_json_scan_pages_form_one_array():
+    """测试 json 格式下多页结果合并为一个数组，单页模式带游标"""
+    stream = _Stream()
+    with OutputWriter(stream, fmt=OutputFormat.json) as out:
+        out.write_page([b"a"])
+        out.write_page([])
+        out.write_page([(b"m", 1.0)], with_scores=True)
+    assert stream.getvalue() == b'["a",{"member":"m","score":1.0}]\n'
+
+    stream = _Stream()
+    with OutputWriter(stream, fmt=OutputFormat.json) as out:
+        out.write_cursor("hscan", 12, empty=False)
+        out.write_page([(b"f", b"v")])
+    assert stream.getvalue() == b'{"cursor":12,"items":[{"field":"f","value":"v"}]}\n'
+
+    stream = _Stream()
+    with OutputWriter(stream, fmt=OutputFormat.json) as out:
+        out.write_page([])
+    assert stream.getvalue() == b"[]\n"
+
+
+def test_binary_format_is_byte_exact():
+    """测试 binary 格式：单个值原样输出，多个元素以 NUL 结尾"""
+    assert _reply(OutputFormat.binary, b"\x00\xff\n") == b"\x00\xff\n"
+    assert _reply(OutputFormat.binary, [b"a\nb", b"c"]) == b"a\nb\x00c\x00"
+    assert _reply(OutputFormat.binary, ValueError("boom")) == b""
+    stream = _Stream()
+    with OutputWriter(stream, fmt=OutputFormat.binary) as out:
+        out.write_page([b"k1", b"k\n2"])
+    assert stream.getvalue() == b"k1\x00k\n2\x00"
+
+
+def test_large_values_are_written_without_copy():
+    """测试超过缓冲区大小的 value 直接交给输出流"""
+    blob = memoryview(b"\xff" * 2048)
+    for fmt in (OutputFormat.binary, OutputFormat.raw):
+        stream = _Stream()
+        with OutputWriter(stream, fmt=fmt, buffer_size=1024) as out:
+            out.write_reply([b"small", blob])
+            assert stream.last is blob
+        assert stream.getvalue().count(b"\xff") == 2048
+
+
+def test_text_mode_escapes_binary():
+    """测试文本模式下二进制 value 以转义字符串显示"""
+    assert _reply(OutputFormat.text, b"\x00ab") == b'"\\x00ab"\n'
+    assert _reply(OutputFormat.text, [b"ok", b"\xff"]) == b'1) ok\n2) "\\xff"\n'
+
+
+def _records(fmt):
+    stream = _Stream()
+    with OutputWriter(stream, fmt=fmt) as out:
+        out.write_record(b"s", "string", b"v")
+        out.write_record(b"h", "hash", {b"f": b"1"}, truncated=True)
+        out.write_record(b"h", "hash", {b"g": b"2"}, part=2)
+        out.write_record(b"z", "zset", [(b"m", 1.5)])
+    return stream.getvalue().decode()
+
+
+def test_value_records():
+    """测试 key 与值的记录在各格式下的输出"""
+    assert _records(OutputFormat.text).splitlines() == [
+        "1) s (string)",
+        "   v",
+        "2) h (hash，已截断)",
+        "   1) f => 1",
+        "   h (hash，第 2 段)",
+        "   1) g => 2",
+        "3) z (zset)",
+        "   1) m (score=1.5)",
+    ]
+    assert _records(OutputFormat.jsonl).splitlines()[1:3] == [
+        '{"key":"h","type":"hash","value":{"f":"1"},"truncated":true}',
+        '{"key":"h","type":"hash","value":{"g":"2"},"part":2}',
+    ]
+    assert _records(OutputFormat.raw).split("\n")[:4] == ["s", "v", "h", "f"]
+    assert _records(OutputFormat.json).startswith('[{"key":"s","type":"string","value":"v"},')
+
+
+def test_pubsub_messages():
+    """测试 Pub/Sub 消息在各格式下的输出"""
+    messages = [
+        (b"message", None, b"news", b"hi"),
+        (b"pmessage", b"n*", b"news", b"\xff"),
+    ]
+
+    def render(fmt):
+        stream = _Stream()
+        with OutputWriter(stream, fmt=fmt) as out:
+            out.write_messages(messages)
+        return stream.getvalue()
+
+    assert render(OutputFormat.text).decode().splitlines() == [
+        "news: hi",
+        '[n*] news: "\\xff"',
+    ]
+    assert render(OutputFormat.raw) == b"hi\n\xff\n"
+    assert render(OutputFormat.jsonl).decode().splitlines() == [
+        '{"channel":"news","data":"hi"}',
+        '{"pattern":"n*","channel":"news","data":"\\\\xff"}',
+    ]
+    assert render(OutputFormat.resp).startswith(b"*3\r\n$7\r\nmessage\r\n")
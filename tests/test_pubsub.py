@@ -0,0 +1,182 @@
+"""测试 Pub/Sub 的消息解析、订阅分组与批量发布"""
+from __future__ import annotations
+
+import io
+import threading
+
+import pytest
+from redis.exceptions import ResponseError
+
+from mzrds.client import get_client
+from mzrds.monitor import StreamSession
+from mzrds.pubsub import (
+    PubSubStream,
+    SubscribeMode,
+    iter_publish_lines,
+    publish_messages,
+    subscription_streams,
+    to_message,
+)
+
+
+def test_to_message():
+    """只保留 message / pmessage / smessage，订阅确认被忽略"""
+    assert to_message([b"message", b"c", b"d"]) == (b"message", None, b"c", b"d")
+    assert to_message([b"pmessage", b"c*", b"c1", b"d"]) == (b"pmessage", b"c*", b"c1", b"d")
+    assert to_message([b"smessage", b"s", b"d"]) == (b"smessage", None, b"s", b"d")
+    assert to_message([b"subscribe", b"c", 1]) is None
+    assert to_message(None) is None
+
+
+def test_iter_publish_lines():
+    """固定频道时整行为内容，否则按第一个空格切出频道；空行跳过"""
+    data = b"a hello world\r\n\nb x\n"
+    assert list(iter_publish_lines(io.BytesIO(data))) == [(b"a", b"hello world"), (b"b", b"x")]
+    assert list(iter_publish_lines(io.BytesIO(data), b"c")) == [
+        (b"c", b"a hello world"),
+        (b"c", b"b x"),
+    ]
+    with pytest.raises(ValueError):
+        list(iter_publish_lines(io.BytesIO(b"lonely\n")))
+
+
+class _Pipeline:
+    def __init__(self, log):
+        self.log = log
+        self.commands = []
+
+    def execute_command(self, *args):
+        self.commands.append(args)
+
+    def execute(self, raise_on_error=True):
+        self.log.append(self.commands)
+        return [
+            ResponseError("NOPERM") if args[1] == b"denied" else 2
+            for args in self.commands
+        ]
+
+
+class _Client:
+    """PUBLISH 每条回复 2 个接收者，频道 denied 回复错误"""
+
+    connection_pool = type("Pool", (), {"connection_kwargs": {"host": "h", "port": 1}})()
+
+    def __init__(self):
+        self.log = []
+
+    def pipeline(self, transaction=False):
+        return _Pipeline(self.log)
+
+
+class _Limiter:
+    def __init__(self):
+        self.acquired = []
+
+    def acquire(self, n=1):
+        self.acquired.append(n)
+
+
+def test_publish_messages_in_chunks():
+    """按块 pipeline 发布并累计接收者数，限速按块申请"""
+    client = _Client()
+    limiter = _Limiter()
+    messages = [(b"c", str(i).encode()) for i in range(5)]
+    stats = publish_messages(client, messages, chunk_size=2, limiter=limiter)
+    assert (stats.published, stats.receivers, stats.errors) == (5, 10, 0)
+    assert [len(chunk) for chunk in client.log] == [2, 2, 1]
+    assert limiter.acquired == [2, 2, 1]
+    assert client.log[0][0] == ("PUBLISH", b"c", b"0")
+    publish_messages(client, messages[:1], shard=True)
+    assert client.log[-1][0][0] == "SPUBLISH"
+
+
+def test_publish_messages_counts_errors():
+    """单条发布失败不中断，计入失败数"""
+    messages = [(b"c", b"1"), (b"denied", b"2"), (b"c", b"3")]
+    stats = publish_messages(_Client(), messages, chunk_size=2)
+    assert (stats.published, stats.receivers, stats.errors) == (2, 4, 1)
+    assert "NOPERM" in str(stats.last_error)
+
+
+class _Node:
+    def __init__(self, name):
+        self.name = name
+
+
+class _Cluster:
+    """频道首字母决定所在节点"""
+
+    def get_primaries(self):
+        return [_Node("n1"), _Node("n2")]
+
+    def get_node_from_key(self, channel):
+        return _Node("n1" if channel < "m" else "n2")
+
+    def keyslot(self, channel):
+        # {tag} 中的部分决定 slot
+        return channel.split("{")[-1].rstrip("}")
+
+    def get_redis_connection(self, node):
+        return node.name
+
+
+def test_subscription_streams_group_shard_channels():
+    """Cluster 下分片频道按 slot 各发一条 SSUBSCRIBE，同一节点共用连接；普通频道只订阅第一个主节点"""
+    channels = ["a{1}", "z{3}", "b{2}", "c{1}"]
+    streams = subscription_streams(_Cluster(), SubscribeMode.shard, channels)
+    assert [(s.name, s.client, s.groups) for s in streams] == [
+        ("n1", "n1", [["a{1}", "c{1}"], ["b{2}"]]),
+        ("n2", "n2", [["z{3}"]]),
+    ]
+    streams = subscription_streams(_Cluster(), SubscribeMode.channel, ["a", "z"])
+    assert [(s.name, s.channels) for s in streams] == [("n1", ["a", "z"])]
+
+
+@pytest.mark.integration
+def test_subscribe_and_publish(redis_options):
+    """订阅后批量发布，按批读取到全部消息"""
+    client = get_client(redis_options)
+    streams = subscription_streams(client, SubscribeMode.pattern, ["mzrds:test:*"])
+    received = []
+    with StreamSession(streams) as session:
+        messages = [(b"mzrds:test:%d" % (i % 3), b"%d" % i) for i in range(50)]
+        threading.Timer(0.2, publish_messages, args=(client, messages, 20)).start()
+        for _, replies in session.batches(timeout=2):
+            if not replies:
+                break
+            received.extend(m for m in map(to_message, replies) if m)
+            if len(received) >= 50:
+                break
+    assert [data for *_, data in received] == [b"%d" % i for i in range(50)]
+
+
+class _PubSub:
+    def __init__(self):
+        self.commands = []
+
+    def subscribe(self, *channels):
+        self.commands.append(("SUBSCRIBE", *channels))
+
+    def psubscribe(self, *patterns):
+        self.commands.append(("PSUBSCRIBE", *patterns))
+
+    def ssubscribe(self, *channels):
+        self.commands.append(("SSUBSCRIBE", *channels))
+
+
+class _NodeClient:
+    def __init__(self):
+        self.subscriptions = _PubSub()
+
+    def pubsub(self):
+        return self.subscriptions
+
+
+def test_stream_sends_one_subscribe_per_group():
+    """每组频道一条订阅命令"""
+    client = _NodeClient()
+    stream = PubSubStream(
+        "n1", client, SubscribeMode.shard, ["a", "b", "c"], [["a", "b"], ["c"]]
+    )
+    stream.open()
+    assert client.subscriptions.commands == [("SSUBSCRIBE", "a", "b"), ("SSUBSCRIBE", "c")]
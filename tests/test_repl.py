@@ -0,0 +1,125 @@
+"""测试交互式 REPL 的会话状态与补全"""
+from __future__ import annotations
+
+import io
+from types import SimpleNamespace
+
+from redis.exceptions import ResponseError
+
+from mzrds.config import ConnectionOptions
+from mzrds.repl import ReplSession, run_repl
+
+
+class _Client:
+    """按命令名返回预设回复的单连接客户端"""
+
+    def __init__(self, replies=None):
+        self.replies = replies or {}
+        self.connection = SimpleNamespace(db=0)
+        self.sent = []
+
+    def execute_command(self, *args):
+        self.sent.append(args)
+        reply = self.replies.get(args[0].upper(), b"OK")
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def _session(replies=None, **options):
+    return ReplSession(_Client(replies), ConnectionOptions(**options))
+
+
+def test_multi_and_exec_state():
+    """测试 MULTI 之后提示符显示 (TX)，EXEC 之后恢复"""
+    session = _session({"SET": b"QUEUED", "EXEC": [b"OK"]})
+    assert session.prompt() == "127.0.0.1:6379> "
+    session.execute(["multi"])
+    session.execute(["watch", "k"])
+    assert session.in_multi and not session.watching
+    session.execute(["set", "k", "v"])
+    assert session.prompt() == "127.0.0.1:6379(TX)> "
+    assert session.execute(["exec"]) == [b"OK"]
+    assert not session.in_multi
+
+
+def test_select_updates_prompt_and_connection():
+    """测试 SELECT 成功后记录库号（用于重连），失败时不变"""
+    session = _session(db=1)
+    assert session.prompt() == "127.0.0.1:6379[1]> "
+    session.execute(["SELECT", "3"])
+    assert session.db == 3 and session.client.connection.db == 3
+    session.client.replies["SELECT"] = ResponseError("DB index is out of range")
+    reply = session.execute(["select", "99"])
+    assert isinstance(reply, ResponseError)
+    assert session.db == 3
+
+
+def test_prompt_hides_uri_password():
+    """测试提示符不显示 URI 中的密码，库号取自 URI"""
+    session = _session(uri="redis://:secret@cache.local:6380/2")
+    assert session.prompt() == "cache.local:6380[2]> "
+
+
+class _NodesManager:
+    def __init__(self):
+        self.created = []
+
+    def create_redis_node(self, host, port, **kwargs):
+        node_client = SimpleNamespace(response_callbacks={"GET": str})
+        self.created.append(node_client)
+        return node_client
+
+
+def test_cluster_session_disables_node_callbacks():
+    """测试 Cluster 下已有与之后新建的节点客户端都不做回复转换"""
+    from mzrds.repl import _disable_cluster_callbacks
+
+    existing = SimpleNamespace(response_callbacks={"GET": str})
+    cluster = SimpleNamespace(
+        cluster_response_callbacks={"CLUSTER SLOTS": list},
+        nodes_manager=_NodesManager(),
+        get_nodes=lambda: [
+            SimpleNamespace(redis_connection=existing),
+            SimpleNamespace(redis_connection=None),
+        ],
+    )
+    _disable_cluster_callbacks(cluster)
+    assert cluster.cluster_response_callbacks == {}
+    assert existing.response_callbacks == {}
+    node_client = cluster.nodes_manager.create_redis_node("h", 1)
+    assert node_client.response_callbacks == {}
+
+
+def test_cluster_rejects_connection_state_commands():
+    """测试 Cluster 模式下不发送 MULTI / SELECT"""
+    session = _session(cluster=True)
+    assert isinstance(session.execute(["multi"]), Exception)
+    assert session.client.sent == []
+
+
+def test_complete_command_names():
+    """测试只补全第一个单词，并保持输入的大小写"""
+    session = _session({"COMMAND": [b"get", b"getdel", b"set"]})
+    assert session.complete("ge", "ge") == ["get", "getdel"]
+    assert session.complete("GE", "GE") == ["GET", "GETDEL"]
+    assert session.complete("ge", "set ge") == []
+
+
+def test_command_names_fallback():
+    """测试 COMMAND LIST 不可用时使用内置命令表"""
+    session = _session({"COMMAND": ResponseError("unknown command")})
+    assert "HGETALL" in session.command_names()
+
+
+def test_run_repl_reads_until_quit(monkeypatch, capsys):
+    """测试非交互输入逐行执行，显示耗时，遇到 quit 退出"""
+    monkeypatch.setattr("sys.stdin", io.StringIO())
+    session = _session({"GET": b"v"})
+    lines = iter(["get k", "", "'bad", "quit", "get never"])
+    run_repl(session, read_line=lambda prompt: next(lines))
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == "v"
+    assert out[1].endswith("ms)")
+    assert out[2].startswith("(error) ")
+    assert session.client.sent == [("get", "k")]
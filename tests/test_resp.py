@@ -0,0 +1,59 @@
+"""测试 RESP 编解码"""
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from mzrds.resp import RespError, encode_value, read_value
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        False,
+        42,
+        -7,
+        1.5,
+        b"",
+        b"\x00\r\nbinary",
+        "中文文本",
+        [b"a", [1, None], "s"],
+        {b"k": b"v", "info": {"used_memory": 1024}},
+        {b"m1", b"m2"},
+    ],
+)
+def test_roundtrip(value):
+    """测试编码后能原样解码（包括类型）"""
+    assert read_value(io.BytesIO(encode_value(value))) == value
+
+
+def test_tuple_decodes_as_list():
+    """测试 tuple 按数组编码"""
+    assert read_value(io.BytesIO(encode_value((b"a", 1.0)))) == [b"a", 1.0]
+
+
+def test_exception_roundtrip():
+    """测试异常编码为错误回复"""
+    error = read_value(io.BytesIO(encode_value(ValueError("bad value"))))
+    assert isinstance(error, RespError)
+    assert error.kind == "ValueError"
+    assert str(error) == "bad value"
+
+
+def test_read_resp2_replies():
+    """测试读取 RESP2 回复"""
+    stream = io.BytesIO(b"+OK\r\n-ERR wrong\r\n$-1\r\n*2\r\n:1\r\n$1\r\nx\r\n")
+    assert read_value(stream) == b"OK"
+    error = read_value(stream)
+    assert isinstance(error, RespError) and error.kind == "ERR"
+    assert read_value(stream) is None
+    assert read_value(stream) == [1, b"x"]
+
+
+def test_read_truncated():
+    """测试截断的流"""
+    with pytest.raises(EOFError):
+        read_value(io.BytesIO(b"$10\r\nabc"))
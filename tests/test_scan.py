@@ -186,3 +186,48 @@ def test_zscan_with_scores(redis_options):
     finally:
         client.close()
 
+
+
+class _FlakyNode:
+    """只实现 SCAN 的内存节点，第 fail_at 次调用时模拟进程中断"""
+
+    def __init__(self, keys, fail_at=None):
+        from types import SimpleNamespace
+
+        self.keys = keys
+        self.fail_at = fail_at
+        self.calls = 0
+        self.connection_pool = SimpleNamespace(
+            connection_kwargs={"host": "node", "port": 6379}
+        )
+
+    def scan(self, cursor=0, match=None, count=None, **kwargs):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise KeyboardInterrupt
+        end = cursor + count
+        return (end if end < len(self.keys) else 0), self.keys[cursor:end]
+
+
+def test_scan_checkpoint_resume(tmp_path, capsysbinary):
+    """测试中断后从检查点继续，输出的 key 不重复也不遗漏，编号接着上次"""
+    from mzrds.checkpoint import Checkpoint
+    from mzrds.commands.scan import _scan_threads
+    from mzrds.output import OutputFormat
+
+    keys = [f"k{i}".encode() for i in range(10)]
+    path = tmp_path / "scan.ckpt"
+    with pytest.raises(KeyboardInterrupt):
+        _scan_threads(
+            _FlakyNode(keys, fail_at=3), "*", 3, None, OutputFormat.text,
+            Checkpoint(path, {"command": "scan"}),
+        )
+    first = capsysbinary.readouterr().out.decode().splitlines()
+    assert first == [f"{i + 1}) k{i}" for i in range(6)]
+
+    checkpoint = Checkpoint.load(path, {"command": "scan"})
+    assert checkpoint.resume == {"node:6379": 6}
+    _scan_threads(_FlakyNode(keys), "*", 3, None, OutputFormat.text, checkpoint)
+    second = capsysbinary.readouterr().out.decode().splitlines()
+    assert second == [f"{i + 1}) k{i}" for i in range(6, 10)]
+    assert Checkpoint.load(path, {"command": "scan"}).finished
@@ -0,0 +1,116 @@
+"""测试 SCAN 分页引擎（含 Cluster 并行扫描）"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from mzrds.scanner import group_by_slot, iter_scan_pages, node_clients, primary_clients
+
+
+class _Node:
+    """只实现 SCAN 的内存节点，每页返回 count 个 key"""
+
+    def __init__(self, name, keys, fail=False):
+        self.name = name
+        self.keys = keys
+        self.fail = fail
+        self.connection_pool = SimpleNamespace(
+            connection_kwargs={"host": name, "port": 6379}
+        )
+
+    def scan(self, cursor=0, match=None, count=None, **kwargs):
+        if self.fail:
+            raise RuntimeError(f"{self.name} down")
+        end = cursor + count
+        next_cursor = end if end < len(self.keys) else 0
+        return next_cursor, self.keys[cursor:end]
+
+
+class _Cluster:
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def get_primaries(self):
+        return [SimpleNamespace(name=node.name) for node in self.nodes]
+
+    def get_redis_connection(self, primary):
+        return next(node for node in self.nodes if node.name == primary.name)
+
+
+def test_scan_pages_standalone():
+    """测试单机模式逐页返回并以游标 0 结束"""
+    node = _Node("a", [f"k{i}".encode() for i in range(5)])
+    pages = list(iter_scan_pages(node, count=2))
+    assert [len(page.keys) for page in pages] == [2, 2, 1]
+    assert pages[-1].cursor == 0
+    assert pages[0].node == "a:6379"
+
+
+@pytest.mark.parametrize("parallelism", [None, 1, 2])
+def test_scan_pages_cluster_merges_all_nodes(parallelism):
+    """测试 Cluster 模式下所有主节点的 key 都被合并输出"""
+    nodes = [
+        _Node(f"n{n}", [f"n{n}:{i}".encode() for i in range(7)]) for n in range(3)
+    ]
+    pages = list(
+        iter_scan_pages(_Cluster(nodes), count=3, parallelism=parallelism)
+    )
+    keys = sorted(key for page in pages for key in page.keys)
+    assert keys == sorted(key for node in nodes for key in node.keys)
+    assert {page.node for page in pages} == {"n0", "n1", "n2"}
+
+
+def test_scan_pages_process_runs_per_page():
+    """测试 process 回调按页处理并随页返回"""
+    nodes = [_Node(f"n{n}", [b"x"] * 4) for n in range(2)]
+    pages = iter_scan_pages(
+        _Cluster(nodes), count=2, process=lambda client, keys: (client.name, len(keys))
+    )
+    results = [page.result for page in pages]
+    assert sorted(results) == [("n0", 2)] * 2 + [("n1", 2)] * 2
+
+
+def test_scan_pages_cluster_propagates_errors():
+    """测试扫描线程中的异常会在消费端抛出"""
+    nodes = [_Node("ok", [b"a"] * 10), _Node("bad", [], fail=True)]
+    with pytest.raises(RuntimeError, match="bad down"):
+        list(iter_scan_pages(_Cluster(nodes), count=1))
+
+
+def test_scan_pages_cluster_early_close():
+    """测试消费者提前结束时扫描线程能退出"""
+    nodes = [_Node(f"n{n}", [b"k"] * 1000) for n in range(4)]
+    pages = iter_scan_pages(_Cluster(nodes), count=1)
+    first = next(pages)
+    pages.close()
+    assert first.keys == [b"k"]
+
+
+def test_group_by_slot_respects_hash_tags():
+    """测试按 slot 分组（hash tag 内的 key 落在同一 slot）"""
+    groups = group_by_slot([b"{user:1}:a", b"{user:1}:b", b"other"])
+    assert sorted(groups, key=len) == [[b"other"], [b"{user:1}:a", b"{user:1}:b"]]
+
+
+def test_scan_pages_resume_from_cursors():
+    """测试从检查点游标继续：已完成的节点跳过，其余节点从记录的游标开始"""
+    nodes = [
+        _Node(f"n{n}", [f"n{n}:{i}".encode() for i in range(6)]) for n in range(3)
+    ]
+    resume = {"n0": None, "n1": 4}
+    pages = list(iter_scan_pages(_Cluster(nodes), count=2, resume=resume))
+    keys = sorted(key for page in pages for key in page.keys)
+    assert keys == [b"n1:4", b"n1:5"] + [f"n2:{i}".encode() for i in range(6)]
+
+
+def test_node_clients_include_replicas():
+    """测试监控类命令使用的节点列表包含副本，扫描只用主节点"""
+    nodes = [_Node("a", []), _Node("b", [])]
+    cluster = _Cluster(nodes[:1])
+    cluster.get_nodes = lambda: [SimpleNamespace(name=node.name) for node in nodes]
+    cluster.nodes = nodes
+    cluster.get_primaries = lambda: [SimpleNamespace(name="a")]
+    assert [name for name, _ in primary_clients(cluster)] == ["a"]
+    assert node_clients(cluster) == [("a", nodes[0]), ("b", nodes[1])]
+    assert node_clients(nodes[0]) == [("a:6379", nodes[0])]
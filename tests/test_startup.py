@@ -0,0 +1,105 @@
+"""启动耗时基准：防止重量级依赖重新出现在导入路径上"""
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from mzrds.fastpath import parse_exec_argv
+
+HEAVY_MODULES = ("typer", "click", "rich", "redis", "ssl", "tomli_w")
+
+# 导入 mzrds.fastpath 的累计耗时上限（微秒），远高于实测值以避免 CI 抖动
+IMPORT_BUDGET_US = 150_000
+
+
+def _loaded_heavy_modules(statement: str) -> list:
+    code = (
+        f"import sys; {statement}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+    return [name for name in output.split(",") if name]
+
+
+@pytest.mark.parametrize(
+    "module",
+    ["mzrds.fastpath", "mzrds.config", "mzrds.client", "mzrds.executor", "mzrds.agent"],
+)
+def test_module_import_is_light(module):
+    """测试入口及基础模块不会在导入时加载重量级依赖"""
+    assert _loaded_heavy_modules(f"import {module}") == []
+
+
+def test_cli_import_defers_redis():
+    """测试加载完整 CLI 时仍不导入 redis / ssl / tomli_w"""
+    loaded = _loaded_heavy_modules("import mzrds.cli")
+    assert "redis" not in loaded
+    assert "ssl" not in loaded
+    assert "tomli_w" not in loaded
+
+
+def test_fastpath_importtime_budget():
+    """测试 python -X importtime 统计的入口导入耗时在预算内"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mzrds.fastpath"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == "mzrds.fastpath":
+            cumulative = int(parts[1])
+    assert 0 < cumulative < IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize(
+    "argv, expected",
+    [
+        (["exec", "get", "k"], ({}, ["get", "k"])),
+        (
+            ["-h", "10.0.0.1", "--port=6380", "--tls", "-U", "prod", "exec", "ping"],
+            ({"host": "10.0.0.1", "port": 6380, "tls": True, "use": "prod"}, ["ping"]),
+        ),
+        (["--no-agent", "exec", "ping"], ({"no_agent": True}, ["ping"])),
+        (["exec", "incr", "k", "-1"], ({}, ["incr", "k", "-1"])),
+        (
+            ["--socket-timeout", "2.5", "--no-keepalive", "--max-connections=8", "exec", "ping"],
+            (
+                {"socket_timeout": 2.5, "socket_keepalive": False, "max_connections": 8},
+                ["ping"],
+            ),
+        ),
+    ],
+)
+def test_parse_exec_argv(argv, expected):
+    """测试快速路径的参数解析"""
+    assert parse_exec_argv(argv) == expected
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        [],
+        ["--help"],
+        ["exec"],
+        ["exec", "--batch", "-"],
+        ["exec", "-o", "json", "get", "k"],
+        ["scan", "--auto"],
+        ["-p", "abc", "exec", "ping"],
+        ["--unknown", "exec", "ping"],
+        ["-h"],
+        ["--max-connections", "0", "exec", "ping"],
+        ["--retries=-1", "exec", "ping"],
+        ["--socket-timeout", "-0.5", "exec", "ping"],
+        ["--health-check", "nan", "exec", "ping"],
+    ],
+)
+def test_parse_exec_argv_falls_back(argv):
+    """测试无法走快速路径的调用交给 typer 处理"""
+    assert parse_exec_argv(argv) is None
@@ -0,0 +1,84 @@
+"""测试速率限制与延迟退避"""
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from mzrds.throttle import AdaptiveCount, LatencyGuard, RateLimiter
+
+
+def test_rate_limiter_disabled():
+    """测试未设置速率时不阻塞"""
+    limiter = RateLimiter(None)
+    started = time.monotonic()
+    limiter.acquire(1_000_000)
+    assert time.monotonic() - started < 0.05
+
+
+def test_rate_limiter_spaces_batches():
+    """测试第一批立即放行，之后按批大小间隔"""
+    limiter = RateLimiter(1000)
+    started = time.monotonic()
+    limiter.acquire(50)
+    assert time.monotonic() - started < 0.02
+    limiter.acquire(50)
+    limiter.acquire(50)
+    assert time.monotonic() - started >= 0.095
+
+
+def test_latency_guard_backoff_and_reset(monkeypatch):
+    """测试超标时退避时间加倍，恢复后清零"""
+    sleeps = []
+    monkeypatch.setattr(time, "sleep", sleeps.append)
+    guard = LatencyGuard(0.01)
+    guard.observe(0.005)
+    guard.observe(0.02)
+    guard.observe(0.02)
+    assert sleeps == [LatencyGuard.MIN_DELAY, LatencyGuard.MIN_DELAY * 2]
+    guard.observe(0.001)
+    assert guard.delay == 0.0
+
+
+def _simulate(tuner, rtt, per_count, density, pages=50):
+    """模拟服务端耗时与 COUNT 成正比的节点，返回每页使用的 COUNT"""
+    counts = []
+    for _ in range(pages):
+        count = tuner.count
+        counts.append(count)
+        tuner.observe(rtt + per_count * count, int(count * density))
+    return counts
+
+
+def test_adaptive_count_converges_to_target():
+    """测试 COUNT 收敛到使服务端耗时接近目标的值"""
+    tuner = AdaptiveCount(initial=10, minimum=10, maximum=100000, target=0.002)
+    counts = _simulate(tuner, rtt=0.0005, per_count=1e-6, density=0.5)
+    # 首页没有往返时间参考，之后估计出 COUNT ≈ 2ms / 1us
+    assert 1500 <= counts[-1] <= 2500
+
+
+def test_adaptive_count_sparse_grows_faster():
+    """测试稀疏模式（大多为空页）比稠密模式增长更快"""
+    sparse = _simulate(AdaptiveCount(10, 10, 100000, 1.0), 0.001, 0, 0.0, pages=5)
+    dense = _simulate(AdaptiveCount(10, 10, 100000, 1.0), 0.001, 0, 1.0, pages=5)
+    assert sparse[-1] > dense[-1] > 10
+
+
+def test_adaptive_count_backs_off_and_respects_bounds():
+    """测试耗时超标时减半，且始终在上下限之内"""
+    tuner = AdaptiveCount(initial=1000, minimum=50, maximum=2000, target=0.001)
+    tuner.observe(0.0005, 10)
+    assert tuner.count == 2000
+    tuner.observe(0.1, 10)
+    assert tuner.count == 1000
+    counts = _simulate(tuner, 0.0005, 1e-3, 0.01)
+    assert min(counts) >= 50 and tuner.count == 50
+    counts = _simulate(tuner, 0.0005, 0, 0.0)
+    assert max(counts) <= 2000 and tuner.count == 2000
+
+
+def test_adaptive_count_invalid_bounds():
+    """测试无效的上下限"""
+    with pytest.raises(ValueError):
+        AdaptiveCount(minimum=100, maximum=10)
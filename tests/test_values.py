@@ -0,0 +1,166 @@
+"""测试 scan --with-values / dump-values 的按页取值"""
+from __future__ import annotations
+
+from mzrds.values import ValueFetcher, write_values
+
+DATA = {
+    b"s": b"hello world",
+    b"l": [str(i).encode() for i in range(7)],
+    b"h": {f"f{i}".encode(): b"v" for i in range(5)},
+    b"small": {b"a": b"1"},
+    b"st": {b"m1", b"m2", b"m3"},
+    b"z": [(f"m{i}".encode(), float(i)) for i in range(3)],
+    b"x": [(f"1-{i}".encode(), {b"n": str(i).encode()}) for i in range(3)],
+}
+TYPES = {bytes: "string", list: "list", dict: "hash", set: "set"}
+
+
+class _Store:
+    """只实现取值相关读命令的内存实例，记录每轮 pipeline 的命令"""
+
+    def __init__(self):
+        self.rounds = []
+
+    def pipeline(self, transaction=False):
+        return _Pipeline(self)
+
+    def type(self, key):
+        if key in (b"z", b"x"):
+            return {b"z": b"zset", b"x": b"stream"}[key]
+        return TYPES[type(DATA[key])].encode() if key in DATA else b"none"
+
+    def mget(self, keys):
+        return [DATA.get(key) for key in keys]
+
+    def getrange(self, key, start, end):
+        return DATA[key][start:end + 1]
+
+    def lrange(self, key, start, end):
+        return DATA[key][start:end + 1]
+
+    def zrange(self, key, start, end, withscores=False):
+        return DATA[key][start:end + 1]
+
+    def xrange(self, key, min="-", count=None):
+        entries = DATA[key]
+        if min != "-":
+            entries = [entry for entry in entries if entry[0] > min[1:]]
+        return entries[:count]
+
+    def hlen(self, key):
+        return len(DATA[key])
+
+    def scard(self, key):
+        return len(DATA[key])
+
+    def hgetall(self, key):
+        return dict(DATA[key])
+
+    def smembers(self, key):
+        return set(DATA[key])
+
+    def _scan(self, items, cursor, count):
+        end = cursor + count
+        return (end if end < len(items) else 0), items[cursor:end]
+
+    def hscan(self, key, cursor=0, count=None):
+        cursor, items = self._scan(sorted(DATA[key].items()), cursor, count)
+        return cursor, dict(items)
+
+    def sscan(self, key, cursor=0, count=None):
+        return self._scan(sorted(DATA[key]), cursor, count)
+
+
+class _Pipeline:
+    def __init__(self, store):
+        self.store = store
+        self.calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self.store, name)
+        return lambda *args, **kwargs: self.calls.append((name, method, args, kwargs))
+
+    def execute(self, raise_on_error=True):
+        self.store.rounds.append([name for name, _, _, _ in self.calls])
+        return [method(*args, **kwargs) for _, method, args, kwargs in self.calls]
+
+
+def _fetch(keys, **kwargs):
+    store = _Store()
+    return {entry.key: entry for entry in ValueFetcher(**kwargs)(store, keys)}, store
+
+
+def test_values_are_read_in_batched_rounds():
+    """测试一页只用 TYPE、读取、HGETALL/SMEMBERS 三轮 pipeline，string 合并为一个 MGET"""
+    entries, store = _fetch([b"s", b"small", b"st", b"gone", b"l", b"z"])
+    assert list(entries) == [b"s", b"small", b"st", b"l", b"z"]
+    assert entries[b"s"].value == b"hello world"
+    assert entries[b"small"].value == {b"a": b"1"}
+    assert sorted(entries[b"st"].value) == [b"m1", b"m2", b"m3"]
+    assert entries[b"l"].value == DATA[b"l"]
+    assert not any(entry.truncated for entry in entries.values())
+    assert len(store.rounds) == 3
+    assert store.rounds[1].count("mget") == 1
+    assert sorted(store.rounds[2]) == ["hgetall", "smembers"]
+
+
+def test_values_are_truncated():
+    """测试超过上限的值被截断并标记，hash 改用 HSCAN 取第一页"""
+    keys = [b"s", b"l", b"h", b"x"]
+    entries, store = _fetch(keys, max_items=2, max_bytes=5)
+    assert entries[b"s"].value == b"hello"
+    assert entries[b"l"].value == [b"0", b"1"]
+    assert entries[b"h"].value == {b"f0": b"v", b"f1": b"v"}
+    assert len(entries[b"x"].value) == 2
+    assert all(entry.truncated and entry.rest is None for entry in entries.values())
+    assert "hscan" in store.rounds[2]
+
+
+class _RacingStore(_Store):
+    """HLEN / SCARD 之后 key 被删除：HGETALL / SMEMBERS 回复为空"""
+
+    def hgetall(self, key):
+        return {}
+
+    def smembers(self, key):
+        return set()
+
+
+def test_collection_deleted_between_rounds_is_skipped():
+    """测试 hash / set 在两轮读取之间被删除时跳过，而不是把长度当作值"""
+    entries = ValueFetcher()(_RacingStore(), [b"small", b"st", b"s"])
+    assert [entry.key for entry in entries] == [b"s"]
+
+
+def test_full_mode_pages_through_large_values():
+    """测试 --full 时大值按段继续读取，拼起来与原值一致"""
+    entries, _ = _fetch(list(DATA), max_items=2, max_bytes=4, full=True)
+
+    def joined(key, merge):
+        entry = entries[key]
+        assert not entry.truncated
+        parts = [entry.value] + list(entry.rest or ())
+        return merge(parts)
+
+    assert joined(b"s", b"".join) == DATA[b"s"]
+    assert joined(b"l", lambda parts: sum(parts, [])) == DATA[b"l"]
+    assert joined(b"z", lambda parts: sum(parts, [])) == DATA[b"z"]
+    assert joined(b"x", lambda parts: sum(parts, [])) == DATA[b"x"]
+    assert joined(b"st", lambda parts: set(sum(parts, []))) == DATA[b"st"]
+    assert joined(b"h", lambda parts: {k: v for part in parts for k, v in part.items()}) == DATA[b"h"]
+
+
+class _Out:
+    def __init__(self):
+        self.records = []
+
+    def write_record(self, key, type_, value, truncated=False, part=1):
+        self.records.append((key, part))
+
+
+def test_write_values_writes_every_part():
+    """测试分段的值按段写出，返回写出的 key 数"""
+    entries, _ = _fetch([b"l", b"s"], max_items=3, full=True)
+    out = _Out()
+    assert write_values(out, list(entries.values())) == 2
+    assert out.records == [(b"l", 1), (b"l", 2), (b"l", 3), (b"s", 1)]